@@ -1,22 +1,23 @@
 '''
-This file contains constants used by other classes for Checkers game.
+This file contains constants used by the user interface of Checkers game.
+The constants of the engine are in engine/constants.py.
 '''
 
-NUM_SQUARES = 8  # Number of squares in one row (column)
 SQUARE_SIZE_PX = 50  # The size of the square in px
 
 PIECE_RADIUS_PX = 20  # Radius of a piece in px
 # Radius of an inner circle (distinction mark) for king piece
 KING_CROWN_RADIUS_PX = 10
+CIRCLE_SHAPE_POINTS = 36  # Vertices of the circles of the piece shapes
 BOARD_PADDING_PX = 20
 TEXT_SIZE_PX = 10
-# Amount of rows (in a sequence starting from the top or bottom depending on
-# the color) occupied by one piece color at the beginning of the game.
-INITIAL_ROWS = 3
 WINDOW_PADDING_PX = 20
-# The search depth for the optimal moves.
-# The bigger the number the harder the game.
-MAX_RECURSION_DEPTH = 5
+# The computer move is searched on a worker thread, the UI checks for the
+# result with this interval in milliseconds.
+COMPUTER_POLL_INTERVAL_MS = 50
+# True to search on the player's time (see engine/ponder.py). Only used
+# when one process searches.
+PONDERING = True
 RED_TRACE_WIDTH = 1  # The width of trace after the reds move
 BLACK_TRACE_WIDTH = 3  # The width of trace after the blacks move
 
@@ -29,7 +30,4 @@ REDS_COLOR = "dark red"
 LIGHT_CELL_COLOR = "white"  # The color for light cells on the board
 DARK_CELL_COLOR = "light gray"  # The color for dark cells on the board
 
-PLAYER_COLOR_RED = "R"
-PLAYER_COLOR_BLACK = "B"
-
 TEXT_FONT = "Courier New"  # A font used to display text messages in the game
@@ -11,9 +11,9 @@ from constants import (
     BACKGROUND_COLOR,
     BOARD_BORDER_COLOR,
     BOARD_PADDING_PX,
+    CIRCLE_SHAPE_POINTS,
     KING_CROWN_COLOR,
     KING_CROWN_RADIUS_PX,
-    NUM_SQUARES,
     PIECE_RADIUS_PX,
     SQUARE_SIZE_PX,
     TEXT_COLOR,
@@ -26,6 +26,7 @@ from constants import (
     LIGHT_CELL_COLOR,
     DARK_CELL_COLOR
 )
+from engine.constants import NUM_SQUARES
 
 
 def board_coord_to_screen_coord_center(board_coord):
@@ -114,32 +115,6 @@ def draw_square(a_turtle, screen_x, screen_y, size, pen_color, fill_color):
     a_turtle.penup()
 
 
-def draw_circle(a_turtle, screen_x, screen_y, radius, pen_color, fill_color):
-    '''
-        Function -- draw_circle
-            Draws a circle
-        Parameters:
-            a_turtle -- a turtle used to draw
-            screen_x -- x-coordinates for circle center in screen format in px
-            screen_y -- y-coordinates for circle center in screen format in px
-            radius -- a desired radius of the circle
-            pen_color -- the color of the edge of the circle
-            fill_color -- the filler color or None if no fill is needed
-    '''
-    a_turtle.setheading(180)
-    a_turtle.pencolor(pen_color)
-    if fill_color is not None:
-        a_turtle.fillcolor(fill_color)
-    a_turtle.setposition(screen_x, screen_y + radius)
-    a_turtle.pendown()
-    if fill_color is not None:
-        a_turtle.begin_fill()
-    a_turtle.circle(radius)
-    if fill_color is not None:
-        a_turtle.end_fill()
-    a_turtle.penup()
-
-
 def draw_line(
     a_turtle,
     screen_x_from,
@@ -242,10 +217,66 @@ def draw_board_border(a_turtle):
     )
 
 
+def get_circle_polygon(radius):
+    '''
+        Function -- get_circle_polygon
+            Approximates a circle around the origin with a polygon
+        Parameters:
+            radius -- the radius of the circle in px
+        Returns:
+            Tuple of (x, y) tuples of the vertices
+    '''
+    return tuple(
+        (
+            radius * math.cos(2 * math.pi * i / CIRCLE_SHAPE_POINTS),
+            radius * math.sin(2 * math.pi * i / CIRCLE_SHAPE_POINTS),
+        )
+        for i in range(CIRCLE_SHAPE_POINTS)
+    )
+
+
+def get_piece_shape_name(is_black, is_king):
+    '''
+        Function -- get_piece_shape_name
+            Gets the name of the registered turtle shape of a piece
+        Parameters:
+            is_black -- True for the black pieces, False for the red ones
+            is_king -- True for a king, False for a regular piece
+        Returns:
+            The name of the shape
+    '''
+    return "{}_{}".format(
+        "black" if is_black else "red", "king" if is_king else "man"
+    )
+
+
+def register_piece_shapes(screen):
+    '''
+        Function -- register_piece_shapes
+            Registers the turtle shapes of the pieces: regular pieces and
+            kings of both colors. Kings have the crown circle inside.
+        Parameters:
+            screen -- the turtle Screen object
+    '''
+    piece_polygon = get_circle_polygon(PIECE_RADIUS_PX)
+    crown_polygon = get_circle_polygon(KING_CROWN_RADIUS_PX)
+    for is_black in (True, False):
+        color = BLACKS_COLOR if is_black else REDS_COLOR
+        for is_king in (False, True):
+            shape = turtle.Shape("compound")
+            shape.addcomponent(piece_polygon, color, color)
+            if is_king:
+                shape.addcomponent(crown_polygon, color, KING_CROWN_COLOR)
+            screen.register_shape(
+                get_piece_shape_name(is_black, is_king), shape
+            )
+
+
 def draw_piece(a_turtle, board_x, board_y, is_black, is_king):
     '''
         Function -- draw_piece
-            Draws a piece
+            Draws a piece as a stamp of its registered shape, see
+            register_piece_shapes
         Parameters:
             a_turtle -- a turtle used to draw
             board_x -- coordinate of the cell in board format
@@ -254,27 +285,15 @@ def draw_piece(a_turtle, board_x, board_y, is_black, is_king):
                 will be drawn. Otherwise, red piece.
             is_king -- if is_king is True, then the king piece will be drawn.
                 Otherwise, regular piece.
+        Returns:
+            The stamp id, used to remove the piece with clearstamp
     '''
-    screen_x = board_coord_to_screen_coord_center(board_x)
-    screen_y = board_coord_to_screen_coord_center(board_y)
-    color = BLACKS_COLOR if is_black else REDS_COLOR
-    draw_circle(
-        a_turtle=a_turtle,
-        screen_x=screen_x,
-        screen_y=screen_y,
-        radius=PIECE_RADIUS_PX,
-        pen_color=color,
-        fill_color=color,
+    a_turtle.shape(get_piece_shape_name(is_black, is_king))
+    a_turtle.setposition(
+        board_coord_to_screen_coord_center(board_x),
+        board_coord_to_screen_coord_center(board_y),
     )
-    if is_king:
-        draw_circle(
-            a_turtle=a_turtle,
-            screen_x=screen_x,
-            screen_y=screen_y,
-            radius=KING_CROWN_RADIUS_PX,
-            pen_color=KING_CROWN_COLOR,
-            fill_color=None,
-        )
+    return a_turtle.stamp()
 
 
 def draw_move(
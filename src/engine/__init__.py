@@ -0,0 +1,9 @@
+'''
+This package contains the engine of the Checkers game: the board, pieces
+and moves, the search with its evaluation, tables and tablebase, and the
+opening book. It doesn't import turtle or anything else of the user
+interface, so it can be used by servers and worker processes on hosts
+without a display. Drawing is done by renderer.py and drawing.py.
+The command line tools are run as modules from the src directory, e.g.
+"python -m engine.book --help".
+'''
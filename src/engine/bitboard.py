@@ -0,0 +1,219 @@
+'''
+This file contains helpers for the bitboard representation of the board.
+Only the 32 dark (playable) cells are stored. The cell with board
+coordinates (board_x, board_y) is stored in bit number
+board_y * 4 + board_x // 2, so bits go row by row from the bottom of the
+board and from left to right inside a row.
+'''
+
+from .constants import NUM_SQUARES, PLAYER_COLOR_BLACK, PLAYER_COLOR_RED
+
+NUM_PLAYABLE_SQUARES = 32
+FULL_MASK = (1 << NUM_PLAYABLE_SQUARES) - 1
+SQUARES_PER_ROW = NUM_SQUARES // 2
+
+# Board coordinates of every playable square, indexed by bit number.
+SQUARE_X = []
+SQUARE_Y = []
+for _index in range(NUM_PLAYABLE_SQUARES):
+    _board_y = _index // SQUARES_PER_ROW
+    SQUARE_Y.append(_board_y)
+    SQUARE_X.append(
+        2 * (_index % SQUARES_PER_ROW) + (1 if _board_y % 2 == 0 else 0)
+    )
+
+
+def make_row_mask(board_y):
+    '''
+        Function -- make_row_mask
+            Makes the mask of all playable squares in one row
+        Parameters:
+            board_y -- the row in board format
+        Returns:
+            The mask with bits of the row set
+    '''
+    return ((1 << SQUARES_PER_ROW) - 1) << (board_y * SQUARES_PER_ROW)
+
+
+def make_direction_shifts(board_dx, board_dy):
+    '''
+        Function -- make_direction_shifts
+            Makes the shift table for a diagonal step. The shift amount
+            depends on the parity of the row, so the table has two
+            entries: one for even rows and one for odd rows.
+        Parameters:
+            board_dx -- x-coordinate offset of the step (1 or -1)
+            board_dy -- y-coordinate offset of the step (1 or -1)
+        Returns:
+            List of (source_mask, shift) tuples. Only squares in
+            source_mask can make the step, and their destination bit is
+            the source bit shifted left by shift (right if negative).
+    '''
+    result = []
+    for parity in range(2):
+        source_mask = 0
+        for index in range(NUM_PLAYABLE_SQUARES):
+            board_x = SQUARE_X[index] + board_dx
+            board_y = SQUARE_Y[index] + board_dy
+            if (
+                SQUARE_Y[index] % 2 == parity
+                and 0 <= board_x < NUM_SQUARES
+                and 0 <= board_y < NUM_SQUARES
+            ):
+                source_mask |= 1 << index
+        if board_dx > 0:
+            column_shift = 1 if parity == 0 else 0
+        else:
+            column_shift = 0 if parity == 0 else -1
+        result.append((source_mask, board_dy * SQUARES_PER_ROW + column_shift))
+    return result
+
+
+def make_step_table(board_dx, board_dy):
+    '''
+        Function -- make_step_table
+            Makes the table of destination squares for a diagonal step
+        Parameters:
+            board_dx -- x-coordinate offset of the step (1 or -1)
+            board_dy -- y-coordinate offset of the step (1 or -1)
+        Returns:
+            List indexed by bit number with the bit number of the
+            destination square or None if the step leaves the board
+    '''
+    return [
+        square_index(SQUARE_X[index] + board_dx, SQUARE_Y[index] + board_dy)
+        for index in range(NUM_PLAYABLE_SQUARES)
+    ]
+
+
+# Squares where a piece of the color is promoted to king.
+RED_KING_ROW_MASK = make_row_mask(0)
+BLACK_KING_ROW_MASK = make_row_mask(NUM_SQUARES - 1)
+
+
+def square_index(board_x, board_y):
+    '''
+        Function -- square_index
+            Converts board coordinates to the bit number of the square
+        Parameters:
+            board_x -- coordinate of the cell in board format
+            board_y -- coordinate of the cell in board format
+        Returns:
+            The bit number of the square or None if the cell is not
+            a playable cell inside the board
+    '''
+    if (
+        not (0 <= board_x < NUM_SQUARES and 0 <= board_y < NUM_SQUARES)
+        or board_x % 2 == board_y % 2
+    ):
+        return None
+    return board_y * SQUARES_PER_ROW + board_x // 2
+
+
+def make_square_steps(index, steps, king_row_mask):
+    '''
+        Function -- make_square_steps
+            Computes the steps of a piece from one square
+        Parameters:
+            index -- the bit number of the square
+            steps -- the allowed step offsets of the piece
+            king_row_mask -- the squares where a man of the piece color is
+                promoted to king
+        Returns:
+            List of tuples with the step, the bit number of the
+            destination, of the jumped over square and of the landing
+            square of a jump, and whether a man is promoted by the step or
+            by the jump. The jump squares are None if the landing square is
+            outside the board. Steps leaving the board are left out.
+    '''
+    result = []
+    for direction in steps:
+        step = STEP_TABLES[direction][index]
+        if step is None:
+            continue
+        jump = STEP_TABLES[direction][step]
+        result.append((
+            direction,
+            step,
+            None if jump is None else step,
+            jump,
+            bool(king_row_mask >> step & 1),
+            jump is not None and bool(king_row_mask >> jump & 1),
+        ))
+    return result
+
+
+def make_steps_tables():
+    '''
+        Function -- make_steps_tables
+            Computes the steps from every square for every color and king
+            state
+        Returns:
+            Dictionary where the key is a (color, is_king) tuple and the
+            value is a list of steps (see make_square_steps) indexed by bit
+            number
+    '''
+    result = {}
+    for color, man_steps, king_row_mask in (
+        (PLAYER_COLOR_BLACK, BLACK_STEPS, BLACK_KING_ROW_MASK),
+        (PLAYER_COLOR_RED, RED_STEPS, RED_KING_ROW_MASK),
+    ):
+        for is_king in (False, True):
+            result[(color, is_king)] = [
+                make_square_steps(
+                    index, KING_STEPS if is_king else man_steps, king_row_mask
+                )
+                for index in range(NUM_PLAYABLE_SQUARES)
+            ]
+    return result
+
+
+DIRECTIONS = [(1, -1), (-1, -1), (1, 1), (-1, 1)]
+# The steps of men of every color and of kings, in the order moves are
+# generated.
+RED_STEPS = [(1, -1), (-1, -1)]
+BLACK_STEPS = [(1, 1), (-1, 1)]
+KING_STEPS = DIRECTIONS
+DIRECTION_SHIFTS = {
+    direction: make_direction_shifts(*direction) for direction in DIRECTIONS
+}
+STEP_TABLES = {
+    direction: make_step_table(*direction) for direction in DIRECTIONS
+}
+SQUARE_STEPS = make_steps_tables()
+
+
+def shift_mask(mask, direction):
+    '''
+        Function -- shift_mask
+            Moves every square of the mask one diagonal step
+        Parameters:
+            mask -- the mask of squares to move
+            direction -- the step as a (board_dx, board_dy) tuple
+        Returns:
+            The mask of destination squares. Squares that would leave
+            the board are dropped.
+    '''
+    result = 0
+    for source_mask, shift in DIRECTION_SHIFTS[direction]:
+        moved = mask & source_mask
+        if shift > 0:
+            result |= moved << shift
+        else:
+            result |= moved >> -shift
+    return result
+
+
+def iterate_squares(mask):
+    '''
+        Function -- iterate_squares
+            Iterates over the bit numbers set in the mask
+        Parameters:
+            mask -- the mask of squares
+        Returns:
+            Generator of bit numbers in ascending order
+    '''
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
@@ -0,0 +1,658 @@
+'''
+This file handles everything related to board in the game.
+'''
+
+from .bitboard import (
+    BLACK_STEPS,
+    FULL_MASK,
+    KING_STEPS,
+    RED_STEPS,
+    SQUARE_STEPS,
+    SQUARE_X,
+    SQUARE_Y,
+    iterate_squares,
+    shift_mask,
+    square_index,
+)
+from .constants import (
+    INITIAL_ROWS,
+    NUM_SQUARES,
+    PLAYER_COLOR_BLACK,
+    PLAYER_COLOR_RED,
+)
+from .move import Move
+from .piece import get_piece
+from .search import Search
+from .zobrist import PIECE_KEYS, compute_hash, get_piece_kind
+
+
+def make_initial_pieces():
+    '''
+        Function -- make_initial_pieces
+            Makes initial position of the game
+        Returns:
+            The position of all pieces in dictionary, where the key is
+            the coordinate of the piece on the board and the value is
+            the Piece object
+    '''
+    result = {}
+    for board_x in range(NUM_SQUARES):
+        for board_y in range(INITIAL_ROWS):
+            if square_index(board_x, board_y) is not None:
+                result[(board_x, board_y)] = (
+                    get_piece(board_x, board_y, PLAYER_COLOR_BLACK)
+                )
+    for board_x in range(NUM_SQUARES):
+        for board_y in range(NUM_SQUARES - INITIAL_ROWS, NUM_SQUARES):
+            if square_index(board_x, board_y) is not None:
+                result[(board_x, board_y)] = (
+                    get_piece(board_x, board_y, PLAYER_COLOR_RED)
+                )
+    return result
+
+
+class Board:
+    '''
+        Class -- Board
+            Represents a board in the game with all pieces. The state is
+            stored as three bitboards (see bitboard.py), the dictionary of
+            Piece objects is only built when it is requested.
+        Attributes:
+            pieces -- pieces state on the board in dictionary format,
+                    where the key is the coordinate of the piece on the board
+                    and the value is the Piece object
+            black_mask -- bitboard of squares occupied by black pieces
+            red_mask -- bitboard of squares occupied by red pieces
+            king_mask -- bitboard of squares occupied by king pieces
+            zobrist_hash -- Zobrist hash of the position (see zobrist.py),
+                updated incrementally by apply_move
+            stats -- tuple with blacks, reds, blacks kings and reds kings
+                number, updated incrementally by apply_move
+        Methods:
+            get_all_moves -- checks for possible moves for this piece color
+            get_normal_moves -- checks for moves for this piece color that
+                are not capturing
+            get_capture_moves -- checks for moves for this piece color that
+                are capturing, a multistep capture is one move
+            extend_capture -- continues a capturing move while the piece
+                can capture again
+            collect_moves -- generates moves for this piece color with
+                bitboard shifts
+            build_move -- builds the Move object for an allowed step
+            make_piece_at -- makes the Piece object for an occupied square
+            get_color_masks -- gets the bitboards of own and opponent pieces
+            get_stats -- gets the statistics of how many blacks, reds,
+                blacks kings and red kings are on the board now
+            get_score -- computes the internal score of the game for this
+                board state. The score represents the probable winner and is
+                used for estimating the best computer move. A score less than
+                one represents that black is more likely to win. A score more
+                than one represents that red is more likely to win. A score of
+                one represents equal chances for winning.
+            get_text_score -- gets the score text for the UI.
+            apply_move -- applies the provided move to a new board
+            get_state_after -- computes the state after a move
+            make_move -- makes the provided move on this board
+            unmake_move -- takes back a move made with make_move
+            copy -- makes an independent copy of the board
+            optimal_move_black -- finds an optimal move for black pieces
+                with the alpha-beta search (see search.py)
+            optimal_move_red -- finds an optimal move for red pieces
+                with the alpha-beta search (see search.py)
+            get_piece_at -- gets the piece at specified board location
+    '''
+    def __init__(
+        self,
+        pieces=None,
+        black_mask=0,
+        red_mask=0,
+        king_mask=0,
+        zobrist_hash=None,
+        stats=None,
+    ):
+        '''
+            Constructor -- creates a new instance of Board
+            Parameters:
+                self -- the current Board object
+                pieces -- pieces state on the board in dictionary format,
+                    where the key is the coordinate of the piece on the board
+                    and the value is the Piece object. If it is None, the
+                    state is taken from the masks.
+                black_mask -- bitboard of squares occupied by black pieces
+                red_mask -- bitboard of squares occupied by red pieces
+                king_mask -- bitboard of squares occupied by king pieces
+                zobrist_hash -- Zobrist hash of the position or None to
+                    compute it from the masks
+                stats -- tuple with blacks, reds, blacks kings and reds
+                    kings number or None to count them in the masks
+        '''
+        if pieces is not None:
+            black_mask = 0
+            red_mask = 0
+            king_mask = 0
+            for piece in pieces.values():
+                bit = 1 << square_index(piece.board_x, piece.board_y)
+                if piece.color == PLAYER_COLOR_BLACK:
+                    black_mask |= bit
+                else:
+                    red_mask |= bit
+                if piece.is_king:
+                    king_mask |= bit
+        self.black_mask = black_mask
+        self.red_mask = red_mask
+        self.king_mask = king_mask
+        if pieces is not None or zobrist_hash is None:
+            zobrist_hash = compute_hash(black_mask, red_mask, king_mask)
+        self.zobrist_hash = zobrist_hash
+        if pieces is not None or stats is None:
+            stats = (
+                black_mask.bit_count(),
+                red_mask.bit_count(),
+                (black_mask & king_mask).bit_count(),
+                (red_mask & king_mask).bit_count(),
+            )
+        self.stats = stats
+        self._pieces = pieces
+
+    @property
+    def pieces(self):
+        '''
+        Method -- pieces
+            Pieces state on the board in dictionary format, where the key is
+            the coordinate of the piece on the board and the value is the
+            Piece object. Built from the masks on the first access.
+        Parameter:
+            self -- the current Board object
+        Returns:
+            The dictionary of pieces
+        '''
+        if self._pieces is None:
+            pieces = {}
+            for index in iterate_squares(self.black_mask | self.red_mask):
+                piece = self.make_piece_at(index)
+                pieces[(piece.board_x, piece.board_y)] = piece
+            self._pieces = pieces
+        return self._pieces
+
+    def make_piece_at(self, index):
+        '''
+        Method -- make_piece_at
+            Makes the Piece object for an occupied square
+        Parameter:
+            self -- the current Board object
+            index -- the bit number of the square
+        Returns:
+            The Piece object standing on the square
+        '''
+        bit = 1 << index
+        return get_piece(
+            SQUARE_X[index],
+            SQUARE_Y[index],
+            (
+                PLAYER_COLOR_BLACK if self.black_mask & bit
+                else PLAYER_COLOR_RED
+            ),
+            bool(self.king_mask & bit),
+        )
+
+    def get_color_masks(self, color):
+        '''
+        Method -- get_color_masks
+            Gets the bitboards of own and opponent pieces for the color
+        Parameter:
+            self -- the current Board object
+            color -- color of pieces
+        Returns:
+            Tuple of own pieces mask and opponent pieces mask
+        '''
+        if color == PLAYER_COLOR_BLACK:
+            return self.black_mask, self.red_mask
+        return self.red_mask, self.black_mask
+
+    def get_all_moves(self, color):
+        '''
+        Method -- get_all_moves
+            Checks for possible moves for this piece color
+        Parameter:
+            self -- the current Board object
+            color -- color of pieces
+        Returns:
+            All possible moves this piece color can make in this turn
+        '''
+        capture_moves = self.get_capture_moves(color)
+        if len(capture_moves) > 0:
+            return capture_moves
+        else:
+            return self.get_normal_moves(color)
+
+    def get_normal_moves(self, color):
+        '''
+        Method -- get_normal_moves
+            Checks for moves for this piece color that are not capturing
+        Parameter:
+            self -- the current Board object
+            color -- color of pieces
+        Returns:
+            All possible moves this piece color can make in this turn
+            that are not capturing
+        '''
+        return self.collect_moves(color, is_capture=False)
+
+    def get_capture_moves(self, color):
+        '''
+        Method -- get_capture_moves
+            Checks for moves for this piece color that are capturing
+        Parameter:
+            self -- the current Board object
+            color -- color of pieces
+        Returns:
+            All possible moves this piece color can make in this turn
+            that are capturing
+        '''
+        result = []
+        for move in self.collect_moves(color, is_capture=True):
+            result += self.extend_capture(move)
+        return result
+
+    def extend_capture(self, move):
+        '''
+        Method -- extend_capture
+            Continues a capturing move while the moved piece can capture
+            again, so that the whole multistep capture becomes one move.
+            The next steps are found on a new board, this board is not
+            changed, so boards can be shared by threads.
+        Parameter:
+            self -- the current Board object
+            move -- the capturing Move object, allowed on this board
+        Returns:
+            List of all complete capturing moves that start with the move
+        '''
+        steps = self.apply_move(move).collect_moves(
+            move.from_piece.color,
+            is_capture=True,
+            from_mask=1 << square_index(
+                move.to_piece.board_x, move.to_piece.board_y
+            ),
+        )
+        if len(steps) == 0:
+            return [move]
+        result = []
+        for step in steps:
+            result += self.extend_capture(move.append_step(step))
+        return result
+
+    def collect_moves(self, color, is_capture, from_mask=FULL_MASK):
+        '''
+        Method -- collect_moves
+            Generates single step moves for this piece color with bitboard
+            shifts. Sources are computed for each direction at once, then
+            moves are emitted square by square in the order of the allowed
+            steps of each piece.
+        Parameter:
+            self -- the current Board object
+            color -- color of pieces
+            is_capture -- True to generate capturing moves, False to
+                generate non-capturing moves
+            from_mask -- bitboard of squares to generate moves from, all
+                squares by default
+        Returns:
+            List of Move objects
+        '''
+        own, opponent = self.get_color_masks(color)
+        empty = ~(own | opponent) & FULL_MASK
+        man_steps = RED_STEPS if color == PLAYER_COLOR_RED else BLACK_STEPS
+        man_sources = {}
+        king_sources = {}
+        all_sources = 0
+        for steps, movers, sources in (
+            (man_steps, own & from_mask & ~self.king_mask, man_sources),
+            (KING_STEPS, own & from_mask & self.king_mask, king_sources),
+        ):
+            if not movers:
+                continue
+            for board_dx, board_dy in steps:
+                forward = (board_dx, board_dy)
+                backward = (-board_dx, -board_dy)
+                if is_capture:
+                    jumped = shift_mask(movers, forward) & opponent
+                    landing = shift_mask(jumped, forward) & empty
+                    if landing:
+                        sources[forward] = shift_mask(
+                            shift_mask(landing, backward), backward
+                        )
+                else:
+                    targets = shift_mask(movers, forward) & empty
+                    if targets:
+                        sources[forward] = shift_mask(targets, backward)
+                all_sources |= sources.get(forward, 0)
+        result = []
+        for index in iterate_squares(all_sources):
+            bit = 1 << index
+            is_king = bool(self.king_mask & bit)
+            sources = king_sources if is_king else man_sources
+            from_piece = None
+            for square_step in SQUARE_STEPS[(color, is_king)][index]:
+                if not sources.get(square_step[0], 0) & bit:
+                    continue
+                if from_piece is None:
+                    from_piece = get_piece(
+                        SQUARE_X[index], SQUARE_Y[index], color, is_king
+                    )
+                result.append(self.build_move(
+                    from_piece, square_step, is_capture
+                ))
+        return result
+
+    def build_move(self, from_piece, square_step, is_capture):
+        '''
+        Method -- build_move
+            Builds the Move object for a step that is known to be allowed
+        Parameter:
+            self -- the current Board object
+            from_piece -- the piece to be moved
+            square_step -- the precomputed step from the square of the
+                piece, see bitboard.make_square_steps
+            is_capture -- True if the piece jumps over an opponent piece
+        Returns:
+            The Move object
+        '''
+        direction, step, jump_over, jump, step_promotes, jump_promotes = (
+            square_step
+        )
+        remove = None
+        to_index = step
+        promotes = step_promotes
+        if is_capture:
+            remove = self.make_piece_at(jump_over)
+            to_index = jump
+            promotes = jump_promotes
+        return Move(
+            from_piece=from_piece,
+            to_piece=get_piece(
+                SQUARE_X[to_index],
+                SQUARE_Y[to_index],
+                from_piece.color,
+                from_piece.is_king or promotes,
+            ),
+            remove=remove,
+        )
+
+    def get_piece_at(self, board_x, board_y):
+        '''
+        Method -- get_piece_at
+            Gets the piece at specified board location
+        Parameter:
+            self -- the current Board object
+            board_x -- coordinate of the cell in board format
+            board_y -- coordinate of the cell in board format
+        Returns:
+            Piece at specified board location or None if there is no piece
+        '''
+        index = square_index(board_x, board_y)
+        if (
+            index is None
+            or not (self.black_mask | self.red_mask) & (1 << index)
+        ):
+            return None
+        return self.make_piece_at(index)
+
+    def get_stats(self):
+        '''
+        Method -- get_stats
+            Gets the statistics of how many blacks, reds, blacks kings and
+            red kings are on the board now. The counts are kept up to date
+            by apply_move, so no square is scanned.
+        Parameter:
+            self -- the current Board object
+        Returns:
+            The Tuple with blacks, reds, blacks kings and reds king number
+        '''
+        return self.stats
+
+    def get_score(self):
+        '''
+        Method -- get_score
+            Computes the internal score of the game for this board state.
+            The score represents the probable winner and is used for estimating
+            the best computer move. A score less than one represents that black
+            is more likely to win. A score more than one represents that red is
+            more likely to win. A score of one represents equal chances for
+            winning.
+        Parameter:
+            self -- the current Board object
+        Returns:
+            The internal score of the game represented as a float number.
+        '''
+        blacks, reds, blacks_kings, reds_kings = self.get_stats()
+        if reds == 0:
+            return -10000000000
+        if blacks == 0:
+            return 10000000000
+        return (reds + 2 * reds_kings) / (blacks + 2 * blacks_kings)
+
+    def get_text_score(self):
+        '''
+        Method -- get_text_score
+            Get the score text for the UI.
+        Parameter:
+            self -- the current Board object
+        Returns:
+            The text representation of the score of the game
+        '''
+        blacks, reds, blacks_kings, reds_kings = self.get_stats()
+        return "     You   {:>2} ({}) : ({}) {:<2}   Computer".format(
+            blacks, blacks_kings, reds_kings, reds
+        )
+
+    def apply_move(self, move):
+        '''
+        Method -- apply_move
+            Applies the provided move with all its steps. This board is
+            not changed.
+        Parameter:
+            self -- the current Board object
+            move -- the Move object
+        Returns:
+            The new Board object with the move applied
+        '''
+        black_mask, red_mask, king_mask, zobrist_hash, stats = (
+            self.get_state_after(move)
+        )
+        return Board(
+            black_mask=black_mask,
+            red_mask=red_mask,
+            king_mask=king_mask,
+            zobrist_hash=zobrist_hash,
+            stats=stats,
+        )
+
+    def get_state_after(self, move):
+        '''
+        Method -- get_state_after
+            Computes the state of the board after the provided move
+        Parameter:
+            self -- the current Board object
+            move -- the Move object
+        Returns:
+            Tuple of the black, red and king masks, the Zobrist hash and
+            the stats after the move
+        '''
+        from_index = square_index(
+            move.from_piece.board_x, move.from_piece.board_y
+        )
+        to_index = square_index(move.to_piece.board_x, move.to_piece.board_y)
+        from_bit = 1 << from_index
+        to_bit = 1 << to_index
+        is_black = move.from_piece.color == PLAYER_COLOR_BLACK
+        black_mask = self.black_mask
+        red_mask = self.red_mask
+        king_mask = self.king_mask & ~from_bit
+        zobrist_hash = (
+            self.zobrist_hash
+            ^ PIECE_KEYS[get_piece_kind(is_black, move.from_piece.is_king)][
+                from_index
+            ]
+            ^ PIECE_KEYS[get_piece_kind(is_black, move.to_piece.is_king)][
+                to_index
+            ]
+        )
+        blacks, reds, blacks_kings, reds_kings = self.stats
+        if move.to_piece.is_king and not move.from_piece.is_king:
+            if is_black:
+                blacks_kings += 1
+            else:
+                reds_kings += 1
+        for remove in move.captured:
+            if remove.color == PLAYER_COLOR_BLACK:
+                blacks -= 1
+                if remove.is_king:
+                    blacks_kings -= 1
+            else:
+                reds -= 1
+                if remove.is_king:
+                    reds_kings -= 1
+            remove_index = square_index(remove.board_x, remove.board_y)
+            remove_bit = 1 << remove_index
+            black_mask &= ~remove_bit
+            red_mask &= ~remove_bit
+            king_mask &= ~remove_bit
+            zobrist_hash ^= PIECE_KEYS[get_piece_kind(
+                remove.color == PLAYER_COLOR_BLACK, remove.is_king
+            )][remove_index]
+        if is_black:
+            black_mask = (black_mask & ~from_bit) | to_bit
+        else:
+            red_mask = (red_mask & ~from_bit) | to_bit
+        if move.to_piece.is_king:
+            king_mask |= to_bit
+        return (
+            black_mask,
+            red_mask,
+            king_mask,
+            zobrist_hash,
+            (blacks, reds, blacks_kings, reds_kings),
+        )
+
+    def make_move(self, move):
+        '''
+        Method -- make_move
+            Makes the provided move with all its steps on this board. The
+            search uses it with unmake_move to walk the game tree on one
+            Board object.
+        Parameter:
+            self -- the current Board object
+            move -- the Move object
+        Returns:
+            The undo record for unmake_move
+        '''
+        undo = (
+            self.black_mask,
+            self.red_mask,
+            self.king_mask,
+            self.zobrist_hash,
+            self.stats,
+            self._pieces,
+        )
+        (
+            self.black_mask,
+            self.red_mask,
+            self.king_mask,
+            self.zobrist_hash,
+            self.stats,
+        ) = self.get_state_after(move)
+        self._pieces = None
+        return undo
+
+    def unmake_move(self, undo):
+        '''
+        Method -- unmake_move
+            Takes back a move made with make_move. Moves have to be taken
+            back in the reverse order.
+        Parameter:
+            self -- the current Board object
+            undo -- the undo record returned by make_move
+        '''
+        (
+            self.black_mask,
+            self.red_mask,
+            self.king_mask,
+            self.zobrist_hash,
+            self.stats,
+            self._pieces,
+        ) = undo
+
+    def copy(self):
+        '''
+        Method -- copy
+            Makes an independent copy of the board
+        Parameter:
+            self -- the current Board object
+        Returns:
+            The new Board object with the same position
+        '''
+        return Board(
+            black_mask=self.black_mask,
+            red_mask=self.red_mask,
+            king_mask=self.king_mask,
+            zobrist_hash=self.zobrist_hash,
+            stats=self.stats,
+        )
+
+    def optimal_move_black(self, depth, options=None):
+        '''
+        Method -- optimal_move_black
+            Finds an optimal move for black pieces
+        Parameter:
+            self -- the current Board object
+            depth -- the search depth for the optimal moves
+            options -- possible moves for black pieces or None for all moves
+        Returns:
+            Best move for black pieces
+        '''
+        return Search().find_best_move(
+            self, PLAYER_COLOR_BLACK, depth + 1, options
+        ).move
+
+    def optimal_move_red(self, options, depth):
+        '''
+        Method -- optimal_move_red
+            Finds an optimal move for red pieces
+        Parameter:
+            self -- the current Board object
+            options -- possible moves for red pieces
+            depth -- the search depth for the optimal moves
+        Returns:
+            Best move for red pieces
+        '''
+        return Search().find_best_move(
+            self, PLAYER_COLOR_RED, depth + 1, options
+        ).move
+
+    def __eq__(self, other):
+        '''
+            Method -- __eq__
+                Checks if two objects are equal
+            Parameters:
+                self -- The current Board object
+                other -- An object to compare self to.
+            Returns:
+                True if the two objects are equal, False otherwise.
+        '''
+        if type(self) != type(other):
+            return False
+        return (
+            self.black_mask == other.black_mask and
+            self.red_mask == other.red_mask and
+            self.king_mask == other.king_mask
+        )
+
+    def __hash__(self):
+        '''
+            Method -- __hash__
+                Gets the hash of the object
+            Parameters:
+                self -- The current Board object
+            Returns:
+                The Zobrist hash of the position
+        '''
+        return self.zobrist_hash
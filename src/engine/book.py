@@ -0,0 +1,292 @@
+'''
+This file contains the opening book.
+The book maps positions (by the Zobrist key with the side to move, see
+search.get_position_key) to candidate moves with weights. It is built
+offline by deep searches of every root move, run in parallel worker
+processes, and stored as a binary file of fixed-size records sorted by
+the key, so a position is found by binary search.
+Run "python -m engine.book --help" to build the book.
+'''
+
+import argparse
+import random
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .bitboard import square_index
+from .board import Board, make_initial_pieces
+from .constants import (
+    BOOK_DEPTH,
+    BOOK_MAX_WEIGHT,
+    BOOK_MOVES_PER_POSITION,
+    BOOK_PLIES,
+    BOOK_SCORE_MARGIN,
+    OPENING_BOOK_PATH,
+    PLAYER_COLOR_BLACK,
+)
+from .search import Search, get_opponent_color, get_position_key
+
+# A record is the position key, the start and end squares of the move,
+# the mask of the captured squares and the weight of the move.
+RECORD_FORMAT = struct.Struct("<QBBIH")
+
+
+def get_move_record(move):
+    '''
+        Function -- get_move_record
+            Gets the fields that identify a move in a record
+        Parameters:
+            move -- the Move object
+        Returns:
+            Tuple of the start square, the end square and the mask of the
+            captured squares
+    '''
+    captured_mask = 0
+    for piece in move.captured:
+        captured_mask |= 1 << square_index(piece.board_x, piece.board_y)
+    return (
+        square_index(move.from_piece.board_x, move.from_piece.board_y),
+        square_index(move.to_piece.board_x, move.to_piece.board_y),
+        captured_mask,
+    )
+
+
+def analyse_position(board, color, depth):
+    '''
+        Function -- analyse_position
+            Searches every move of a position and picks the book moves.
+            Runs in a worker process.
+        Parameters:
+            board -- the Board object
+            color -- color of the side to move
+            depth -- the search depth in plies
+        Returns:
+            List of (move, weight) tuples, the best move first. Moves
+            scoring more than BOOK_SCORE_MARGIN below the best one are
+            left out.
+    '''
+    search = Search()
+    scored = []
+    for move in board.get_all_moves(color):
+        result = search.find_best_move(board, color, depth, [move])
+        scored.append((result.score, move))
+    if not scored:
+        return []
+    # Stable sort keeps the generator order between equal scores.
+    scored.sort(key=lambda item: item[0], reverse=True)
+    best_score = scored[0][0]
+    result = []
+    for score, move in scored[:BOOK_MOVES_PER_POSITION]:
+        gap = best_score - score
+        if gap > BOOK_SCORE_MARGIN:
+            break
+        weight = round(BOOK_MAX_WEIGHT * (1 - gap / BOOK_SCORE_MARGIN))
+        result.append((move, max(weight, 1)))
+    return result
+
+
+def build_book(
+    plies=BOOK_PLIES,
+    depth=BOOK_DEPTH,
+    follow_color=PLAYER_COLOR_BLACK,
+    workers=None,
+):
+    '''
+        Function -- build_book
+            Builds the book from the initial position. Positions are
+            analysed ply by ply, the positions of one ply in parallel. All
+            moves of follow_color (the human player in the game) are
+            followed, of the other color only the book moves.
+        Parameters:
+            plies -- the number of plies covered by the book
+            depth -- the search depth of every move in plies
+            follow_color -- the color whose every move is followed
+            workers -- number of worker processes, None for one per CPU
+        Returns:
+            Dictionary of lists of (move, weight) tuples by position key
+    '''
+    book = {}
+    positions = [(Board(make_initial_pieces()), PLAYER_COLOR_BLACK)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for ply in range(plies):
+            results = executor.map(
+                analyse_position,
+                [board for board, color in positions],
+                [color for board, color in positions],
+                [depth] * len(positions),
+            )
+            next_positions = []
+            queued = set()
+            for (board, color), moves in zip(positions, results):
+                key = get_position_key(board, color)
+                if key in book:
+                    continue
+                book[key] = moves
+                followed = [move for move, weight in moves]
+                if color == follow_color:
+                    followed = board.get_all_moves(color)
+                for move in followed:
+                    next_board = board.apply_move(move)
+                    next_color = get_opponent_color(color)
+                    next_key = get_position_key(next_board, next_color)
+                    if next_key not in queued:
+                        queued.add(next_key)
+                        next_positions.append((next_board, next_color))
+            positions = next_positions
+    return book
+
+
+def write_book(book, path):
+    '''
+        Function -- write_book
+            Writes the book as records sorted by the position key
+        Parameters:
+            book -- dictionary of lists of (move, weight) tuples by
+                position key
+            path -- the path of the file
+    '''
+    with open(path, "wb") as file:
+        for key in sorted(book):
+            for move, weight in book[key]:
+                file.write(RECORD_FORMAT.pack(
+                    key, *get_move_record(move), weight
+                ))
+
+
+class OpeningBook:
+    '''
+        Class -- OpeningBook
+            Looks up book moves in a book file
+        Attributes:
+            data -- the content of the book file, empty if there is no file
+            size -- the number of records
+        Methods:
+            read_record -- reads one record
+            find_first_record -- finds the first record of a position
+            get_moves -- gets the book moves of a position
+            choose_move -- chooses a book move by the weights
+    '''
+    def __init__(self, path=OPENING_BOOK_PATH):
+        '''
+            Constructor -- creates a new instance of OpeningBook
+            Parameters:
+                self -- the current OpeningBook object
+                path -- the path of the book file. A missing file is an
+                    empty book.
+        '''
+        try:
+            with open(path, "rb") as file:
+                self.data = file.read()
+        except FileNotFoundError:
+            self.data = b""
+        self.size = len(self.data) // RECORD_FORMAT.size
+
+    def read_record(self, number):
+        '''
+        Method -- read_record
+            Reads one record
+        Parameter:
+            self -- the current OpeningBook object
+            number -- the number of the record
+        Returns:
+            Tuple of the key, start square, end square, captured mask and
+            weight
+        '''
+        return RECORD_FORMAT.unpack_from(
+            self.data, number * RECORD_FORMAT.size
+        )
+
+    def find_first_record(self, key):
+        '''
+        Method -- find_first_record
+            Finds the first record of a position by binary search
+        Parameter:
+            self -- the current OpeningBook object
+            key -- the position key
+        Returns:
+            The number of the first record with a key not less than key
+        '''
+        low = 0
+        high = self.size
+        while low < high:
+            middle = (low + high) // 2
+            if self.read_record(middle)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def get_moves(self, board, color):
+        '''
+        Method -- get_moves
+            Gets the book moves of a position
+        Parameter:
+            self -- the current OpeningBook object
+            board -- the Board object
+            color -- color of the side to move
+        Returns:
+            List of (move, weight) tuples, empty if the position is not in
+            the book
+        '''
+        key = get_position_key(board, color)
+        number = self.find_first_record(key)
+        records = []
+        while number < self.size:
+            record = self.read_record(number)
+            if record[0] != key:
+                break
+            records.append(record)
+            number += 1
+        if not records:
+            return []
+        result = []
+        for move in board.get_all_moves(color):
+            move_record = get_move_record(move)
+            for record in records:
+                if record[1:4] == move_record:
+                    result.append((move, record[4]))
+        return result
+
+    def choose_move(self, board, color, random_generator=random):
+        '''
+        Method -- choose_move
+            Chooses a book move, moves with bigger weights more often
+        Parameter:
+            self -- the current OpeningBook object
+            board -- the Board object
+            color -- color of the side to move
+            random_generator -- the random.Random object or the random
+                module
+        Returns:
+            The Move object or None if the position is not in the book
+        '''
+        moves = self.get_moves(board, color)
+        if not moves:
+            return None
+        return random_generator.choices(
+            [move for move, weight in moves],
+            [weight for move, weight in moves],
+        )[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Builds the opening book with parallel searches."
+    )
+    parser.add_argument("--plies", type=int, default=BOOK_PLIES)
+    parser.add_argument("--depth", type=int, default=BOOK_DEPTH)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=OPENING_BOOK_PATH)
+    arguments = parser.parse_args()
+    start_time = time.perf_counter()
+    book = build_book(
+        arguments.plies, arguments.depth, workers=arguments.workers
+    )
+    write_book(book, arguments.output)
+    print("Positions: {}".format(len(book)))
+    print("Time: {:.1f} s".format(time.perf_counter() - start_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+'''
+This file contains constants used by the engine of the Checkers game.
+'''
+
+NUM_SQUARES = 8  # Number of squares in one row (column)
+# Amount of rows (in a sequence starting from the top or bottom depending on
+# the color) occupied by one piece color at the beginning of the game.
+INITIAL_ROWS = 3
+# The computer move is searched with iterative deepening up to this depth
+# in plies, until the time budget (in seconds) or the node budget is spent.
+# None means no budget of that kind.
+MAX_SEARCH_DEPTH = 30
+SEARCH_TIME_LIMIT_S = 1.0
+SEARCH_NODE_LIMIT = None
+# The number of processes searching the computer move. With more than one
+# process the root moves are searched in parallel (see parallel.py).
+SEARCH_WORKERS = 1
+# The game sessions served by one process (see session.py): the maximal
+# number of open sessions and the number of worker processes searching
+# their computer moves, None for one per CPU.
+MAX_SESSIONS = 500
+SESSION_WORKERS = None
+# The address the engine server listens on by default (see server.py).
+ENGINE_SERVER_HOST = "127.0.0.1"
+ENGINE_SERVER_PORT = 8765
+# The maximal length in bytes of a request line of the engine server.
+ENGINE_SERVER_MAX_REQUEST = 1 << 16
+# The maximal time budget in seconds of a search of the engine server, so
+# no request can keep a worker process busy for good.
+ENGINE_SERVER_MAX_TIME_LIMIT_S = 60.0
+# The number of records read or written at once in position dataset files
+# (see encoding.py).
+POSITION_CHUNK_SIZE = 1 << 16
+# True to score the leaves of a search node together with the NumPy batch
+# evaluation (see evaluation.py). It gives the same moves and scores.
+SEARCH_BATCH_LEAVES = False
+# The number of buckets in the search transposition table (two entries each).
+TRANSPOSITION_TABLE_SIZE = 1 << 16
+# The opening book file (see book.py). The book covers BOOK_PLIES plies,
+# every move is searched BOOK_DEPTH plies deep and at most
+# BOOK_MOVES_PER_POSITION moves scoring no more than BOOK_SCORE_MARGIN
+# below the best one are kept, with weights up to BOOK_MAX_WEIGHT.
+OPENING_BOOK_PATH = "opening_book.bin"
+BOOK_PLIES = 6
+BOOK_DEPTH = 8
+BOOK_MOVES_PER_POSITION = 2
+BOOK_SCORE_MARGIN = 0.05
+BOOK_MAX_WEIGHT = 100
+# The endgame tablebase files (see tablebase.py) and the maximal number of
+# pieces of the positions looked up in them.
+TABLEBASE_DIRECTORY = "tablebases"
+TABLEBASE_MAX_PIECES = 4
+
+PLAYER_COLOR_RED = "R"
+PLAYER_COLOR_BLACK = "B"
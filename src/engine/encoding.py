@@ -0,0 +1,355 @@
+'''
+This file contains the compact encodings of a position (a board and the
+side to move) and the position dataset files.
+The text is for people, like FEN in chess: the side to move and the
+squares of the pieces of both sides, kings prefixed by K, e.g.
+    R:B1,2,K7:R30,31
+Squares are numbered 1 to 32 in the bitboard order (see bitboard.py), so
+1 is the bottom left playable cell and 32 the top right one.
+The record is for machines: the black, red and king masks and the side to
+move in 13 bytes. A dataset file is a sequence of records without a
+header, it is read as a NumPy structured array mapped from the file, so a
+job can go through millions of positions in chunks, e.g. with
+evaluation.evaluate_batch, without building Piece objects.
+'''
+
+import struct
+
+import numpy
+
+from .bitboard import (
+    BLACK_KING_ROW_MASK,
+    FULL_MASK,
+    NUM_PLAYABLE_SQUARES,
+    RED_KING_ROW_MASK,
+    iterate_squares,
+)
+from .board import Board
+from .constants import (
+    PLAYER_COLOR_BLACK,
+    PLAYER_COLOR_RED,
+    POSITION_CHUNK_SIZE,
+)
+
+TEXT_SEPARATOR = ":"
+SQUARE_SEPARATOR = ","
+KING_PREFIX = "K"
+# A record is the black, red and king masks and the side to move.
+RECORD_FORMAT = struct.Struct("<IIIB")
+POSITION_DTYPE = numpy.dtype([
+    ("black", "<u4"),
+    ("red", "<u4"),
+    ("king", "<u4"),
+    ("color", "u1"),
+])
+COLOR_CODES = {PLAYER_COLOR_BLACK: 0, PLAYER_COLOR_RED: 1}
+CODE_COLORS = {code: color for color, code in COLOR_CODES.items()}
+
+
+def check_position(black_mask, red_mask, king_mask, color):
+    '''
+        Function -- check_position
+            Checks that masks and a color describe a position the game
+            can reach
+        Parameters:
+            black_mask -- bitboard of squares occupied by black pieces
+            red_mask -- bitboard of squares occupied by red pieces
+            king_mask -- bitboard of squares occupied by king pieces
+            color -- color of the side to move
+        Returns:
+            Nothing. Raises ValueError if the position is not valid.
+    '''
+    for mask in (black_mask, red_mask, king_mask):
+        if not 0 <= mask <= FULL_MASK:
+            raise ValueError("A mask must have 32 bits")
+    if black_mask & red_mask:
+        raise ValueError("A square has a black and a red piece")
+    if king_mask & ~(black_mask | red_mask):
+        raise ValueError("A king square has no piece")
+    # A man reaching the last row is promoted at once.
+    if (
+        black_mask & ~king_mask & BLACK_KING_ROW_MASK
+        or red_mask & ~king_mask & RED_KING_ROW_MASK
+    ):
+        raise ValueError("A man stands on its promotion row")
+    # The color can come from JSON, so it is not always hashable.
+    if not isinstance(color, str) or color not in COLOR_CODES:
+        raise ValueError("Unknown color {!r}".format(color))
+
+
+def get_position_text(board, color):
+    '''
+        Function -- get_position_text
+            Encodes a position as text
+        Parameters:
+            board -- the Board object
+            color -- color of the side to move
+        Returns:
+            The text, see the format above
+    '''
+    parts = [color]
+    for piece_color, mask in (
+        (PLAYER_COLOR_BLACK, board.black_mask),
+        (PLAYER_COLOR_RED, board.red_mask),
+    ):
+        squares = []
+        for index in iterate_squares(mask):
+            prefix = KING_PREFIX if board.king_mask >> index & 1 else ""
+            squares.append(prefix + str(index + 1))
+        parts.append(piece_color + SQUARE_SEPARATOR.join(squares))
+    return TEXT_SEPARATOR.join(parts)
+
+
+def parse_position_text(text):
+    '''
+        Function -- parse_position_text
+            Decodes a position from text
+        Parameters:
+            text -- the text, see the format above
+        Returns:
+            Tuple of the Board object and the color of the side to move.
+            Raises ValueError if the text is not valid.
+    '''
+    parts = text.strip().split(TEXT_SEPARATOR)
+    if len(parts) != 3:
+        raise ValueError("Expected 3 parts in {!r}".format(text))
+    color = parts[0]
+    masks = {}
+    for part in parts[1:]:
+        piece_color = part[:1]
+        if piece_color not in COLOR_CODES or piece_color in masks:
+            raise ValueError("Bad pieces {!r}".format(part))
+        mask = 0
+        king_mask = 0
+        for square in filter(None, part[1:].split(SQUARE_SEPARATOR)):
+            is_king = square.startswith(KING_PREFIX)
+            if is_king:
+                square = square[len(KING_PREFIX):]
+            if (
+                not square.isdigit()
+                or not 1 <= int(square) <= NUM_PLAYABLE_SQUARES
+            ):
+                raise ValueError("Bad square {!r}".format(square))
+            bit = 1 << (int(square) - 1)
+            mask |= bit
+            if is_king:
+                king_mask |= bit
+        masks[piece_color] = (mask, king_mask)
+    black_mask, black_kings = masks[PLAYER_COLOR_BLACK]
+    red_mask, red_kings = masks[PLAYER_COLOR_RED]
+    king_mask = black_kings | red_kings
+    check_position(black_mask, red_mask, king_mask, color)
+    return Board(
+        black_mask=black_mask, red_mask=red_mask, king_mask=king_mask
+    ), color
+
+
+def pack_position(board, color):
+    '''
+        Function -- pack_position
+            Encodes a position as a record
+        Parameters:
+            board -- the Board object
+            color -- color of the side to move
+        Returns:
+            The bytes of the record
+    '''
+    return RECORD_FORMAT.pack(
+        board.black_mask, board.red_mask, board.king_mask, COLOR_CODES[color]
+    )
+
+
+def unpack_position(data, offset=0):
+    '''
+        Function -- unpack_position
+            Decodes a position from a record
+        Parameters:
+            data -- the bytes with the record
+            offset -- the offset of the record in data
+        Returns:
+            Tuple of the Board object and the color of the side to move.
+            Raises ValueError if the record is not valid.
+    '''
+    try:
+        black_mask, red_mask, king_mask, code = RECORD_FORMAT.unpack_from(
+            data, offset
+        )
+    except struct.error as error:
+        raise ValueError(str(error))
+    color = CODE_COLORS.get(code)
+    check_position(black_mask, red_mask, king_mask, color)
+    return Board(
+        black_mask=black_mask, red_mask=red_mask, king_mask=king_mask
+    ), color
+
+
+def get_record_position(record):
+    '''
+        Function -- get_record_position
+            Decodes a position from an element of a position array
+        Parameters:
+            record -- the element of an array with POSITION_DTYPE
+        Returns:
+            Tuple of the Board object and the color of the side to move
+    '''
+    return Board(
+        black_mask=int(record["black"]),
+        red_mask=int(record["red"]),
+        king_mask=int(record["king"]),
+    ), CODE_COLORS[int(record["color"])]
+
+
+def read_positions(path):
+    '''
+        Function -- read_positions
+            Maps a dataset file to memory. The records are read from the
+            file when they are used.
+        Parameters:
+            path -- the path of the file
+        Returns:
+            The read-only array with POSITION_DTYPE.
+            Raises ValueError if the file is not a sequence of records.
+    '''
+    with open(path, "rb") as file:
+        size = file.seek(0, 2)
+    if size % POSITION_DTYPE.itemsize:
+        raise ValueError("{} is not a position file".format(path))
+    if size == 0:
+        # An empty file can't be mapped.
+        return numpy.empty(0, dtype=POSITION_DTYPE)
+    return numpy.memmap(path, dtype=POSITION_DTYPE, mode="r")
+
+
+def iterate_position_chunks(path, chunk_size=POSITION_CHUNK_SIZE):
+    '''
+        Function -- iterate_position_chunks
+            Goes through a dataset file in chunks
+        Parameters:
+            path -- the path of the file
+            chunk_size -- the number of records in a chunk
+        Returns:
+            Generator of arrays with POSITION_DTYPE, all of chunk_size
+            records but the last one
+    '''
+    positions = read_positions(path)
+    for start in range(0, len(positions), chunk_size):
+        yield positions[start:start + chunk_size]
+
+
+class PositionWriter:
+    '''
+        Class -- PositionWriter
+            Writes a dataset file record by record. The records are
+            buffered and written in chunks.
+        Attributes:
+            file -- the file object
+            buffer -- the array with POSITION_DTYPE of buffered records
+            size -- the number of buffered records
+        Methods:
+            write -- writes a position
+            write_masks -- writes a position given by masks
+            write_array -- writes an array of records
+            flush -- writes the buffered records
+            close -- writes the buffered records and closes the file
+    '''
+    def __init__(self, path, append=False, chunk_size=POSITION_CHUNK_SIZE):
+        '''
+            Constructor -- creates a new instance of PositionWriter
+            Parameters:
+                self -- the current PositionWriter object
+                path -- the path of the file
+                append -- True to add records to an existing file
+                chunk_size -- the number of buffered records
+        '''
+        self.file = open(path, "ab" if append else "wb")
+        self.buffer = numpy.empty(chunk_size, dtype=POSITION_DTYPE)
+        self.size = 0
+
+    def __enter__(self):
+        '''
+            Method -- __enter__
+                Starts a with block
+            Parameters:
+                self -- the current PositionWriter object
+            Returns:
+                The current PositionWriter object
+        '''
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        '''
+            Method -- __exit__
+                Closes the file at the end of a with block
+            Parameters:
+                self -- the current PositionWriter object
+                exc_type -- the type of the exception raised in the block
+                exc_value -- the exception raised in the block
+                traceback -- the traceback of the exception
+        '''
+        self.close()
+
+    def write(self, board, color):
+        '''
+        Method -- write
+            Writes a position
+        Parameter:
+            self -- the current PositionWriter object
+            board -- the Board object
+            color -- color of the side to move
+        '''
+        self.write_masks(
+            board.black_mask, board.red_mask, board.king_mask, color
+        )
+
+    def write_masks(self, black_mask, red_mask, king_mask, color):
+        '''
+        Method -- write_masks
+            Writes a position given by masks. Raises ValueError if the
+            position is not valid.
+        Parameter:
+            self -- the current PositionWriter object
+            black_mask -- bitboard of squares occupied by black pieces
+            red_mask -- bitboard of squares occupied by red pieces
+            king_mask -- bitboard of squares occupied by king pieces
+            color -- color of the side to move
+        '''
+        check_position(black_mask, red_mask, king_mask, color)
+        self.buffer[self.size] = (
+            black_mask, red_mask, king_mask, COLOR_CODES[color]
+        )
+        self.size += 1
+        if self.size == len(self.buffer):
+            self.flush()
+
+    def write_array(self, positions):
+        '''
+        Method -- write_array
+            Writes an array of records, e.g. a chunk of another file
+        Parameter:
+            self -- the current PositionWriter object
+            positions -- the array with POSITION_DTYPE
+        '''
+        self.flush()
+        numpy.asarray(positions, dtype=POSITION_DTYPE).tofile(self.file)
+
+    def flush(self):
+        '''
+        Method -- flush
+            Writes the buffered records
+        Parameter:
+            self -- the current PositionWriter object
+        '''
+        self.buffer[:self.size].tofile(self.file)
+        self.size = 0
+        self.file.flush()
+
+    def close(self):
+        '''
+        Method -- close
+            Writes the buffered records and closes the file
+        Parameter:
+            self -- the current PositionWriter object
+        '''
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
@@ -0,0 +1,84 @@
+'''
+This file contains the batch evaluation of positions with NumPy.
+Positions are given as arrays of bitboards (see bitboard.py), one
+element per position, and all of them are scored in one vectorized pass.
+The scores are the same as Board.get_score gives for every position.
+'''
+
+import numpy
+
+from .constants import PLAYER_COLOR_RED
+
+# The score of a position where one of the sides has no pieces, the same
+# as in Board.get_score.
+NO_PIECES_SCORE = 10000000000
+
+
+def encode_boards(boards):
+    '''
+        Function -- encode_boards
+            Encodes boards as arrays of bitboards
+        Parameters:
+            boards -- list of Board objects
+        Returns:
+            Tuple of the black, red and king masks as uint32 arrays
+    '''
+    return encode_masks([
+        (board.black_mask, board.red_mask, board.king_mask)
+        for board in boards
+    ])
+
+
+def encode_masks(masks):
+    '''
+        Function -- encode_masks
+            Encodes positions given by their masks as arrays of bitboards
+        Parameters:
+            masks -- list of (black_mask, red_mask, king_mask) tuples
+        Returns:
+            Tuple of the black, red and king masks as uint32 arrays
+    '''
+    array = numpy.array(masks, dtype=numpy.uint32).reshape(-1, 3)
+    return array[:, 0], array[:, 1], array[:, 2]
+
+
+def evaluate_batch(black_masks, red_masks, king_masks):
+    '''
+        Function -- evaluate_batch
+            Scores many positions at once, see Board.get_score
+        Parameters:
+            black_masks -- uint32 array of black piece bitboards
+            red_masks -- uint32 array of red piece bitboards
+            king_masks -- uint32 array of king bitboards
+        Returns:
+            Float64 array of the scores from the point of view of red
+    '''
+    blacks = numpy.bitwise_count(black_masks).astype(numpy.float64)
+    reds = numpy.bitwise_count(red_masks).astype(numpy.float64)
+    blacks_kings = numpy.bitwise_count(black_masks & king_masks)
+    reds_kings = numpy.bitwise_count(red_masks & king_masks)
+    blacks_value = blacks + 2 * blacks_kings
+    # Positions without black pieces are replaced below, the division
+    # must not fail on them.
+    scores = (reds + 2 * reds_kings) / numpy.where(
+        blacks == 0, 1, blacks_value
+    )
+    scores = numpy.where(blacks == 0, NO_PIECES_SCORE, scores)
+    return numpy.where(reds == 0, -NO_PIECES_SCORE, scores)
+
+
+def evaluate_masks(masks, color):
+    '''
+        Function -- evaluate_masks
+            Scores positions given by their masks from the point of view of
+            the side to move, see search.evaluate
+        Parameters:
+            masks -- list of (black_mask, red_mask, king_mask) tuples
+            color -- color of the side to move in all positions
+        Returns:
+            List of the scores as floats
+    '''
+    scores = evaluate_batch(*encode_masks(masks))
+    if color != PLAYER_COLOR_RED:
+        scores = -scores
+    return scores.tolist()
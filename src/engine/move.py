@@ -0,0 +1,169 @@
+'''
+This file handles everything related to piece moves in the game.
+'''
+
+COLUMN_NAMES = "abcdefgh"
+
+
+def get_square_name(board_x, board_y):
+    '''
+        Function -- get_square_name
+            Gets the name of the cell, columns are letters from "a" and
+            rows are numbers from 1, starting from the lower left corner
+        Parameters:
+            board_x -- coordinate of the cell in board format
+            board_y -- coordinate of the cell in board format
+        Returns:
+            The name of the cell, for example "c3"
+    '''
+    return COLUMN_NAMES[board_x] + str(board_y + 1)
+
+
+class Move:
+    '''
+        Class -- Move
+            Represents moves in the game
+        Attributes:
+            from_piece -- the piece to be moved
+            to_piece -- the piece after the move
+            remove -- If a capturing move, then a piece object to be removed
+                    by the first step. None otherwise.
+            path -- list of pieces after every step of the move, the last
+                    one is to_piece. A multistep capturing move has one
+                    step per captured piece.
+            captured -- list of pieces removed by the move, in the order
+                    of the steps
+        Methods:
+            is_capture -- checks if the move is capture move
+            append_step -- makes a multistep move by adding a capturing step
+            get_steps -- splits the move into single step moves
+            get_notation -- gets the text notation of the move
+    '''
+    __slots__ = ("from_piece", "to_piece", "remove", "path", "captured")
+
+    def __init__(
+        self, from_piece, to_piece, remove=None, path=None, captured=None
+    ):
+        '''
+            Constructor -- creates a new instance of Move
+            Parameters:
+                self -- the current Move object
+                from_piece -- the piece to be moved
+                to_piece -- the piece after the move
+                remove -- If a capturing move, then a piece object to be
+                    removed. None otherwise.
+                path -- list of pieces after every step or None for a single
+                    step move
+                captured -- list of removed pieces or None for a single step
+                    move
+        '''
+        self.from_piece = from_piece
+        self.to_piece = to_piece
+        if path is None:
+            path = [to_piece]
+        if captured is None:
+            captured = [] if remove is None else [remove]
+        if remove is None and len(captured) > 0:
+            remove = captured[0]
+        self.remove = remove
+        self.path = path
+        self.captured = captured
+
+    def is_capture(self):
+        '''
+        Method -- is_capture
+            Checks if the move is capture move
+        Parameter:
+            self -- the current Move object
+        Returns:
+            True if the move is capture move. Otherwise, False.
+        '''
+        return self.remove is not None
+
+    def append_step(self, step):
+        '''
+        Method -- append_step
+            Makes a multistep move by adding a capturing step
+        Parameter:
+            self -- the current Move object
+            step -- the single step capturing Move object that starts where
+                this move ends
+        Returns:
+            The new Move object that makes this move and then the step
+        '''
+        return Move(
+            from_piece=self.from_piece,
+            to_piece=step.to_piece,
+            path=self.path + [step.to_piece],
+            captured=self.captured + [step.remove],
+        )
+
+    def get_steps(self):
+        '''
+        Method -- get_steps
+            Splits the move into single step moves, so that a multistep
+            capturing move can be shown step by step
+        Parameter:
+            self -- the current Move object
+        Returns:
+            List of single step Move objects
+        '''
+        if len(self.path) == 1:
+            return [self]
+        result = []
+        from_piece = self.from_piece
+        for to_piece, remove in zip(self.path, self.captured):
+            result.append(Move(from_piece, to_piece, remove))
+            from_piece = to_piece
+        return result
+
+    def get_notation(self):
+        '''
+        Method -- get_notation
+            Gets the text notation of the move: names of the visited cells
+            separated by "-" for a non-capturing move and by "x" for a
+            capturing move, for example "c3-d4" or "c3xe5xc7"
+        Parameter:
+            self -- the current Move object
+        Returns:
+            The notation of the move
+        '''
+        separator = "x" if self.is_capture() else "-"
+        names = [get_square_name(
+            self.from_piece.board_x, self.from_piece.board_y
+        )]
+        for piece in self.path:
+            names.append(get_square_name(piece.board_x, piece.board_y))
+        return separator.join(names)
+
+    def __eq__(self, other):
+        '''
+            Method -- __eq__
+                Checks if two objects are equal
+            Parameters:
+                self -- The current Move object
+                other -- An object to compare self to.
+            Returns:
+                True if the two objects are equal, False otherwise.
+        '''
+        if self is other:
+            return True
+        if type(self) != type(other):
+            return False
+        return (
+            self.from_piece == other.from_piece and
+            self.to_piece == other.to_piece and
+            self.path == other.path and
+            self.captured == other.captured
+        )
+
+    def __hash__(self):
+        '''
+            Method -- __hash__
+                Gets the hash of the move, equal moves have equal hashes
+            Parameters:
+                self -- The current Move object
+            Returns:
+                The hash as an integer
+        '''
+        return hash((self.from_piece, self.to_piece, len(self.captured)))
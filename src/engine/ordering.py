@@ -0,0 +1,172 @@
+'''
+This file contains the move ordering used by the search.
+Alpha-beta prunes the most when the best move is searched first, so moves
+are sorted by how likely they are to be good: the move stored in the
+transposition table, promotions, killer moves of the same ply and then
+by the history heuristic. Captures that take more pieces go first.
+'''
+
+from .bitboard import NUM_PLAYABLE_SQUARES, square_index
+
+# Number of killer moves remembered per ply.
+KILLER_SLOTS = 2
+# Sort keys of the move classes. History scores stay below KILLER_SCORE.
+HASH_MOVE_SCORE = 4000000000
+PROMOTION_SCORE = 3000000000
+KILLER_SCORE = 2000000000
+# Bonuses for every captured piece and king, used to order captures
+# between themselves.
+CAPTURE_SCORE = 1000000
+KING_CAPTURE_SCORE = 1000000
+
+
+def get_move_squares(move):
+    '''
+        Function -- get_move_squares
+            Gets the bit numbers of the start and end squares of the move
+        Parameters:
+            move -- the Move object
+        Returns:
+            Tuple of the start and the end square bit numbers
+    '''
+    return (
+        square_index(move.from_piece.board_x, move.from_piece.board_y),
+        square_index(move.to_piece.board_x, move.to_piece.board_y),
+    )
+
+
+class MoveOrdering:
+    '''
+        Class -- MoveOrdering
+            Sorts moves for the search and learns from beta cutoffs
+        Attributes:
+            killers -- list of killer moves for every ply
+            history -- history heuristic scores indexed by start and end
+                squares
+            cutoffs -- number of beta cutoffs
+            first_move_cutoffs -- number of beta cutoffs produced by the
+                first searched move
+        Methods:
+            new_search -- prepares the tables for a new search
+            order_moves -- sorts moves, the most promising first
+            record_cutoff -- remembers a move that produced a beta cutoff
+            get_first_move_cutoff_rate -- gets the share of cutoffs
+                produced by the first move
+    '''
+    def __init__(self):
+        '''
+            Constructor -- creates a new instance of MoveOrdering
+            Parameters:
+                self -- the current MoveOrdering object
+        '''
+        self.killers = []
+        self.history = [
+            [0] * NUM_PLAYABLE_SQUARES for index in range(NUM_PLAYABLE_SQUARES)
+        ]
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def new_search(self):
+        '''
+        Method -- new_search
+            Prepares the tables for a new search. Killer moves and counters
+            are reset, history scores are halved so they follow the game.
+        Parameter:
+            self -- the current MoveOrdering object
+        '''
+        self.killers = []
+        for row in self.history:
+            for index in range(NUM_PLAYABLE_SQUARES):
+                row[index] //= 2
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def get_killers(self, ply):
+        '''
+        Method -- get_killers
+            Gets the killer moves of the ply
+        Parameter:
+            self -- the current MoveOrdering object
+            ply -- distance from the root in plies
+        Returns:
+            List of killer moves, the most recent first
+        '''
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        return self.killers[ply]
+
+    def order_moves(self, moves, ply, hash_move=None):
+        '''
+        Method -- order_moves
+            Sorts moves, the most promising first
+        Parameter:
+            self -- the current MoveOrdering object
+            moves -- list of Move objects
+            ply -- distance from the root in plies
+            hash_move -- the best move stored in the transposition table
+                or None
+        Returns:
+            New sorted list of moves
+        '''
+        if len(moves) <= 1:
+            return moves
+        killers = self.get_killers(ply)
+        scores = []
+        for move in moves:
+            if hash_move is not None and move == hash_move:
+                score = HASH_MOVE_SCORE
+            elif move.to_piece.is_king and not move.from_piece.is_king:
+                score = PROMOTION_SCORE
+            elif move in killers:
+                score = KILLER_SCORE - killers.index(move)
+            else:
+                from_index, to_index = get_move_squares(move)
+                score = self.history[from_index][to_index]
+            for piece in move.captured:
+                score += CAPTURE_SCORE
+                if piece.is_king:
+                    score += KING_CAPTURE_SCORE
+            scores.append(score)
+        # Stable sort keeps the generator order between equal moves.
+        order = sorted(
+            range(len(moves)), key=lambda index: scores[index], reverse=True
+        )
+        return [moves[index] for index in order]
+
+    def record_cutoff(self, move, ply, depth, move_number):
+        '''
+        Method -- record_cutoff
+            Remembers a move that produced a beta cutoff
+        Parameter:
+            self -- the current MoveOrdering object
+            move -- the Move object
+            ply -- distance from the root in plies
+            depth -- remaining search depth of the node
+            move_number -- position of the move in the searched order,
+                starting from 0
+        '''
+        self.cutoffs += 1
+        if move_number == 0:
+            self.first_move_cutoffs += 1
+        from_index, to_index = get_move_squares(move)
+        self.history[from_index][to_index] += depth * depth
+        if not move.is_capture():
+            killers = self.get_killers(ply)
+            if move in killers:
+                killers.remove(move)
+            killers.insert(0, move)
+            del killers[KILLER_SLOTS:]
+
+    def get_first_move_cutoff_rate(self):
+        '''
+        Method -- get_first_move_cutoff_rate
+            Gets the share of beta cutoffs produced by the first searched
+            move. The closer to one, the better the ordering.
+        Parameter:
+            self -- the current MoveOrdering object
+        Returns:
+            The rate as a float number, 0 if there were no cutoffs
+        '''
+        if self.cutoffs == 0:
+            return 0
+        return self.first_move_cutoffs / self.cutoffs
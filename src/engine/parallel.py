@@ -0,0 +1,467 @@
+'''
+This file contains the parallel search that uses several processes.
+The root moves are split between the workers of a process pool. The first
+(most promising) root move is searched alone to get a bound, then the
+other moves are searched in parallel with that bound (the young brothers
+wait scheme, applied at the root). Results are merged in the order of the
+root moves, so the chosen move doesn't depend on which worker ends first.
+Every worker keeps its transposition table and move ordering tables during
+one search, so an iteration uses what the previous ones learned, and
+starts from empty tables in the next search.
+'''
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError, wait
+
+from .constants import SEARCH_WORKERS
+from .ordering import MoveOrdering
+from .search import (
+    INFINITE_SCORE,
+    WIN_SCORE,
+    WIN_THRESHOLD,
+    Search,
+    SearchAborted,
+    SearchResult,
+    get_opponent_color,
+)
+from .search_stats import SearchStats
+from .tablebase import Tablebase
+
+# The Search object of the worker process, created by the first task.
+_worker_search = None
+# The id of the search whose tables the worker process keeps.
+_worker_search_id = None
+# The Event object of the worker process that stops its running task.
+_worker_stop_event = None
+# How often in seconds a waiting search checks if it was stopped.
+STOP_CHECK_INTERVAL_S = 0.05
+
+
+def init_worker(stop_event):
+    '''
+        Function -- init_worker
+            Prepares a worker process
+        Parameters:
+            stop_event -- the multiprocessing Event object set when the
+                search is stopped
+    '''
+    global _worker_stop_event
+    _worker_stop_event = stop_event
+
+
+def search_root_move(
+    board, color, move, depth, alpha, time_limit, node_limit, search_id=None
+):
+    '''
+        Function -- search_root_move
+            Searches one root move. Runs in a worker process.
+        Parameters:
+            board -- the Board object of the root position
+            color -- color of the side to move at the root
+            move -- the root Move object to search
+            depth -- the search depth in plies, counting the root move
+            alpha -- the best score already found at the root. Scores not
+                better than alpha are upper bounds.
+            time_limit -- the time budget in seconds or None
+            node_limit -- the budget in visited nodes or None
+            search_id -- the id of the search the task belongs to. The
+                tables of the worker are kept from the previous task of
+                the same search and cleared otherwise. None always clears
+                them.
+        Returns:
+            Tuple of the score (None if the search was aborted), the
+            principal variation starting with the move and the SearchStats
+            object of the task
+    '''
+    global _worker_search, _worker_search_id
+    if _worker_search is None:
+        _worker_search = Search(tablebase=Tablebase())
+    search = _worker_search
+    search.stop_event = _worker_stop_event
+    if search_id is None or search_id != _worker_search_id:
+        search.transposition_table.clear()
+        search.ordering = MoveOrdering()
+        _worker_search_id = search_id
+    start_time = search.start_stats()
+    search.deadline = None
+    if time_limit is not None:
+        search.deadline = time.perf_counter() + time_limit
+    search.node_limit = node_limit
+    try:
+        score, variation = search.negamax(
+            board.apply_move(move), get_opponent_color(color), depth - 1,
+            -INFINITE_SCORE, -alpha, 1,
+        )
+    except SearchAborted:
+        score = None
+    finally:
+        search.deadline = None
+        search.node_limit = None
+    search.finish_stats(None, start_time)
+    if score is None:
+        return None, [], search.stats
+    return -score, [move] + variation, search.stats
+
+
+class ParallelSearch:
+    '''
+        Class -- ParallelSearch
+            Search that splits the root moves between worker processes.
+            Has the same find_best_move and iterative_deepening methods as
+            Search. The workers stay alive until shutdown is called.
+        Attributes:
+            workers -- the number of worker processes
+            stop_event -- the multiprocessing Event object shared with the
+                workers, set while a stop is requested
+            executor -- the ProcessPoolExecutor object
+            nodes -- number of nodes visited by the last search
+            stats -- the SearchStats object of the last search, the
+                counters of all workers added up
+            search_id -- the id of the last search, it tells the workers
+                when to clear their tables
+            stop_requested -- True if stop was called. The running tasks
+                of the workers are aborted.
+        Methods:
+            find_best_move -- finds the best move for a side
+            iterative_deepening -- finds the best move within a time or
+                node budget
+            search_root -- searches the root position to a fixed depth
+            start_stats -- starts the statistics of a search
+            finish_stats -- completes the statistics and attaches them to
+                the result
+            add_stats -- adds the statistics of a worker task
+            submit_root_move -- sends one root move to the worker processes
+            wait_root_move -- waits for the result of one root move
+            stop -- asks a running search to end
+            shutdown -- stops the worker processes
+    '''
+    def __init__(self, workers=SEARCH_WORKERS):
+        '''
+            Constructor -- creates a new instance of ParallelSearch
+            Parameters:
+                self -- the current ParallelSearch object
+                workers -- the number of worker processes
+        '''
+        self.workers = workers
+        self.stop_event = multiprocessing.Event()
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=(self.stop_event,),
+        )
+        self.nodes = 0
+        self.stats = SearchStats()
+        self.search_id = 0
+
+    @property
+    def stop_requested(self):
+        '''
+        Method -- stop_requested
+            Tells if a stop is requested
+        Parameter:
+            self -- the current ParallelSearch object
+        Returns:
+            True if the stop event is set
+        '''
+        return self.stop_event.is_set()
+
+    @stop_requested.setter
+    def stop_requested(self, value):
+        '''
+        Method -- stop_requested
+            Sets or clears the stop event
+        Parameter:
+            self -- the current ParallelSearch object
+            value -- True to request a stop, False to clear it
+        '''
+        if value:
+            self.stop_event.set()
+        else:
+            self.stop_event.clear()
+
+    def find_best_move(self, board, color, depth, options=None):
+        '''
+        Method -- find_best_move
+            Finds the best move for a side
+        Parameter:
+            self -- the current ParallelSearch object
+            board -- the Board object
+            color -- color of the side to move
+            depth -- the search depth in plies, at least 1
+            options -- moves to choose from or None for all moves of the
+                color
+        Returns:
+            The SearchResult object with the statistics
+        '''
+        start_time = self.start_stats()
+        return self.finish_stats(
+            self.search_root(board, color, depth, options), start_time
+        )
+
+    def iterative_deepening(
+        self,
+        board,
+        color,
+        max_depth,
+        time_limit=None,
+        node_limit=None,
+        options=None,
+    ):
+        '''
+        Method -- iterative_deepening
+            Finds the best move within a time or node budget, see
+            Search.iterative_deepening. The best move of an iteration is
+            searched first in the next one. The node budget counts the
+            nodes of the whole search, as in Search.
+        Parameter:
+            self -- the current ParallelSearch object
+            board -- the Board object
+            color -- color of the side to move
+            max_depth -- the maximal search depth in plies
+            time_limit -- the time budget in seconds or None
+            node_limit -- the budget in visited nodes or None
+            options -- moves to choose from or None for all moves of the
+                color
+        Returns:
+            The SearchResult object of the deepest completed iteration with
+            the statistics of the whole search or None if the search was
+            stopped during the first one
+        '''
+        start_time = self.start_stats()
+        root_moves = options
+        if root_moves is None:
+            root_moves = board.get_all_moves(color)
+        result = None
+        for depth in range(1, max(max_depth, 1) + 1):
+            deadline = None
+            if depth > 1 and time_limit is not None:
+                deadline = start_time + time_limit
+            iteration_node_limit = None
+            if depth > 1 and node_limit is not None:
+                iteration_node_limit = node_limit - self.nodes
+                if iteration_node_limit <= 0:
+                    break
+            if result is not None and result.move is not None:
+                root_moves = [result.move] + [
+                    move for move in root_moves if move != result.move
+                ]
+            try:
+                result = self.search_root(
+                    board,
+                    color,
+                    depth,
+                    root_moves,
+                    deadline,
+                    iteration_node_limit,
+                )
+            except SearchAborted:
+                break
+            if (
+                len(root_moves) <= 1
+                or abs(result.score) > WIN_THRESHOLD
+                or (
+                    time_limit is not None
+                    and time.perf_counter() - start_time >= time_limit
+                )
+            ):
+                break
+        return self.finish_stats(result, start_time)
+
+    def search_root(
+        self,
+        board,
+        color,
+        depth,
+        options=None,
+        deadline=None,
+        node_limit=None,
+    ):
+        '''
+        Method -- search_root
+            Searches the root position to a fixed depth. The first root
+            move is searched alone, the others in parallel with its score
+            as the bound.
+        Parameter:
+            self -- the current ParallelSearch object
+            board -- the Board object
+            color -- color of the side to move
+            depth -- the search depth in plies, at least 1
+            options -- moves to choose from, the most promising first, or
+                None for all moves
+            deadline -- time (time.perf_counter) when the search has to
+                stop or None
+            node_limit -- the budget in visited nodes for the whole
+                iteration or None. The first root move can use all of it,
+                the rest is shared equally by the other moves.
+        Returns:
+            The SearchResult object. Raises SearchAborted if the budget was
+            spent before all root moves were searched.
+        '''
+        depth = max(depth, 1)
+        root_moves = options
+        if root_moves is None:
+            root_moves = board.get_all_moves(color)
+        if len(root_moves) == 0:
+            return SearchResult(None, -WIN_SCORE, [], depth)
+        future = self.submit_root_move(
+            board, color, root_moves[0], depth, -INFINITE_SCORE, deadline,
+            node_limit,
+        )
+        best_score, best_variation, stats = self.wait_root_move(
+            future, [future]
+        )
+        self.add_stats(stats)
+        if best_score is None:
+            raise SearchAborted()
+        if len(root_moves) == 1:
+            return SearchResult(
+                best_variation[0], best_score, best_variation, depth
+            )
+        task_node_limit = None
+        if node_limit is not None:
+            task_node_limit = (node_limit - stats.nodes) // (
+                len(root_moves) - 1
+            )
+            if task_node_limit <= 0:
+                raise SearchAborted()
+        futures = [
+            self.submit_root_move(
+                board, color, move, depth, best_score, deadline,
+                task_node_limit,
+            )
+            for move in root_moves[1:]
+        ]
+        aborted = False
+        for future in futures:
+            score, variation, stats = self.wait_root_move(future, futures)
+            self.add_stats(stats)
+            if score is None:
+                aborted = True
+            elif score > best_score:
+                best_score = score
+                best_variation = variation
+        if aborted:
+            raise SearchAborted()
+        return SearchResult(
+            best_variation[0], best_score, best_variation, depth
+        )
+
+    def start_stats(self):
+        '''
+        Method -- start_stats
+            Starts the statistics of a search
+        Parameter:
+            self -- the current ParallelSearch object
+        Returns:
+            The start time of the search (time.perf_counter)
+        '''
+        self.nodes = 0
+        self.stats = SearchStats()
+        self.search_id += 1
+        return time.perf_counter()
+
+    def finish_stats(self, result, start_time):
+        '''
+        Method -- finish_stats
+            Completes the statistics of a search and attaches them to the
+            result
+        Parameter:
+            self -- the current ParallelSearch object
+            result -- the SearchResult object or None
+            start_time -- the start time of the search (time.perf_counter)
+        Returns:
+            The result
+        '''
+        self.stats.time_s = time.perf_counter() - start_time
+        if result is not None:
+            self.stats.depth = result.depth
+            result.stats = self.stats
+        return result
+
+    def add_stats(self, stats):
+        '''
+        Method -- add_stats
+            Adds the statistics of a worker task to the search
+        Parameter:
+            self -- the current ParallelSearch object
+            stats -- the SearchStats object of the task
+        '''
+        self.stats.add(stats)
+        self.nodes = self.stats.nodes
+
+    def submit_root_move(
+        self, board, color, move, depth, alpha, deadline, node_limit
+    ):
+        '''
+        Method -- submit_root_move
+            Sends one root move to the worker processes
+        Parameter:
+            self -- the current ParallelSearch object
+            board -- the Board object
+            color -- color of the side to move
+            move -- the root Move object to search
+            depth -- the search depth in plies
+            alpha -- the best score already found at the root
+            deadline -- time (time.perf_counter) when the search has to
+                stop or None
+            node_limit -- the budget in visited nodes for the move or None
+        Returns:
+            The Future object of search_root_move
+        '''
+        time_limit = None
+        if deadline is not None:
+            time_limit = max(deadline - time.perf_counter(), 0)
+        return self.executor.submit(
+            search_root_move,
+            board, color, move, depth, alpha, time_limit, node_limit,
+            self.search_id,
+        )
+
+    def wait_root_move(self, future, futures):
+        '''
+        Method -- wait_root_move
+            Waits for the result of one root move. If the search is
+            stopped meanwhile, the moves not started yet are canceled and
+            the started ones are aborted by the stop event, the method
+            returns when all of them have ended.
+        Parameter:
+            self -- the current ParallelSearch object
+            future -- the Future object of search_root_move
+            futures -- all running Future objects of the iteration,
+                including future
+        Returns:
+            The result of search_root_move. Raises SearchAborted if the
+            search was stopped.
+        '''
+        while True:
+            if self.stop_requested:
+                for other in futures:
+                    other.cancel()
+                wait(futures)
+                raise SearchAborted()
+            try:
+                return future.result(timeout=STOP_CHECK_INTERVAL_S)
+            except TimeoutError:
+                pass
+
+    def stop(self):
+        '''
+        Method -- stop
+            Asks a running search to end, it raises SearchAborted in the
+            current iteration and the running tasks of the workers are
+            aborted. Can be called from another thread. The caller resets
+            stop_requested before the next search.
+        Parameter:
+            self -- the current ParallelSearch object
+        '''
+        self.stop_requested = True
+
+    def shutdown(self):
+        '''
+        Method -- shutdown
+            Stops the worker processes
+        Parameter:
+            self -- the current ParallelSearch object
+        '''
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,106 @@
+'''
+This file contains the perft (performance test) tool for move generation.
+perft counts the leaf nodes of the full game tree to a fixed depth. The
+counts from the initial position are known, so the tool checks both the
+correctness and the speed of the move generator.
+Run "python -m engine.perft DEPTH" to print the counts, add "--divide" to
+print them for every root move.
+'''
+
+import argparse
+import time
+
+from .board import Board, make_initial_pieces
+from .constants import PLAYER_COLOR_BLACK
+from .search import get_opponent_color
+
+# Leaf counts from the initial position with black (the player) to move.
+# A multistep capture is one move.
+KNOWN_PERFT_COUNTS = {
+    1: 7,
+    2: 49,
+    3: 302,
+    4: 1469,
+    5: 7361,
+    6: 36768,
+    7: 179740,
+    8: 845931,
+}
+
+
+def perft(board, color, depth):
+    '''
+        Function -- perft
+            Counts the leaf nodes of the game tree
+        Parameters:
+            board -- the Board object
+            color -- color of the side to move
+            depth -- the depth of the tree in plies
+        Returns:
+            The number of positions reached after depth plies
+    '''
+    if depth == 0:
+        return 1
+    moves = board.get_all_moves(color)
+    if depth == 1:
+        return len(moves)
+    next_color = get_opponent_color(color)
+    result = 0
+    for move in moves:
+        result += perft(board.apply_move(move), next_color, depth - 1)
+    return result
+
+
+def perft_divide(board, color, depth):
+    '''
+        Function -- perft_divide
+            Counts the leaf nodes of the game tree for every root move
+        Parameters:
+            board -- the Board object
+            color -- color of the side to move
+            depth -- the depth of the tree in plies, at least 1
+        Returns:
+            List of tuples of the root Move object and its leaf count
+    '''
+    next_color = get_opponent_color(color)
+    result = []
+    for move in board.get_all_moves(color):
+        result.append(
+            (move, perft(board.apply_move(move), next_color, depth - 1))
+        )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Counts move generator nodes from the initial position."
+    )
+    parser.add_argument("depth", type=int, help="the depth in plies")
+    parser.add_argument(
+        "--divide",
+        action="store_true",
+        help="print the counts for every root move",
+    )
+    arguments = parser.parse_args()
+    board = Board(make_initial_pieces())
+    start_time = time.perf_counter()
+    if arguments.divide:
+        nodes = 0
+        for move, count in perft_divide(
+            board, PLAYER_COLOR_BLACK, arguments.depth
+        ):
+            print("{:<12} {}".format(move.get_notation(), count))
+            nodes += count
+    else:
+        nodes = perft(board, PLAYER_COLOR_BLACK, arguments.depth)
+    elapsed = time.perf_counter() - start_time
+    print("Nodes: {}".format(nodes))
+    print("Time: {:.3f} s".format(elapsed))
+    print("Nodes per second: {:.0f}".format(nodes / max(elapsed, 1e-9)))
+    expected = KNOWN_PERFT_COUNTS.get(arguments.depth)
+    if expected is not None and expected != nodes:
+        print("Expected {} nodes".format(expected))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+'''
+This file handles everything related to pieces in the game.
+'''
+
+from .bitboard import (
+    BLACK_STEPS,
+    KING_STEPS,
+    RED_STEPS,
+    SQUARE_STEPS,
+    SQUARE_X,
+    SQUARE_Y,
+    square_index,
+)
+from .constants import NUM_SQUARES, PLAYER_COLOR_BLACK, PLAYER_COLOR_RED
+from .move import Move
+
+# The row where the men of every color become kings.
+KING_ROWS = {PLAYER_COLOR_BLACK: NUM_SQUARES - 1, PLAYER_COLOR_RED: 0}
+
+
+class Piece:
+    '''
+        Class -- Piece
+            Represents a piece in the game. Pieces are immutable, so the
+            shared pieces (see get_piece) can be used by every board.
+        Attributes:
+            board_x -- x-coordinate of the piece on the board
+            board_y -- y-coordinate of the piece on the board
+            color -- the color of the piece
+            is_king -- if the piece is king type or not. False by default.
+        Methods:
+            check_is_inside -- checks if the coordinates of the piece are
+                in the bound of the board
+            maybe_promote_to_king -- gets the piece promoted to king if it
+                is required by the game rules
+            move_by -- creates a new Piece by moving the current one by
+                a provided offset
+            get_allowed_steps -- looks for all available steps (move offsets)
+                for this Piece object
+            get_square_steps -- gets the precomputed steps from the square
+                of this Piece object
+            get_normal_moves -- looks for all available non-capture moves for
+                this Piece object
+            get_capture_moves -- looks for all available capture moves for
+                this Piece object
+    '''
+    __slots__ = ("board_x", "board_y", "color", "is_king")
+
+    def __init__(self, board_x, board_y, color, is_king=False):
+        '''
+            Constructor -- creates a new instance of Piece
+            Parameters:
+                self -- the current Piece object
+                board_x -- x-coordinate of the piece on the board
+                board_y -- y-coordinate of the piece on the board
+                color -- the color of the piece
+                is_king -- if the piece is king type or not. False by default.
+        '''
+        object.__setattr__(self, "board_x", board_x)
+        object.__setattr__(self, "board_y", board_y)
+        object.__setattr__(self, "color", color)
+        object.__setattr__(self, "is_king", is_king)
+
+    def __setattr__(self, name, value):
+        '''
+            Method -- __setattr__
+                Rejects changes, pieces are immutable
+            Parameters:
+                self -- The current Piece object
+                name -- the name of the attribute
+                value -- the new value of the attribute
+        '''
+        raise AttributeError("Piece objects are immutable")
+
+    def __delattr__(self, name):
+        '''
+            Method -- __delattr__
+                Rejects changes, pieces are immutable
+            Parameters:
+                self -- The current Piece object
+                name -- the name of the attribute
+        '''
+        raise AttributeError("Piece objects are immutable")
+
+    def __reduce__(self):
+        '''
+            Method -- __reduce__
+                Tells pickle how to rebuild the piece, as the shared piece
+                of the process that loads it
+            Parameters:
+                self -- The current Piece object
+            Returns:
+                Tuple of the function and its arguments
+        '''
+        return get_piece, (
+            self.board_x, self.board_y, self.color, self.is_king
+        )
+
+    def check_is_inside(self):
+        '''
+        Method -- check_is_inside
+            Checks if the coordinates of the piece are in bound of the board
+        Parameter:
+            self -- the current Piece object
+        Returns:
+            True if the piece is in board bounds. Otherwise, False.
+        '''
+        return (
+            0 <= self.board_x < 8
+            and 0 <= self.board_y < 8
+        )
+
+    def maybe_promote_to_king(self):
+        '''
+        Method -- maybe_promote_to_king
+            Gets the piece promoted to king if it is required by the game
+            rules. The piece itself is not changed.
+        Parameter:
+            self -- the current Piece object
+        Returns:
+            The shared king Piece object on the same square if the piece
+            is on the king row of its color. Otherwise, the piece itself.
+        '''
+        if self.is_king or self.board_y != KING_ROWS[self.color]:
+            return self
+        return get_piece(self.board_x, self.board_y, self.color, True)
+
+    def move_by(self, board_dx, board_dy):
+        '''
+        Method -- move_by
+            Creates a new Piece by moving the current one by a provided offset
+        Parameter:
+            self -- the current Piece object
+            board_dx -- desired x-coordinate offset
+            board_dy -- desired y-coordinate offset
+        Returns:
+            A new piece moved by a given offset, if it is inside the board (the
+            move is allowed). Also promotes the piece to the king if it has
+            reached the end of the board.
+        '''
+        board_x = self.board_x + board_dx
+        board_y = self.board_y + board_dy
+        if not (0 <= board_x < NUM_SQUARES and 0 <= board_y < NUM_SQUARES):
+            return None
+        return get_piece(
+            board_x,
+            board_y,
+            self.color,
+            self.is_king or board_y == KING_ROWS[self.color],
+        )
+
+    def get_allowed_steps(self):
+        '''
+        Method -- get_allowed_steps
+            Looks for all available steps (move offsets) for this Piece object
+        Parameter:
+            self -- the current Piece object
+        Returns:
+            All available steps for this Piece object
+        '''
+        if self.is_king:
+            return KING_STEPS
+        if self.color == PLAYER_COLOR_RED:
+            return RED_STEPS
+        return BLACK_STEPS
+
+    def get_square_steps(self):
+        '''
+        Method -- get_square_steps
+            Gets the precomputed steps from the square of this Piece object
+        Parameter:
+            self -- the current Piece object
+        Returns:
+            List of steps, see bitboard.make_square_steps. Pieces that are
+            not on a playable square have no steps.
+        '''
+        index = square_index(self.board_x, self.board_y)
+        if index is None:
+            return []
+        return SQUARE_STEPS[(self.color, self.is_king)][index]
+
+    def get_normal_moves(self, board):
+        '''
+        Method -- get_normal_moves
+            Looks for all available non-capture moves for this Piece object
+        Parameter:
+            self -- the current Piece object
+            board -- current Board object state
+        Returns:
+            All available moves for this Piece object that are not capturing
+        '''
+        occupied = board.black_mask | board.red_mask
+        result = []
+        for direction, step, jump_over, jump, step_promotes, jump_promotes in (
+            self.get_square_steps()
+        ):
+            if not occupied >> step & 1:
+                result.append(Move(
+                    from_piece=self,
+                    to_piece=get_piece(
+                        SQUARE_X[step], SQUARE_Y[step], self.color,
+                        self.is_king or step_promotes,
+                    ),
+                ))
+        return result
+
+    def get_capture_moves(self, board):
+        '''
+        Method -- get_capture_moves
+            Looks for all available capture moves for this Piece object
+        Parameter:
+            self -- the current Piece object
+            board -- current Board object state
+        Returns:
+            All available moves for this Piece object that are capturing
+        '''
+        own, opponent = board.get_color_masks(self.color)
+        occupied = own | opponent
+        result = []
+        for direction, step, jump_over, jump, step_promotes, jump_promotes in (
+            self.get_square_steps()
+        ):
+            if (
+                jump is not None
+                and opponent >> jump_over & 1
+                and not occupied >> jump & 1
+            ):
+                result.append(Move(
+                    from_piece=self,
+                    to_piece=get_piece(
+                        SQUARE_X[jump], SQUARE_Y[jump], self.color,
+                        self.is_king or jump_promotes,
+                    ),
+                    remove=board.make_piece_at(jump_over),
+                ))
+        return result
+
+    def __eq__(self, other):
+        '''
+            Method -- __eq__
+                Checks if two objects are equal
+            Parameters:
+                self -- The current Piece object
+                other -- An object to compare self to.
+            Returns:
+                True if the two objects are equal, False otherwise.
+        '''
+        if self is other:
+            return True
+        if type(self) != type(other):
+            return False
+        return (
+            self.board_x == other.board_x and
+            self.board_y == other.board_y and
+            self.color == other.color and
+            self.is_king == other.is_king
+        )
+
+    def __hash__(self):
+        '''
+            Method -- __hash__
+                Gets the hash of the piece, equal pieces have equal hashes
+            Parameters:
+                self -- The current Piece object
+            Returns:
+                The hash as an integer
+        '''
+        return hash((self.board_x, self.board_y, self.color, self.is_king))
+
+
+def make_shared_pieces():
+    '''
+        Function -- make_shared_pieces
+            Makes one Piece object for every square, color and king state
+        Returns:
+            Dictionary of Piece objects, where the key is a tuple of
+            board_x, board_y, color and is_king
+    '''
+    result = {}
+    for board_x in range(NUM_SQUARES):
+        for board_y in range(NUM_SQUARES):
+            for color in (PLAYER_COLOR_BLACK, PLAYER_COLOR_RED):
+                for is_king in (False, True):
+                    key = (board_x, board_y, color, is_king)
+                    result[key] = Piece(*key)
+    return result
+
+
+SHARED_PIECES = make_shared_pieces()
+
+
+def get_piece(board_x, board_y, color, is_king=False):
+    '''
+        Function -- get_piece
+            Gets the shared Piece object. The move generator and the board
+            use shared pieces instead of creating new ones, they can't be
+            changed.
+        Parameters:
+            board_x -- x-coordinate of the piece on the board
+            board_y -- y-coordinate of the piece on the board
+            color -- the color of the piece
+            is_king -- if the piece is king type or not. False by default.
+        Returns:
+            The shared Piece object, or a new one if the coordinates are
+            outside the board
+    '''
+    piece = SHARED_PIECES.get((board_x, board_y, color, is_king))
+    if piece is None:
+        return Piece(board_x, board_y, color, is_king)
+    return piece
@@ -0,0 +1,101 @@
+'''
+This file contains pondering: searching on the player's time.
+After the computer has moved, a background thread searches the position
+with the player to move. That search visits all replies of the player
+and fills the transposition table of the shared Search object, so the
+search of the computer move after the actual reply starts with the hash
+moves and bounds already stored. The thread is stopped before the
+computer searches, the playing strength doesn't change.
+'''
+
+import threading
+
+from .constants import MAX_SEARCH_DEPTH
+
+
+class Ponderer:
+    '''
+        Class -- Ponderer
+            Runs a Search object on a background thread
+        Attributes:
+            search -- the Search object, shared with the computer moves
+            thread -- the running thread or None
+            result -- the SearchResult object of the last pondering search
+                or None if it was stopped during the first iteration
+        Methods:
+            start -- starts pondering on a position
+            run -- searches the position, runs on the thread
+            stop -- stops pondering and waits for the thread
+            is_running -- checks if the thread is running
+    '''
+    def __init__(self, search):
+        '''
+            Constructor -- creates a new instance of Ponderer
+            Parameters:
+                self -- the current Ponderer object
+                search -- the Search object, shared with the computer moves
+        '''
+        self.search = search
+        self.thread = None
+        self.result = None
+
+    def start(self, board, color, max_depth=MAX_SEARCH_DEPTH):
+        '''
+        Method -- start
+            Starts pondering on a position. A running pondering search is
+            stopped first.
+        Parameter:
+            self -- the current Ponderer object
+            board -- the Board object, it is not changed by the search
+            color -- color of the side to move
+            max_depth -- the maximal search depth in plies
+        '''
+        self.stop()
+        self.result = None
+        self.thread = threading.Thread(
+            target=self.run, args=(board, color, max_depth), daemon=True
+        )
+        self.thread.start()
+
+    def run(self, board, color, max_depth):
+        '''
+        Method -- run
+            Searches the position without a time limit until max_depth or
+            a stop. Runs on the thread.
+        Parameter:
+            self -- the current Ponderer object
+            board -- the Board object
+            color -- color of the side to move
+            max_depth -- the maximal search depth in plies
+        '''
+        self.result = self.search.iterative_deepening(
+            board, color, max_depth
+        )
+
+    def stop(self):
+        '''
+        Method -- stop
+            Stops pondering and waits for the thread, so the Search object
+            can be used again
+        Parameter:
+            self -- the current Ponderer object
+        Returns:
+            The SearchResult object of the pondering search or None
+        '''
+        if self.thread is not None:
+            self.search.stop()
+            self.thread.join()
+            self.thread = None
+            self.search.stop_requested = False
+        return self.result
+
+    def is_running(self):
+        '''
+        Method -- is_running
+            Checks if the pondering thread is running
+        Parameter:
+            self -- the current Ponderer object
+        Returns:
+            True if the thread is searching. Otherwise, False.
+        '''
+        return self.thread is not None and self.thread.is_alive()
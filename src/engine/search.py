@@ -0,0 +1,573 @@
+'''
+This file contains the game tree search used by the computer player.
+The search is a negamax search with alpha-beta pruning: every score is
+computed from the point of view of the side to move, so one function
+serves both colors.
+'''
+
+import time
+
+from .constants import (
+    PLAYER_COLOR_BLACK,
+    PLAYER_COLOR_RED,
+    SEARCH_BATCH_LEAVES,
+)
+from .evaluation import evaluate_masks
+from .ordering import MoveOrdering
+from .search_stats import SearchStats
+from .tablebase import LOSS, WIN
+from .transposition import (
+    EXACT,
+    LOWER_BOUND,
+    UPPER_BOUND,
+    TranspositionTable,
+)
+from .zobrist import BLACK_TO_MOVE_KEY
+
+# The score of a won position. It matches the score returned by
+# Board.get_score when one of the sides has no pieces left.
+WIN_SCORE = 10000000000
+INFINITE_SCORE = 1000000000000
+# Scores closer than this to WIN_SCORE are wins found by the search. They
+# depend on the distance from the root, so they are stored in the
+# transposition table relative to the node.
+WIN_THRESHOLD = WIN_SCORE - 1000
+# The clock is checked once per this many nodes.
+TIME_CHECK_INTERVAL = 256
+
+
+def get_opponent_color(color):
+    '''
+        Function -- get_opponent_color
+            Gets the color of the opponent
+        Parameters:
+            color -- color of pieces
+        Returns:
+            The color of the other side
+    '''
+    if color == PLAYER_COLOR_RED:
+        return PLAYER_COLOR_BLACK
+    return PLAYER_COLOR_RED
+
+
+def evaluate(board, color):
+    '''
+        Function -- evaluate
+            Evaluates the board from the point of view of the color
+        Parameters:
+            board -- the Board object
+            color -- color of the side to move
+        Returns:
+            Board.get_score for red, the negated score for black
+    '''
+    if color == PLAYER_COLOR_RED:
+        return board.get_score()
+    return -board.get_score()
+
+
+def get_leaf_score(score, ply):
+    '''
+        Function -- get_leaf_score
+            Converts the evaluation of a leaf to the search score. A side
+            without pieces has lost, the distance is counted like for the
+            positions without moves.
+        Parameters:
+            score -- the evaluation from the point of view of the side to
+                move, see evaluate
+            ply -- distance of the leaf from the root in plies
+        Returns:
+            The score of the leaf
+    '''
+    if score >= WIN_SCORE:
+        return WIN_SCORE - ply
+    if score <= -WIN_SCORE:
+        return -(WIN_SCORE - ply)
+    return score
+
+
+def get_position_key(board, color):
+    '''
+        Function -- get_position_key
+            Gets the hash of the position including the side to move
+        Parameters:
+            board -- the Board object
+            color -- color of the side to move
+        Returns:
+            The key used in the transposition table
+    '''
+    if color == PLAYER_COLOR_BLACK:
+        return board.zobrist_hash ^ BLACK_TO_MOVE_KEY
+    return board.zobrist_hash
+
+
+def score_to_table(score, ply):
+    '''
+        Function -- score_to_table
+            Converts a score to the form stored in the transposition table
+        Parameters:
+            score -- the score relative to the root
+            ply -- distance of the node from the root in plies
+        Returns:
+            The score relative to the node
+    '''
+    if score > WIN_THRESHOLD:
+        return score + ply
+    if score < -WIN_THRESHOLD:
+        return score - ply
+    return score
+
+
+def score_from_table(score, ply):
+    '''
+        Function -- score_from_table
+            Converts a score stored in the transposition table back
+        Parameters:
+            score -- the score relative to the node
+            ply -- distance of the node from the root in plies
+        Returns:
+            The score relative to the root
+    '''
+    if score > WIN_THRESHOLD:
+        return score - ply
+    if score < -WIN_THRESHOLD:
+        return score + ply
+    return score
+
+
+class SearchAborted(Exception):
+    '''
+        Class -- SearchAborted
+            Raised inside the search when the time or node budget is spent
+    '''
+
+
+class SearchResult:
+    '''
+        Class -- SearchResult
+            Represents the outcome of a search
+        Attributes:
+            move -- the best move or None if there are no moves
+            score -- the score of the best move from the point of view of
+                the searching side
+            principal_variation -- list of moves expected to be played,
+                starting with the best move
+            depth -- the depth of the search in plies
+            stats -- the SearchStats object of the search or None
+    '''
+    def __init__(
+        self, move, score, principal_variation, depth=0, stats=None
+    ):
+        '''
+            Constructor -- creates a new instance of SearchResult
+            Parameters:
+                self -- the current SearchResult object
+                move -- the best move or None if there are no moves
+                score -- the score of the best move
+                principal_variation -- list of expected moves
+                depth -- the depth of the search in plies
+                stats -- the SearchStats object of the search or None
+        '''
+        self.move = move
+        self.score = score
+        self.principal_variation = principal_variation
+        self.depth = depth
+        self.stats = stats
+
+
+class Search:
+    '''
+        Class -- Search
+            Negamax search with alpha-beta pruning
+        Attributes:
+            transposition_table -- the TranspositionTable object shared by
+                all searches of this object
+            ordering -- the MoveOrdering object with killer moves and
+                history heuristic scores
+            nodes -- number of nodes visited by the last search
+            stats -- the SearchStats object of the last search
+            deadline -- time (time.perf_counter) when the search has to stop
+                or None
+            node_limit -- number of nodes after which the search has to stop
+                or None
+            tablebase -- the Tablebase object probed in endgames or None
+            batch_leaves -- True to score the leaves of a node together
+                with the batch evaluation, not used with a tablebase
+            stop_requested -- True when the search has to stop as soon as
+                possible. Set by stop, the owner of the search clears it.
+            stop_event -- the multiprocessing Event object that stops the
+                search of a worker process when it is set, or None
+        Methods:
+            find_best_move -- finds the best move for a side
+            iterative_deepening -- finds the best move within a time or
+                node budget
+            search_root -- searches the root position to a fixed depth
+            start_stats -- starts the statistics of a search
+            finish_stats -- completes the statistics and attaches them to
+                the result
+            generate_moves -- generates the moves of a node
+            evaluate -- scores a leaf
+            check_limits -- aborts the search when the budget is spent
+            stop -- asks a running search to stop
+            evaluate_leaves -- scores the positions after moves at once
+            negamax -- searches one node of the game tree
+    '''
+    def __init__(
+        self,
+        transposition_table=None,
+        tablebase=None,
+        batch_leaves=SEARCH_BATCH_LEAVES,
+    ):
+        '''
+            Constructor -- creates a new instance of Search
+            Parameters:
+                self -- the current Search object
+                transposition_table -- the TranspositionTable object to use
+                    or None to create a new one
+                tablebase -- the Tablebase object (see tablebase.py) or None
+                batch_leaves -- True to score the leaves of a node together
+        '''
+        if transposition_table is None:
+            transposition_table = TranspositionTable()
+        self.transposition_table = transposition_table
+        self.ordering = MoveOrdering()
+        self.nodes = 0
+        self.stats = SearchStats()
+        self.deadline = None
+        self.node_limit = None
+        self.tablebase = tablebase
+        self.batch_leaves = batch_leaves
+        self.stop_requested = False
+        self.stop_event = None
+
+    def find_best_move(self, board, color, depth, options=None):
+        '''
+        Method -- find_best_move
+            Finds the best move for a side
+        Parameter:
+            self -- the current Search object
+            board -- the Board object
+            color -- color of the side to move
+            depth -- the search depth in plies, at least 1
+            options -- moves to choose from or None for all moves of the
+                color
+        Returns:
+            The SearchResult object with the statistics
+        '''
+        start_time = self.start_stats()
+        self.deadline = None
+        self.node_limit = None
+        self.ordering.new_search()
+        return self.finish_stats(
+            self.search_root(board, color, depth, options), start_time
+        )
+
+    def iterative_deepening(
+        self,
+        board,
+        color,
+        max_depth,
+        time_limit=None,
+        node_limit=None,
+        options=None,
+    ):
+        '''
+        Method -- iterative_deepening
+            Finds the best move within a time or node budget. Searches with
+            depth 1, 2, 3 and so on until max_depth, a won or lost position
+            is found or the budget is spent. An iteration that runs out of
+            the budget is aborted and its result is dropped. The first
+            iteration is always completed, so a move is always returned,
+            unless a stop is requested (see stop) before it ends.
+        Parameter:
+            self -- the current Search object
+            board -- the Board object
+            color -- color of the side to move
+            max_depth -- the maximal search depth in plies
+            time_limit -- the time budget in seconds or None
+            node_limit -- the budget in visited nodes or None
+            options -- moves to choose from or None for all moves of the
+                color
+        Returns:
+            The SearchResult object of the deepest completed iteration with
+            the statistics of the whole search or None if the search was
+            stopped during the first one
+        '''
+        start_time = self.start_stats()
+        self.ordering.new_search()
+        # The board of the caller is only copied, another thread can use
+        # it during the search.
+        board = board.copy()
+        root_moves = options
+        if root_moves is None:
+            root_moves = self.generate_moves(board, color)
+        result = None
+        for depth in range(1, max(max_depth, 1) + 1):
+            if depth > 1 and time_limit is not None:
+                self.deadline = start_time + time_limit
+            else:
+                self.deadline = None
+            self.node_limit = node_limit if depth > 1 else None
+            try:
+                result = self.search_root(board, color, depth, options)
+            except SearchAborted:
+                break
+            if (
+                len(root_moves) <= 1
+                or abs(result.score) > WIN_THRESHOLD
+                or (
+                    time_limit is not None
+                    and time.perf_counter() - start_time >= time_limit
+                )
+            ):
+                break
+        self.deadline = None
+        self.node_limit = None
+        return self.finish_stats(result, start_time)
+
+    def search_root(self, board, color, depth, options=None):
+        '''
+        Method -- search_root
+            Searches the root position to a fixed depth
+        Parameter:
+            self -- the current Search object
+            board -- the Board object
+            color -- color of the side to move
+            depth -- the search depth in plies, at least 1
+            options -- moves to choose from or None for all moves
+        Returns:
+            The SearchResult object
+        '''
+        depth = max(depth, 1)
+        # The search makes and takes back moves on its own copy, the board
+        # of the caller is never changed.
+        score, principal_variation = self.negamax(
+            board.copy(), color, depth, -INFINITE_SCORE, INFINITE_SCORE, 0,
+            options,
+        )
+        if not principal_variation:
+            return SearchResult(None, score, [], depth)
+        return SearchResult(
+            principal_variation[0], score, principal_variation, depth
+        )
+
+    def start_stats(self):
+        '''
+        Method -- start_stats
+            Starts the statistics of a search
+        Parameter:
+            self -- the current Search object
+        Returns:
+            The start time of the search (time.perf_counter)
+        '''
+        self.nodes = 0
+        self.stats = SearchStats()
+        return time.perf_counter()
+
+    def finish_stats(self, result, start_time):
+        '''
+        Method -- finish_stats
+            Completes the statistics of a search and attaches them to the
+            result
+        Parameter:
+            self -- the current Search object
+            result -- the SearchResult object or None
+            start_time -- the start time of the search (time.perf_counter)
+        Returns:
+            The result
+        '''
+        self.stats.nodes = self.nodes
+        self.stats.time_s = time.perf_counter() - start_time
+        if result is not None:
+            self.stats.depth = result.depth
+            result.stats = self.stats
+        return result
+
+    def generate_moves(self, board, color):
+        '''
+        Method -- generate_moves
+            Generates the moves of a node and measures the time
+        Parameter:
+            self -- the current Search object
+            board -- the Board object
+            color -- color of the side to move
+        Returns:
+            List of Move objects
+        '''
+        start_time = time.perf_counter()
+        moves = board.get_all_moves(color)
+        self.stats.movegen_time_s += time.perf_counter() - start_time
+        return moves
+
+    def evaluate(self, board, color):
+        '''
+        Method -- evaluate
+            Scores a leaf, counts it and measures the time, see evaluate
+        Parameter:
+            self -- the current Search object
+            board -- the Board object
+            color -- color of the side to move
+        Returns:
+            The score from the point of view of the side to move
+        '''
+        start_time = time.perf_counter()
+        score = evaluate(board, color)
+        stats = self.stats
+        stats.leaf_evaluations += 1
+        stats.evaluation_time_s += time.perf_counter() - start_time
+        return score
+
+    def stop(self):
+        '''
+        Method -- stop
+            Asks a running search to stop. It can be called from another
+            thread, the search is aborted within TIME_CHECK_INTERVAL nodes.
+            Searches raise SearchAborted until stop_requested is cleared.
+        Parameter:
+            self -- the current Search object
+        '''
+        self.stop_requested = True
+
+    def check_limits(self):
+        '''
+        Method -- check_limits
+            Counts the visited node and aborts the search when the budget
+            is spent or a stop is requested
+        Parameter:
+            self -- the current Search object
+        '''
+        self.nodes += 1
+        if self.node_limit is not None and self.nodes > self.node_limit:
+            raise SearchAborted()
+        if self.nodes % TIME_CHECK_INTERVAL == 0 and (
+            self.stop_requested
+            or (self.stop_event is not None and self.stop_event.is_set())
+            or (
+                self.deadline is not None
+                and time.perf_counter() > self.deadline
+            )
+        ):
+            raise SearchAborted()
+
+    def evaluate_leaves(self, board, color, moves, ply):
+        '''
+        Method -- evaluate_leaves
+            Scores the positions after all moves at once with the NumPy
+            batch evaluation (see evaluation.py)
+        Parameter:
+            self -- the current Search object
+            board -- the Board object
+            color -- color of the side to move
+            moves -- list of Move objects
+            ply -- distance of the positions after the moves from the root
+        Returns:
+            List of the leaf scores from the point of view of the opponent
+        '''
+        start_time = time.perf_counter()
+        masks = [board.get_state_after(move)[:3] for move in moves]
+        scores = [
+            get_leaf_score(score, ply)
+            for score in evaluate_masks(masks, get_opponent_color(color))
+        ]
+        self.stats.leaf_evaluations += len(moves)
+        self.stats.evaluation_time_s += time.perf_counter() - start_time
+        return scores
+
+    def negamax(self, board, color, depth, alpha, beta, ply, options=None):
+        '''
+        Method -- negamax
+            Searches one node of the game tree
+        Parameter:
+            self -- the current Search object
+            board -- the Board object, moves are made on it and taken back
+                before returning
+            color -- color of the side to move
+            depth -- remaining search depth in plies
+            alpha -- the lower bound of the search window
+            beta -- the upper bound of the search window
+            ply -- distance from the root in plies
+            options -- moves to choose from or None for all moves
+        Returns:
+            Tuple of the score from the point of view of the side to move
+            and the principal variation as a list of moves
+        '''
+        self.check_limits()
+        if self.tablebase is not None and ply > 0:
+            entry = self.tablebase.probe(board, color)
+            if entry is not None:
+                result, distance = entry
+                if result == WIN:
+                    return WIN_SCORE - ply - distance, []
+                if result == LOSS:
+                    return -(WIN_SCORE - ply - distance), []
+                # The evaluation has no neutral score, a draw keeps the
+                # static one but isn't searched further.
+                return self.evaluate(board, color), []
+        if depth <= 0:
+            return get_leaf_score(self.evaluate(board, color), ply), []
+        key = None
+        hash_move = None
+        if options is None:
+            # Constrained nodes are not stored, the hash doesn't know about
+            # the constraint.
+            key = get_position_key(board, color)
+            entry = self.transposition_table.probe(key)
+            self.stats.transposition_probes += 1
+            if entry is not None:
+                self.stats.transposition_hits += 1
+                hash_move = entry.move
+            if entry is not None and entry.depth >= depth:
+                score = score_from_table(entry.score, ply)
+                if (
+                    entry.bound == EXACT
+                    or (entry.bound == LOWER_BOUND and score >= beta)
+                    or (entry.bound == UPPER_BOUND and score <= alpha)
+                ):
+                    if entry.move is None:
+                        return score, []
+                    return score, [entry.move]
+            options = self.generate_moves(board, color)
+        if len(options) == 0:
+            # The side that can't move loses, prefer the quickest win.
+            return -(WIN_SCORE - ply), []
+        original_alpha = alpha
+        best_score = -INFINITE_SCORE
+        best_variation = []
+        options = self.ordering.order_moves(options, ply, hash_move)
+        leaf_scores = None
+        if depth == 1 and self.batch_leaves and self.tablebase is None:
+            leaf_scores = self.evaluate_leaves(board, color, options, ply + 1)
+        for move_number, move in enumerate(options):
+            if leaf_scores is not None:
+                self.check_limits()
+                score, variation = leaf_scores[move_number], []
+            else:
+                undo = board.make_move(move)
+                try:
+                    score, variation = self.negamax(
+                        board, get_opponent_color(color), depth - 1,
+                        -beta, -alpha, ply + 1,
+                    )
+                finally:
+                    board.unmake_move(undo)
+            score = -score
+            if score > best_score:
+                best_score = score
+                best_variation = [move] + variation
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                self.stats.beta_cutoffs += 1
+                self.ordering.record_cutoff(move, ply, depth, move_number)
+                break
+        if key is not None:
+            if best_score <= original_alpha:
+                bound = UPPER_BOUND
+            elif best_score >= beta:
+                bound = LOWER_BOUND
+            else:
+                bound = EXACT
+            self.transposition_table.store(
+                key, depth, score_to_table(best_score, ply), bound,
+                best_variation[0],
+            )
+        return best_score, best_variation
@@ -0,0 +1,103 @@
+'''
+This file contains the statistics of a search.
+Every search fills a SearchStats object: how many nodes and leaves it
+visited, how deep it got, how often the alpha-beta window and the
+transposition table cut the tree, and where the time went. The object is
+returned with the search result, so the cost of every computer move can be
+logged and graphed.
+'''
+
+
+class SearchStats:
+    '''
+        Class -- SearchStats
+            Counters and timers of one search
+        Attributes:
+            nodes -- number of visited nodes
+            leaf_evaluations -- number of positions scored by the
+                evaluation
+            depth -- the depth of the deepest completed iteration in plies
+            beta_cutoffs -- number of nodes where a move failed high
+            transposition_probes -- number of transposition table lookups
+            transposition_hits -- number of lookups that found the position
+            movegen_time_s -- time spent generating moves in seconds
+            evaluation_time_s -- time spent scoring leaves in seconds
+            time_s -- the duration of the whole search in seconds
+        Methods:
+            get_nodes_per_second -- gets the search speed
+            add -- adds the counters of another search
+            to_dict -- converts the statistics to a dictionary
+    '''
+    __slots__ = (
+        "nodes",
+        "leaf_evaluations",
+        "depth",
+        "beta_cutoffs",
+        "transposition_probes",
+        "transposition_hits",
+        "movegen_time_s",
+        "evaluation_time_s",
+        "time_s",
+    )
+
+    def __init__(self):
+        '''
+            Constructor -- creates a new instance of SearchStats with all
+            counters at zero
+            Parameters:
+                self -- the current SearchStats object
+        '''
+        self.nodes = 0
+        self.leaf_evaluations = 0
+        self.depth = 0
+        self.beta_cutoffs = 0
+        self.transposition_probes = 0
+        self.transposition_hits = 0
+        self.movegen_time_s = 0.0
+        self.evaluation_time_s = 0.0
+        self.time_s = 0.0
+
+    def get_nodes_per_second(self):
+        '''
+        Method -- get_nodes_per_second
+            Gets the search speed
+        Parameter:
+            self -- the current SearchStats object
+        Returns:
+            The number of nodes per second, 0 if no time was measured
+        '''
+        if self.time_s <= 0:
+            return 0.0
+        return self.nodes / self.time_s
+
+    def add(self, other):
+        '''
+        Method -- add
+            Adds the counters and timers of another search, e.g. of a
+            worker process. The depth and the duration are not added, they
+            belong to the whole search.
+        Parameter:
+            self -- the current SearchStats object
+            other -- the SearchStats object to add
+        '''
+        self.nodes += other.nodes
+        self.leaf_evaluations += other.leaf_evaluations
+        self.beta_cutoffs += other.beta_cutoffs
+        self.transposition_probes += other.transposition_probes
+        self.transposition_hits += other.transposition_hits
+        self.movegen_time_s += other.movegen_time_s
+        self.evaluation_time_s += other.evaluation_time_s
+
+    def to_dict(self):
+        '''
+        Method -- to_dict
+            Converts the statistics to a dictionary, e.g. to write them as
+            JSON
+        Parameter:
+            self -- the current SearchStats object
+        Returns:
+            Dictionary of the attributes and nodes_per_second
+        '''
+        result = {name: getattr(self, name) for name in self.__slots__}
+        result["nodes_per_second"] = self.get_nodes_per_second()
+        return result
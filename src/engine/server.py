@@ -0,0 +1,350 @@
+'''
+This file contains the engine server: front-ends send positions and get
+the best move without embedding the engine.
+The server speaks JSON over TCP or a Unix socket, one object per line. A
+request has the bitboards of the position (see bitboard.py), the side to
+move and optionally the search settings:
+    {"id": 1, "black": 4095, "red": 4293918720, "king": 0, "color": "R",
+     "max_depth": 30, "time_limit": 1.0, "node_limit": null}
+The response has the move and the principal variation in notation (see
+move.Move.get_notation), the score, the depth and the search statistics,
+or an "error" text. Requests longer than ENGINE_SERVER_MAX_REQUEST bytes
+get an error and the connection is closed. A search takes at most
+ENGINE_SERVER_MAX_TIME_LIMIT_S seconds: a null or longer time limit is
+cut to it. The searches run in a process
+pool, which is started again if a worker process dies. Requests for the
+same position and settings that arrive while it is searched wait for that
+search instead of starting another one.
+Run "python -m engine.server --help" to start it.
+'''
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .bitboard import FULL_MASK
+from .board import Board
+from .constants import (
+    ENGINE_SERVER_HOST,
+    ENGINE_SERVER_MAX_REQUEST,
+    ENGINE_SERVER_MAX_TIME_LIMIT_S,
+    ENGINE_SERVER_PORT,
+    MAX_SEARCH_DEPTH,
+    SEARCH_NODE_LIMIT,
+    SEARCH_TIME_LIMIT_S,
+)
+from .encoding import check_position
+from .search import Search, get_position_key
+from .tablebase import Tablebase
+
+# The Search object of the worker process, created by the first task.
+_worker_search = None
+
+
+def parse_request(request):
+    '''
+        Function -- parse_request
+            Checks a request and reads the position and the settings
+        Parameters:
+            request -- the dictionary decoded from the JSON request
+        Returns:
+            Tuple of the black, red and king masks, the color of the side
+            to move, the maximal depth, the time limit and the node limit.
+            The time limit is at most ENGINE_SERVER_MAX_TIME_LIMIT_S.
+            Raises ValueError if the request is not valid.
+    '''
+    if not isinstance(request, dict):
+        raise ValueError("The request must be an object")
+    masks = []
+    for name in ("black", "red", "king"):
+        mask = request.get(name)
+        if type(mask) is not int or not 0 <= mask <= FULL_MASK:
+            raise ValueError("{} must be a 32 bit mask".format(name))
+        masks.append(mask)
+    black_mask, red_mask, king_mask = masks
+    color = request.get("color")
+    check_position(black_mask, red_mask, king_mask, color)
+    max_depth = request.get("max_depth", MAX_SEARCH_DEPTH)
+    if type(max_depth) is not int or not 1 <= max_depth <= MAX_SEARCH_DEPTH:
+        raise ValueError(
+            "max_depth must be an integer from 1 to {}".format(
+                MAX_SEARCH_DEPTH
+            )
+        )
+    time_limit = request.get("time_limit", SEARCH_TIME_LIMIT_S)
+    if time_limit is None:
+        time_limit = ENGINE_SERVER_MAX_TIME_LIMIT_S
+    # JSON allows NaN and Infinity, which would never end the search.
+    if (
+        type(time_limit) not in (int, float)
+        or not math.isfinite(time_limit)
+        or time_limit <= 0
+    ):
+        raise ValueError("time_limit must be a positive number or null")
+    time_limit = min(time_limit, ENGINE_SERVER_MAX_TIME_LIMIT_S)
+    node_limit = request.get("node_limit", SEARCH_NODE_LIMIT)
+    if node_limit is not None and (
+        type(node_limit) is not int or node_limit < 1
+    ):
+        raise ValueError("node_limit must be a positive integer or null")
+    return (
+        black_mask, red_mask, king_mask, color,
+        max_depth, time_limit, node_limit,
+    )
+
+
+def search_position(
+    black_mask, red_mask, king_mask, color, max_depth, time_limit, node_limit
+):
+    '''
+        Function -- search_position
+            Searches the best move of a position. Runs in a worker process.
+        Parameters:
+            black_mask -- bitboard of squares occupied by black pieces
+            red_mask -- bitboard of squares occupied by red pieces
+            king_mask -- bitboard of squares occupied by king pieces
+            color -- color of the side to move
+            max_depth -- the maximal search depth in plies
+            time_limit -- the time budget in seconds or None
+            node_limit -- the budget in visited nodes or None
+        Returns:
+            Dictionary of the response fields: move, score,
+            principal_variation, depth and stats
+    '''
+    global _worker_search
+    if _worker_search is None:
+        _worker_search = Search(tablebase=Tablebase())
+    board = Board(
+        black_mask=black_mask, red_mask=red_mask, king_mask=king_mask
+    )
+    result = _worker_search.iterative_deepening(
+        board, color, max_depth, time_limit=time_limit, node_limit=node_limit
+    )
+    return {
+        "move": None if result.move is None else result.move.get_notation(),
+        "score": result.score,
+        "principal_variation": [
+            move.get_notation() for move in result.principal_variation
+        ],
+        "depth": result.depth,
+        "stats": result.stats.to_dict(),
+    }
+
+
+class EngineServer:
+    '''
+        Class -- EngineServer
+            Answers search requests from socket clients
+        Attributes:
+            workers -- the number of worker processes, None for one per CPU
+            executor -- the ProcessPoolExecutor object running the searches
+            running -- dictionary of the asyncio futures of the running
+                searches by the position key and the settings
+            searches -- the number of searches started
+            coalesced -- the number of requests answered by a search
+                started for another request
+        Methods:
+            make_executor -- makes the process pool
+            get_best_move -- answers one request
+            handle_connection -- serves one client
+            start -- starts listening
+            shutdown -- stops the worker processes
+    '''
+    def __init__(self, workers=None):
+        '''
+            Constructor -- creates a new instance of EngineServer
+            Parameters:
+                self -- the current EngineServer object
+                workers -- the number of worker processes, None for one per
+                    CPU
+        '''
+        self.workers = workers
+        self.executor = self.make_executor()
+        self.running = {}
+        self.searches = 0
+        self.coalesced = 0
+
+    def make_executor(self):
+        '''
+        Method -- make_executor
+            Makes the process pool. The workers are spawned, not forked:
+            a forked worker would keep the client sockets open after the
+            server has closed them.
+        Parameter:
+            self -- the current EngineServer object
+        Returns:
+            The ProcessPoolExecutor object
+        '''
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    async def get_best_move(self, request):
+        '''
+        Method -- get_best_move
+            Answers one request. If the same position is already searched
+            with the same settings, waits for that search. If the process
+            pool is broken, a new one is started for the next requests.
+        Parameter:
+            self -- the current EngineServer object
+            request -- the dictionary decoded from the JSON request
+        Returns:
+            Dictionary of the response fields
+        '''
+        arguments = parse_request(request)
+        black_mask, red_mask, king_mask, color = arguments[:4]
+        board = Board(
+            black_mask=black_mask, red_mask=red_mask, king_mask=king_mask
+        )
+        # The masks are part of the key, so a hash collision can't give the
+        # move of another position.
+        key = (get_position_key(board, color),) + arguments
+        future = self.running.get(key)
+        coalesced = future is not None
+        executor = self.executor
+        try:
+            if coalesced:
+                self.coalesced += 1
+            else:
+                self.searches += 1
+                future = asyncio.get_running_loop().run_in_executor(
+                    executor, search_position, *arguments
+                )
+                self.running[key] = future
+                future.add_done_callback(
+                    lambda future: self.running.pop(key, None)
+                )
+            # A client that goes away must not cancel the search of the
+            # others.
+            response = dict(await asyncio.shield(future))
+        except BrokenProcessPool:
+            # The requests that shared the search see the same error, the
+            # pool is replaced once.
+            if self.executor is executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = self.make_executor()
+            raise
+        response["coalesced"] = coalesced
+        return response
+
+    async def handle_connection(self, reader, writer):
+        '''
+        Method -- handle_connection
+            Serves one client: reads requests line by line and writes a
+            response line for each of them. Every request gets a response,
+            an error if it can't be answered.
+        Parameter:
+            self -- the current EngineServer object
+            reader -- the asyncio.StreamReader object
+            writer -- the asyncio.StreamWriter object
+        '''
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    # The end of the long line can't be found reliably, so
+                    # the connection is closed after the error.
+                    writer.write(json.dumps({
+                        "error": "The request is longer than {} bytes".format(
+                            ENGINE_SERVER_MAX_REQUEST
+                        ),
+                        "id": None,
+                    }).encode() + b"\n")
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                request_id = None
+                try:
+                    request = json.loads(line)
+                    if isinstance(request, dict):
+                        request_id = request.get("id")
+                    response = await self.get_best_move(request)
+                except ValueError as error:
+                    response = {"error": str(error)}
+                except Exception as error:
+                    response = {
+                        "error": "The search failed: {!r}".format(error)
+                    }
+                response["id"] = request_id
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host=ENGINE_SERVER_HOST, port=ENGINE_SERVER_PORT,
+                    path=None):
+        '''
+        Method -- start
+            Starts listening on a TCP port or a Unix socket
+        Parameter:
+            self -- the current EngineServer object
+            host -- the TCP host
+            port -- the TCP port, 0 for any free port
+            path -- the path of the Unix socket or None to use TCP
+        Returns:
+            The asyncio.Server object
+        '''
+        if path is not None:
+            return await asyncio.start_unix_server(
+                self.handle_connection, path, limit=ENGINE_SERVER_MAX_REQUEST
+            )
+        return await asyncio.start_server(
+            self.handle_connection, host, port,
+            limit=ENGINE_SERVER_MAX_REQUEST,
+        )
+
+    def shutdown(self):
+        '''
+        Method -- shutdown
+            Stops the worker processes
+        Parameter:
+            self -- the current EngineServer object
+        '''
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+async def serve(arguments):
+    '''
+        Function -- serve
+            Runs the server until it is interrupted
+        Parameters:
+            arguments -- the parsed command line arguments
+    '''
+    engine_server = EngineServer(arguments.workers)
+    try:
+        server = await engine_server.start(
+            arguments.host, arguments.port, arguments.unix
+        )
+        async with server:
+            for sock in server.sockets:
+                print("Listening on {}".format(sock.getsockname()))
+            await server.serve_forever()
+    finally:
+        engine_server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serves engine moves as JSON over a socket."
+    )
+    parser.add_argument("--host", default=ENGINE_SERVER_HOST)
+    parser.add_argument("--port", type=int, default=ENGINE_SERVER_PORT)
+    parser.add_argument("--unix", default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,534 @@
+'''
+This file contains game sessions and the manager that serves many of them.
+A GameSession is the state of one human versus computer game without any
+drawing: the board, the side to move, the lock of a multistep capturing
+move that is made step by step, and the history of moves.
+The SessionManager keeps many sessions in one process. Computer moves are
+searched by a bounded pool of worker processes. Every session waits for at
+most one computer move, and waiting sessions are served in the order they
+asked, so a busy session can't starve the others. The manager also reports
+how much memory every session takes.
+'''
+
+import itertools
+import os
+import sys
+import threading
+from collections import deque
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+
+from .board import Board, make_initial_pieces
+from .constants import (
+    MAX_SEARCH_DEPTH,
+    MAX_SESSIONS,
+    PLAYER_COLOR_BLACK,
+    SEARCH_NODE_LIMIT,
+    SEARCH_TIME_LIMIT_S,
+    SESSION_WORKERS,
+)
+from .search import Search, get_opponent_color
+from .tablebase import Tablebase
+
+# The Search object of the worker process, created by the first task. It
+# is shared by all sessions, positions of one game help the others.
+_worker_search = None
+
+
+def get_move_memory_usage(move):
+    '''
+        Function -- get_move_memory_usage
+            Estimates the memory taken by a move. The pieces are shared
+            objects (see piece.get_piece) and are not counted.
+        Parameters:
+            move -- the Move object
+        Returns:
+            The size in bytes
+    '''
+    return (
+        sys.getsizeof(move)
+        + sys.getsizeof(move.path)
+        + sys.getsizeof(move.captured)
+    )
+
+
+def search_session_position(board, color, max_depth, time_limit, node_limit):
+    '''
+        Function -- search_session_position
+            Searches the computer move of a session. Runs in a worker
+            process.
+        Parameters:
+            board -- the Board object
+            color -- color of the side to move
+            max_depth -- the maximal search depth in plies
+            time_limit -- the time budget in seconds or None
+            node_limit -- the budget in visited nodes or None
+        Returns:
+            The SearchResult object
+    '''
+    global _worker_search
+    if _worker_search is None:
+        _worker_search = Search(tablebase=Tablebase())
+    return _worker_search.iterative_deepening(
+        board, color, max_depth, time_limit=time_limit, node_limit=node_limit
+    )
+
+
+class GameSession:
+    '''
+        Class -- GameSession
+            Represents the state of one game, without drawing
+        Attributes:
+            session_id -- the identifier of the session
+            board -- the Board object
+            color -- color of the side to move
+            player_color -- color of the human player
+            history -- list of the complete Move objects made in the game
+            pending_moves -- the complete moves of the side to move that
+                are still possible after the steps made, empty if no step
+                is made
+            steps_made -- the number of steps of a multistep capturing move
+                that are already made
+            last_result -- the SearchResult object of the last computer
+                move or None
+            last_error -- the exception raised by the last search of a
+                computer move or None if it succeeded
+            is_waiting -- True while a computer move is queued or searched
+        Methods:
+            get_moves -- gets the complete moves of the side to move
+            get_next_steps -- gets the next single steps of the moves
+            is_locked -- checks if a multistep move is half made
+            play_step -- makes one step of a move of the side to move
+            play_move -- makes a complete move of the side to move
+            finish_move -- records a complete move and passes the turn
+            get_winner -- checks if the game is over
+            get_memory_usage -- estimates the memory taken by the session
+    '''
+    def __init__(
+        self,
+        session_id=None,
+        board=None,
+        color=PLAYER_COLOR_BLACK,
+        player_color=PLAYER_COLOR_BLACK,
+    ):
+        '''
+            Constructor -- creates a new instance of GameSession
+            Parameters:
+                self -- the current GameSession object
+                session_id -- the identifier of the session
+                board -- the Board object or None for the initial position
+                color -- color of the side to move
+                player_color -- color of the human player
+        '''
+        if board is None:
+            board = Board(make_initial_pieces())
+        self.session_id = session_id
+        self.board = board
+        self.color = color
+        self.player_color = player_color
+        self.history = []
+        self.pending_moves = []
+        self.steps_made = 0
+        self.last_result = None
+        self.last_error = None
+        self.is_waiting = False
+
+    def get_moves(self):
+        '''
+        Method -- get_moves
+            Gets the complete moves of the side to move. After a step of a
+            multistep move only the moves that go on from there are left.
+        Parameter:
+            self -- the current GameSession object
+        Returns:
+            List of Move objects
+        '''
+        if self.steps_made > 0:
+            return self.pending_moves
+        return self.board.get_all_moves(self.color)
+
+    def get_next_steps(self, board_x=None, board_y=None):
+        '''
+        Method -- get_next_steps
+            Gets the next single steps of the moves of the side to move
+        Parameter:
+            self -- the current GameSession object
+            board_x -- x-coordinate of the piece in board format or None for
+                all pieces
+            board_y -- y-coordinate of the piece in board format or None for
+                all pieces
+        Returns:
+            List of distinct single step Move objects
+        '''
+        result = []
+        for move in self.get_moves():
+            steps = move.get_steps()
+            if len(steps) <= self.steps_made:
+                continue
+            step = steps[self.steps_made]
+            if board_x is not None and (
+                step.from_piece.board_x != board_x
+                or step.from_piece.board_y != board_y
+            ):
+                continue
+            if step not in result:
+                result.append(step)
+        return result
+
+    def is_locked(self):
+        '''
+        Method -- is_locked
+            Checks if a multistep capturing move is half made, then only
+            the moving piece can go on
+        Parameter:
+            self -- the current GameSession object
+        Returns:
+            True if steps are made and the move isn't complete. Otherwise,
+            False.
+        '''
+        return self.steps_made > 0
+
+    def play_step(self, step):
+        '''
+        Method -- play_step
+            Makes one step of a move of the side to move. When the last
+            step of a move is made, the move goes to the history and the
+            other side is to move.
+        Parameter:
+            self -- the current GameSession object
+            step -- the single step Move object, one of get_next_steps
+        Returns:
+            True if the move is complete. Otherwise, False.
+        '''
+        if step not in self.get_next_steps():
+            raise ValueError(
+                "Step {} is not allowed".format(step.get_notation())
+            )
+        steps_made = self.steps_made
+        self.pending_moves = [
+            move for move in self.get_moves()
+            if len(move.get_steps()) > steps_made
+            and move.get_steps()[steps_made] == step
+        ]
+        self.board = self.board.apply_move(step)
+        self.steps_made = steps_made + 1
+        if self.get_next_steps():
+            return False
+        self.finish_move(self.pending_moves[0])
+        return True
+
+    def play_move(self, move):
+        '''
+        Method -- play_move
+            Makes a complete move of the side to move
+        Parameter:
+            self -- the current GameSession object
+            move -- the Move object, one of get_moves
+        '''
+        if self.is_locked() or move not in self.get_moves():
+            raise ValueError(
+                "Move {} is not allowed".format(move.get_notation())
+            )
+        self.board = self.board.apply_move(move)
+        self.finish_move(move)
+
+    def finish_move(self, move):
+        '''
+        Method -- finish_move
+            Records a complete move and passes the turn
+        Parameter:
+            self -- the current GameSession object
+            move -- the complete Move object
+        '''
+        self.history.append(move)
+        self.pending_moves = []
+        self.steps_made = 0
+        self.color = get_opponent_color(self.color)
+
+    def get_winner(self):
+        '''
+        Method -- get_winner
+            Checks if the game is over. The side that can't move loses.
+        Parameter:
+            self -- the current GameSession object
+        Returns:
+            Color of the winner or None if the game goes on
+        '''
+        if self.get_moves():
+            return None
+        return get_opponent_color(self.color)
+
+    def get_memory_usage(self):
+        '''
+        Method -- get_memory_usage
+            Estimates the memory taken by the session: the session and
+            board objects, the pieces dictionary if the board has built
+            it, the history and the pending moves
+        Parameter:
+            self -- the current GameSession object
+        Returns:
+            The size in bytes
+        '''
+        size = sys.getsizeof(self) + sys.getsizeof(self.__dict__)
+        size += sys.getsizeof(self.board) + sys.getsizeof(self.board.stats)
+        if self.board._pieces is not None:
+            size += sys.getsizeof(self.board._pieces)
+        for moves in (self.history, self.pending_moves):
+            size += sys.getsizeof(moves)
+            size += sum(get_move_memory_usage(move) for move in moves)
+        return size
+
+
+class SessionManager:
+    '''
+        Class -- SessionManager
+            Serves many game sessions in one process. Computer moves are
+            searched by a pool of worker processes, at most one search per
+            worker at a time, the waiting sessions in a first come first
+            served queue.
+        Attributes:
+            sessions -- dictionary of GameSession objects by identifier
+            max_sessions -- the maximal number of open sessions
+            workers -- the number of worker processes
+            executor -- the ProcessPoolExecutor object
+            queue -- the deque of identifiers of sessions waiting for a
+                worker
+            running -- the number of searches running in the workers
+            max_depth -- the maximal search depth in plies
+            time_limit -- the time budget of a computer move in seconds
+                or None
+            node_limit -- the budget of a computer move in visited nodes or
+                None
+            on_move -- function called with the session, the SearchResult
+                object and the exception after a computer move is searched,
+                or None. The result is None if the search failed, the
+                exception is None if it succeeded. It is called on a thread
+                of the executor.
+            condition -- the threading.Condition object guarding the queue
+                and the sessions
+            session_ids -- the iterator of new identifiers
+        Methods:
+            create_session -- opens a new session
+            get_session -- gets an open session
+            close_session -- closes a session
+            request_computer_move -- queues the computer move of a session
+            dispatch -- starts queued searches while workers are free
+            finish_computer_move -- makes a searched move
+            wait_idle -- waits until no search is queued or running
+            get_memory_usage -- estimates the memory taken by the sessions
+            shutdown -- stops the worker processes
+    '''
+    def __init__(
+        self,
+        workers=SESSION_WORKERS,
+        max_sessions=MAX_SESSIONS,
+        max_depth=MAX_SEARCH_DEPTH,
+        time_limit=SEARCH_TIME_LIMIT_S,
+        node_limit=SEARCH_NODE_LIMIT,
+        on_move=None,
+    ):
+        '''
+            Constructor -- creates a new instance of SessionManager
+            Parameters:
+                self -- the current SessionManager object
+                workers -- the number of worker processes, None for one per
+                    CPU
+                max_sessions -- the maximal number of open sessions
+                max_depth -- the maximal search depth in plies
+                time_limit -- the time budget of a computer move in seconds
+                    or None
+                node_limit -- the budget of a computer move in visited nodes
+                    or None
+                on_move -- function called with the session, the
+                    SearchResult object and the exception after a computer
+                    move is searched, or None
+        '''
+        self.sessions = {}
+        self.max_sessions = max_sessions
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.queue = deque()
+        self.running = 0
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.on_move = on_move
+        self.condition = threading.Condition()
+        self.session_ids = itertools.count(1)
+
+    def create_session(self, board=None, color=PLAYER_COLOR_BLACK):
+        '''
+        Method -- create_session
+            Opens a new session, the human plays black
+        Parameter:
+            self -- the current SessionManager object
+            board -- the Board object or None for the initial position
+            color -- color of the side to move
+        Returns:
+            The GameSession object. Raises ValueError if max_sessions
+            sessions are open.
+        '''
+        with self.condition:
+            if len(self.sessions) >= self.max_sessions:
+                raise ValueError(
+                    "Only {} sessions can be open".format(self.max_sessions)
+                )
+            session = GameSession(next(self.session_ids), board, color)
+            self.sessions[session.session_id] = session
+            return session
+
+    def get_session(self, session_id):
+        '''
+        Method -- get_session
+            Gets an open session
+        Parameter:
+            self -- the current SessionManager object
+            session_id -- the identifier of the session
+        Returns:
+            The GameSession object or None if there is no such session
+        '''
+        with self.condition:
+            return self.sessions.get(session_id)
+
+    def close_session(self, session_id):
+        '''
+        Method -- close_session
+            Closes a session. A queued computer move is dropped, a running
+            search ends but its move is not made.
+        Parameter:
+            self -- the current SessionManager object
+            session_id -- the identifier of the session
+        '''
+        with self.condition:
+            session = self.sessions.pop(session_id, None)
+            if session is not None and session_id in self.queue:
+                self.queue.remove(session_id)
+                session.is_waiting = False
+                self.condition.notify_all()
+
+    def request_computer_move(self, session_id):
+        '''
+        Method -- request_computer_move
+            Queues the computer move of a session. The search starts when
+            a worker is free, after the sessions that asked earlier.
+        Parameter:
+            self -- the current SessionManager object
+            session_id -- the identifier of the session
+        '''
+        with self.condition:
+            session = self.sessions[session_id]
+            if session.is_waiting:
+                raise ValueError(
+                    "Session {} is already waiting".format(session_id)
+                )
+            if session.color == session.player_color or session.is_locked():
+                raise ValueError(
+                    "It isn't the computer's turn in session {}".format(
+                        session_id
+                    )
+                )
+            session.is_waiting = True
+            self.queue.append(session_id)
+            self.dispatch()
+
+    def dispatch(self):
+        '''
+        Method -- dispatch
+            Starts queued searches while workers are free. The caller holds
+            the condition.
+        Parameter:
+            self -- the current SessionManager object
+        '''
+        while self.queue and self.running < self.workers:
+            session = self.sessions[self.queue.popleft()]
+            self.running += 1
+            future = self.executor.submit(
+                search_session_position,
+                session.board,
+                session.color,
+                self.max_depth,
+                self.time_limit,
+                self.node_limit,
+            )
+            future.add_done_callback(
+                lambda future, session=session: self.finish_computer_move(
+                    session, future
+                )
+            )
+
+    def finish_computer_move(self, session, future):
+        '''
+        Method -- finish_computer_move
+            Makes a searched move in its session, unless the session was
+            closed, and starts the next queued search. If the search
+            failed, the exception is stored in the session and no move is
+            made, the computer move can be requested again.
+        Parameter:
+            self -- the current SessionManager object
+            session -- the GameSession object
+            future -- the Future object of search_session_position
+        '''
+        if future.cancelled():
+            error = CancelledError("The search was canceled")
+        else:
+            error = future.exception()
+        result = None
+        with self.condition:
+            session.is_waiting = False
+            is_open = self.sessions.get(session.session_id) is session
+            if is_open:
+                session.last_error = error
+                if error is None:
+                    result = future.result()
+                    session.last_result = result
+                    if result.move is not None:
+                        session.play_move(result.move)
+        # The search counts as running until on_move returns, so
+        # wait_idle also waits for the callbacks.
+        try:
+            if is_open and self.on_move is not None:
+                self.on_move(session, result, error)
+        finally:
+            with self.condition:
+                self.running -= 1
+                self.dispatch()
+                self.condition.notify_all()
+
+    def wait_idle(self, timeout=None):
+        '''
+        Method -- wait_idle
+            Waits until no computer move is queued or searched and the
+            on_move calls of the searched moves have returned
+        Parameter:
+            self -- the current SessionManager object
+            timeout -- the maximal waiting time in seconds or None
+        Returns:
+            True if the manager is idle. Otherwise, False.
+        '''
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: not self.queue and self.running == 0, timeout
+            )
+
+    def get_memory_usage(self):
+        '''
+        Method -- get_memory_usage
+            Estimates the memory taken by every session
+        Parameter:
+            self -- the current SessionManager object
+        Returns:
+            Dictionary of sizes in bytes by session identifier
+        '''
+        with self.condition:
+            return {
+                session_id: session.get_memory_usage()
+                for session_id, session in self.sessions.items()
+            }
+
+    def shutdown(self):
+        '''
+        Method -- shutdown
+            Stops the worker processes
+        Parameter:
+            self -- the current SessionManager object
+        '''
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,493 @@
+'''
+This file contains the endgame tablebase.
+For every material signature (number of black men, black kings, red men
+and red kings) the generator solves all positions by retrograde analysis
+and writes one binary file. Every entry takes two bytes: the result for
+the side to move (win, loss or draw) and the distance to the end of the
+game in plies. The search reads the files through mmap, so a table is
+never loaded into memory as a whole.
+Run "python -m engine.tablebase --help" to generate the files.
+'''
+
+import argparse
+import mmap
+import os
+import time
+from itertools import combinations
+from math import comb
+
+from .bitboard import (
+    BLACK_KING_ROW_MASK,
+    NUM_PLAYABLE_SQUARES,
+    RED_KING_ROW_MASK,
+)
+from .constants import (
+    PLAYER_COLOR_BLACK,
+    PLAYER_COLOR_RED,
+    TABLEBASE_DIRECTORY,
+    TABLEBASE_MAX_PIECES,
+)
+
+# The result stored in an entry, for the side to move. Entries of
+# impossible positions (pieces on the same square, men on their king row)
+# stay UNKNOWN.
+UNKNOWN = 0
+WIN = 1
+LOSS = 2
+DRAW = 3
+# An entry is a little-endian 16-bit number: the result in the two high
+# bits and the distance in plies in the others.
+ENTRY_SIZE = 2
+RESULT_SHIFT = 14
+DISTANCE_MASK = (1 << RESULT_SHIFT) - 1
+TABLE_EXTENSION = ".tb"
+
+
+def get_signature(black_mask, red_mask, king_mask):
+    '''
+        Function -- get_signature
+            Gets the material signature of a position
+        Parameters:
+            black_mask -- bitboard of black pieces
+            red_mask -- bitboard of red pieces
+            king_mask -- bitboard of kings
+        Returns:
+            Tuple of the numbers of black men, black kings, red men and red
+            kings
+    '''
+    return (
+        (black_mask & ~king_mask).bit_count(),
+        (black_mask & king_mask).bit_count(),
+        (red_mask & ~king_mask).bit_count(),
+        (red_mask & king_mask).bit_count(),
+    )
+
+
+def get_table_size(signature):
+    '''
+        Function -- get_table_size
+            Gets the number of entries in the table of a signature. Every
+            group of pieces is placed on any of the 32 squares, for both
+            sides to move.
+        Parameters:
+            signature -- the material signature, see get_signature
+        Returns:
+            The number of entries
+    '''
+    size = 2
+    for count in signature:
+        size *= comb(NUM_PLAYABLE_SQUARES, count)
+    return size
+
+
+def get_table_name(signature):
+    '''
+        Function -- get_table_name
+            Gets the file name of the table of a signature
+        Parameters:
+            signature -- the material signature, see get_signature
+        Returns:
+            The file name, for example "1011.tb"
+    '''
+    return "".join(str(count) for count in signature) + TABLE_EXTENSION
+
+
+def get_subset_rank(mask):
+    '''
+        Function -- get_subset_rank
+            Gets the number of a set of squares among all sets of the same
+            size (the combinatorial number system)
+        Parameters:
+            mask -- the bitboard of the set
+        Returns:
+            The rank, from 0 to comb(32, size) - 1
+    '''
+    rank = 0
+    count = 0
+    while mask:
+        bit = mask & -mask
+        count += 1
+        rank += comb(bit.bit_length() - 1, count)
+        mask ^= bit
+    return rank
+
+
+def get_position_index(black_mask, red_mask, king_mask, color):
+    '''
+        Function -- get_position_index
+            Gets the index of a position in the table of its signature
+        Parameters:
+            black_mask -- bitboard of black pieces
+            red_mask -- bitboard of red pieces
+            king_mask -- bitboard of kings
+            color -- color of the side to move
+        Returns:
+            The index of the entry
+    '''
+    index = 0
+    for mask in (
+        black_mask & ~king_mask,
+        black_mask & king_mask,
+        red_mask & ~king_mask,
+        red_mask & king_mask,
+    ):
+        index = (
+            index * comb(NUM_PLAYABLE_SQUARES, mask.bit_count())
+            + get_subset_rank(mask)
+        )
+    return index * 2 + (1 if color == PLAYER_COLOR_RED else 0)
+
+
+def read_entry(table, index):
+    '''
+        Function -- read_entry
+            Reads one entry of a table
+        Parameters:
+            table -- the table as a bytearray or mmap object
+            index -- the index of the entry
+        Returns:
+            Tuple of the result and the distance in plies
+    '''
+    offset = index * ENTRY_SIZE
+    value = int.from_bytes(table[offset:offset + ENTRY_SIZE], "little")
+    return value >> RESULT_SHIFT, value & DISTANCE_MASK
+
+
+def write_entry(table, index, result, distance):
+    '''
+        Function -- write_entry
+            Writes one entry of a table
+        Parameters:
+            table -- the table as a bytearray
+            index -- the index of the entry
+            result -- WIN, LOSS or DRAW
+            distance -- the distance to the end of the game in plies
+    '''
+    offset = index * ENTRY_SIZE
+    table[offset:offset + ENTRY_SIZE] = (
+        (result << RESULT_SHIFT) | min(distance, DISTANCE_MASK)
+    ).to_bytes(ENTRY_SIZE, "little")
+
+
+def get_signatures(max_pieces):
+    '''
+        Function -- get_signatures
+            Lists the signatures with both colors on the board and at most
+            max_pieces pieces. Every signature comes after the signatures
+            its positions can reach by a capture or a promotion.
+        Parameters:
+            max_pieces -- the maximal number of pieces
+        Returns:
+            List of signatures
+    '''
+    result = []
+    for total in range(2, max_pieces + 1):
+        for men in range(total + 1):
+            for black in range(1, total):
+                for black_men in range(min(black, men) + 1):
+                    red_men = men - black_men
+                    if red_men <= total - black:
+                        result.append((
+                            black_men,
+                            black - black_men,
+                            red_men,
+                            total - black - red_men,
+                        ))
+    return result
+
+
+def iterate_positions(signature):
+    '''
+        Function -- iterate_positions
+            Generates all possible placements of a signature
+        Parameters:
+            signature -- the material signature, see get_signature
+        Returns:
+            Generator of (black_mask, red_mask, king_mask) tuples
+    '''
+    black_men, black_kings, red_men, red_kings = signature
+
+    def iterate_masks(count, taken, forbidden):
+        for squares in combinations(range(NUM_PLAYABLE_SQUARES), count):
+            mask = 0
+            for square in squares:
+                mask |= 1 << square
+            if mask & (taken | forbidden) == 0:
+                yield mask
+
+    for black_man_mask in iterate_masks(black_men, 0, BLACK_KING_ROW_MASK):
+        for black_king_mask in iterate_masks(black_kings, black_man_mask, 0):
+            black_mask = black_man_mask | black_king_mask
+            for red_man_mask in iterate_masks(
+                red_men, black_mask, RED_KING_ROW_MASK
+            ):
+                for red_king_mask in iterate_masks(
+                    red_kings, black_mask | red_man_mask, 0
+                ):
+                    yield (
+                        black_mask,
+                        red_man_mask | red_king_mask,
+                        black_king_mask | red_king_mask,
+                    )
+
+
+def generate_table(signature, tables):
+    '''
+        Function -- generate_table
+            Solves all positions of a signature by retrograde analysis.
+            Positions without moves are lost. Then, in the order of the
+            distance, every solved position updates the positions that
+            lead to it: a lost position makes them won, and a position
+            becomes lost when all its moves lead to won positions.
+            Positions that are never solved are draws.
+        Parameters:
+            signature -- the material signature, see get_signature
+            tables -- dictionary of the tables of all signatures reachable
+                by captures and promotions, see get_signatures
+        Returns:
+            The table as a bytearray
+    '''
+    # Imported here, board.py imports the search that imports this file.
+    from .board import Board
+
+    size = get_table_size(signature)
+    table = bytearray(size * ENTRY_SIZE)
+    positions = []
+    predecessors = {}
+    remaining_moves = {}
+    longest_win = {}
+    # buckets[distance] lists (index, result) of positions solved at that
+    # distance.
+    buckets = [[]]
+
+    def add_to_bucket(distance, index, result):
+        while len(buckets) <= distance:
+            buckets.append([])
+        buckets[distance].append((index, result))
+
+    for black_mask, red_mask, king_mask in iterate_positions(signature):
+        board = Board(
+            black_mask=black_mask, red_mask=red_mask, king_mask=king_mask
+        )
+        for color in (PLAYER_COLOR_BLACK, PLAYER_COLOR_RED):
+            index = get_position_index(black_mask, red_mask, king_mask, color)
+            positions.append(index)
+            opponent = PLAYER_COLOR_RED
+            if color == PLAYER_COLOR_RED:
+                opponent = PLAYER_COLOR_BLACK
+            moves = board.get_all_moves(color)
+            remaining = len(moves)
+            shortest_loss = None
+            longest = 0
+            for move in moves:
+                next_board = board.apply_move(move)
+                next_signature = get_signature(
+                    next_board.black_mask,
+                    next_board.red_mask,
+                    next_board.king_mask,
+                )
+                next_index = get_position_index(
+                    next_board.black_mask,
+                    next_board.red_mask,
+                    next_board.king_mask,
+                    opponent,
+                )
+                if next_signature == signature:
+                    predecessors.setdefault(next_index, []).append(index)
+                    continue
+                if 0 in (
+                    next_signature[0] + next_signature[1],
+                    next_signature[2] + next_signature[3],
+                ):
+                    # The last piece of the opponent was captured.
+                    result, distance = LOSS, 0
+                else:
+                    result, distance = read_entry(
+                        tables[next_signature], next_index
+                    )
+                if result == LOSS:
+                    if shortest_loss is None or distance < shortest_loss:
+                        shortest_loss = distance
+                elif result == WIN:
+                    remaining -= 1
+                    longest = max(longest, distance)
+            if shortest_loss is not None:
+                add_to_bucket(shortest_loss + 1, index, WIN)
+            if remaining == 0:
+                # No moves at all, or every move leads to a lost game.
+                add_to_bucket(longest + 1 if moves else 0, index, LOSS)
+            remaining_moves[index] = remaining
+            longest_win[index] = longest
+    solved = set()
+    distance = 0
+    while distance < len(buckets):
+        for index, result in buckets[distance]:
+            if index in solved:
+                continue
+            solved.add(index)
+            write_entry(table, index, result, distance)
+            for previous in predecessors.get(index, []):
+                if previous in solved:
+                    continue
+                if result == LOSS:
+                    add_to_bucket(distance + 1, previous, WIN)
+                else:
+                    remaining_moves[previous] -= 1
+                    longest_win[previous] = max(
+                        longest_win[previous], distance
+                    )
+                    if remaining_moves[previous] == 0:
+                        add_to_bucket(
+                            longest_win[previous] + 1, previous, LOSS
+                        )
+        distance += 1
+    for index in positions:
+        if index not in solved:
+            write_entry(table, index, DRAW, 0)
+    return table
+
+
+def generate_tablebases(max_pieces, directory):
+    '''
+        Function -- generate_tablebases
+            Generates and writes the tables of all signatures with at most
+            max_pieces pieces
+        Parameters:
+            max_pieces -- the maximal number of pieces
+            directory -- the directory for the table files
+        Returns:
+            Dictionary of the tables by signature
+    '''
+    os.makedirs(directory, exist_ok=True)
+    tables = {}
+    for signature in get_signatures(max_pieces):
+        tables[signature] = generate_table(signature, tables)
+        path = os.path.join(directory, get_table_name(signature))
+        with open(path, "wb") as file:
+            file.write(tables[signature])
+    return tables
+
+
+class Tablebase:
+    '''
+        Class -- Tablebase
+            Reads the tablebase files through mmap. A file is opened the
+            first time a position of its signature is probed.
+        Attributes:
+            directory -- the directory of the table files
+            max_pieces -- positions with more pieces are not probed
+            tables -- the mmap objects by signature, None if there is no
+                file for the signature
+            hits -- number of probes that found the position
+        Methods:
+            get_table -- opens the table of a signature
+            probe -- looks up a position
+            close -- closes all opened files
+    '''
+    def __init__(
+        self, directory=TABLEBASE_DIRECTORY, max_pieces=TABLEBASE_MAX_PIECES
+    ):
+        '''
+            Constructor -- creates a new instance of Tablebase
+            Parameters:
+                self -- the current Tablebase object
+                directory -- the directory of the table files
+                max_pieces -- positions with more pieces are not probed
+        '''
+        self.directory = directory
+        self.max_pieces = max_pieces
+        self.tables = {}
+        self.hits = 0
+
+    def get_table(self, signature):
+        '''
+        Method -- get_table
+            Opens the table of a signature
+        Parameter:
+            self -- the current Tablebase object
+            signature -- the material signature, see get_signature
+        Returns:
+            The mmap object or None if there is no such table
+        '''
+        if signature not in self.tables:
+            table = None
+            path = os.path.join(self.directory, get_table_name(signature))
+            if os.path.exists(path):
+                with open(path, "rb") as file:
+                    table = mmap.mmap(
+                        file.fileno(), 0, access=mmap.ACCESS_READ
+                    )
+                if len(table) != get_table_size(signature) * ENTRY_SIZE:
+                    table.close()
+                    table = None
+            self.tables[signature] = table
+        return self.tables[signature]
+
+    def probe(self, board, color):
+        '''
+        Method -- probe
+            Looks up a position
+        Parameter:
+            self -- the current Tablebase object
+            board -- the Board object
+            color -- color of the side to move
+        Returns:
+            Tuple of the result (WIN, LOSS or DRAW) for the side to move
+            and the distance in plies, or None if the position is not in
+            the tablebase
+        '''
+        if (
+            (board.black_mask | board.red_mask).bit_count() > self.max_pieces
+            or board.black_mask == 0
+            or board.red_mask == 0
+        ):
+            return None
+        table = self.get_table(get_signature(
+            board.black_mask, board.red_mask, board.king_mask
+        ))
+        if table is None:
+            return None
+        result, distance = read_entry(table, get_position_index(
+            board.black_mask, board.red_mask, board.king_mask, color
+        ))
+        if result == UNKNOWN:
+            return None
+        self.hits += 1
+        return result, distance
+
+    def close(self):
+        '''
+        Method -- close
+            Closes all opened files
+        Parameter:
+            self -- the current Tablebase object
+        '''
+        for table in self.tables.values():
+            if table is not None:
+                table.close()
+        self.tables = {}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generates the endgame tablebase files."
+    )
+    parser.add_argument(
+        "--pieces",
+        type=int,
+        default=TABLEBASE_MAX_PIECES,
+        help="the maximal number of pieces",
+    )
+    parser.add_argument("--directory", default=TABLEBASE_DIRECTORY)
+    arguments = parser.parse_args()
+    start_time = time.perf_counter()
+    tables = generate_tablebases(arguments.pieces, arguments.directory)
+    print("Tables: {}".format(len(tables)))
+    print("Entries: {}".format(
+        sum(len(table) // ENTRY_SIZE for table in tables.values())
+    ))
+    print("Time: {:.1f} s".format(time.perf_counter() - start_time))
+
+
+if __name__ == "__main__":
+    main()
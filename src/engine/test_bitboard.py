@@ -0,0 +1,116 @@
+'''
+This file contains tests for bitboard.py.
+'''
+
+from engine.bitboard import (
+    BLACK_KING_ROW_MASK,
+    KING_STEPS,
+    RED_KING_ROW_MASK,
+    RED_STEPS,
+    SQUARE_STEPS,
+    SQUARE_X,
+    SQUARE_Y,
+    STEP_TABLES,
+    iterate_squares,
+    make_square_steps,
+    shift_mask,
+    square_index,
+)
+from engine.constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED
+from engine.piece import Piece
+
+
+def test_square_index():
+    assert(square_index(1, 0) == 0)
+    assert(square_index(7, 0) == 3)
+    assert(square_index(0, 1) == 4)
+    assert(square_index(6, 7) == 31)
+    assert(square_index(0, 0) is None)
+    assert(square_index(8, 1) is None)
+    assert(square_index(-1, 2) is None)
+    for index in range(32):
+        assert(square_index(SQUARE_X[index], SQUARE_Y[index]) == index)
+
+
+def test_shift_mask():
+    # (1, 0) -> (2, 1) and (0, 1)
+    assert(shift_mask(1 << 0, (1, 1)) == 1 << square_index(2, 1))
+    assert(shift_mask(1 << 0, (-1, 1)) == 1 << square_index(0, 1))
+    # Steps leaving the board are dropped.
+    assert(shift_mask(1 << 0, (1, -1)) == 0)
+    assert(shift_mask(1 << square_index(7, 2), (1, 1)) == 0)
+    assert(shift_mask(1 << square_index(0, 3), (-1, -1)) == 0)
+    mask = (1 << square_index(3, 4)) | (1 << square_index(4, 5))
+    assert(shift_mask(mask, (-1, -1)) == (
+        (1 << square_index(2, 3)) | (1 << square_index(3, 4))
+    ))
+
+
+def test_step_tables():
+    assert(STEP_TABLES[(1, 1)][square_index(3, 4)] == square_index(4, 5))
+    assert(STEP_TABLES[(-1, 1)][square_index(0, 5)] is None)
+    for direction, table in STEP_TABLES.items():
+        for index in range(32):
+            expected = table[index]
+            result = list(iterate_squares(shift_mask(1 << index, direction)))
+            assert(result == ([] if expected is None else [expected]))
+
+
+def test_make_square_steps():
+    assert(make_square_steps(
+        square_index(2, 1), RED_STEPS, RED_KING_ROW_MASK
+    ) == [
+        ((1, -1), square_index(3, 0), None, None, True, False),
+        ((-1, -1), square_index(1, 0), None, None, True, False),
+    ])
+    assert(make_square_steps(
+        square_index(0, 3), KING_STEPS, BLACK_KING_ROW_MASK
+    ) == [
+        ((1, -1), square_index(1, 2), square_index(1, 2),
+         square_index(2, 1), False, False),
+        ((1, 1), square_index(1, 4), square_index(1, 4),
+         square_index(2, 5), False, False),
+    ])
+    assert(make_square_steps(
+        square_index(2, 5), [(1, 1)], BLACK_KING_ROW_MASK
+    ) == [
+        ((1, 1), square_index(3, 6), square_index(3, 6),
+         square_index(4, 7), False, True),
+    ])
+
+
+def test_square_steps():
+    for (color, is_king), table in SQUARE_STEPS.items():
+        for index, steps in enumerate(table):
+            piece = Piece(SQUARE_X[index], SQUARE_Y[index], color, is_king)
+            assert(piece.get_square_steps() is steps)
+            allowed = [
+                (board_dx, board_dy)
+                for board_dx, board_dy in piece.get_allowed_steps()
+                if piece.move_by(board_dx, board_dy) is not None
+            ]
+            assert([step[0] for step in steps] == allowed)
+            for step in steps:
+                moved = piece.move_by(*step[0])
+                assert(step[1] == square_index(moved.board_x, moved.board_y))
+                assert(moved.is_king == (is_king or step[4]))
+                jumped = piece.move_by(2 * step[0][0], 2 * step[0][1])
+                if jumped is None:
+                    assert(step[2] is None and step[3] is None)
+                else:
+                    assert(step[2] == step[1])
+                    assert(step[3] == square_index(
+                        jumped.board_x, jumped.board_y
+                    ))
+                    assert(jumped.is_king == (is_king or step[5]))
+    assert(set(SQUARE_STEPS) == {
+        (color, is_king)
+        for color in (PLAYER_COLOR_BLACK, PLAYER_COLOR_RED)
+        for is_king in (False, True)
+    })
+
+
+def test_iterate_squares():
+    assert(list(iterate_squares(0)) == [])
+    assert(list(iterate_squares(0b1001010)) == [1, 3, 6])
+    assert(list(iterate_squares(1 << 31)) == [31])
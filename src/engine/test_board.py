@@ -2,15 +2,18 @@
 This file contains tests for board.py.
 '''
 
+import os
 import random
+import subprocess
+import sys
 from copy import copy
 from pytest import approx
 
-from testing_utils import make_board_pieces
-from board import Board
-from piece import Piece
-from move import Move
-from constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED
+from engine.testing_utils import make_board_pieces
+from engine.board import Board
+from engine.piece import Piece
+from engine.move import Move
+from engine.constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED
 
 
 def test_get_all_moves():
@@ -213,6 +216,47 @@ def test_get_stats():
     assert(board_four.get_stats() == (1, 0, 0, 0))
 
 
+def test_get_stats_after_moves():
+    board = Board(make_board_pieces([
+        ". . . . ",
+        " R . . .",
+        "b . . . ",
+        " . . . .",
+        ". . . . ",
+        " . r . .",
+        ". . . . ",
+        " . . . .",
+    ]))
+    # The black piece captures the king and becomes a king.
+    move = board.get_all_moves(PLAYER_COLOR_BLACK)[0]
+    assert(len(move.captured) == 1)
+    board = board.apply_move(move)
+    assert(board.get_stats() == (1, 1, 1, 0))
+    generator = random.Random(3)
+    for game in range(5):
+        board = Board(make_board_pieces([
+            "r r r r ",
+            " r r r r",
+            "r r r r ",
+            " . . . .",
+            ". . . . ",
+            " b b b b",
+            "b b b b ",
+            " b b b b",
+        ]))
+        color = PLAYER_COLOR_BLACK
+        for ply in range(150):
+            moves = board.get_all_moves(color)
+            if not moves:
+                break
+            board = board.apply_move(generator.choice(moves))
+            assert(board.get_stats() == Board(board.pieces).get_stats())
+            if color == PLAYER_COLOR_BLACK:
+                color = PLAYER_COLOR_RED
+            else:
+                color = PLAYER_COLOR_BLACK
+
+
 def test_get_score():
     pieces_one = make_board_pieces([
         ". . . . ",
@@ -372,3 +416,122 @@ def test_apply_move():
     ])
     board_three = Board(pieces_three)
     assert(board_two_after_the_move == board_three)
+
+
+def test_make_move_and_unmake_move():
+    pieces = make_board_pieces([
+        ". . . . ",
+        " r . . b",
+        ". B . . ",
+        " . . . .",
+        ". . b . ",
+        " . R . .",
+        ". . . . ",
+        " . . . .",
+    ])
+    board = Board(pieces)
+    original = board.copy()
+    for color in (PLAYER_COLOR_BLACK, PLAYER_COLOR_RED):
+        for move in board.get_all_moves(color):
+            expected = board.apply_move(move)
+            undo = board.make_move(move)
+            assert(board == expected)
+            assert(board.zobrist_hash == expected.zobrist_hash)
+            assert(board.get_stats() == expected.get_stats())
+            assert(board.pieces == expected.pieces)
+            board.unmake_move(undo)
+            assert(board == original)
+            assert(board.zobrist_hash == original.zobrist_hash)
+            assert(board.get_stats() == original.get_stats())
+    assert(board.pieces is pieces)
+    # Nested moves are taken back in the reverse order.
+    first = board.get_all_moves(PLAYER_COLOR_RED)[0]
+    first_undo = board.make_move(first)
+    second_undo = board.make_move(board.get_all_moves(PLAYER_COLOR_BLACK)[0])
+    board.unmake_move(second_undo)
+    assert(board == original.apply_move(first))
+    board.unmake_move(first_undo)
+    assert(board == original)
+
+
+def test_copy():
+    board = Board(make_board_pieces([
+        ". . . . ",
+        " r . . b",
+        ". B . . ",
+        " . . . .",
+        ". . b . ",
+        " . R . .",
+        ". . . . ",
+        " . . . .",
+    ]))
+    board_copy = board.copy()
+    assert(board_copy == board)
+    assert(board_copy is not board)
+    board_copy.make_move(board_copy.get_all_moves(PLAYER_COLOR_RED)[0])
+    assert(board_copy != board)
+
+
+def test_get_capture_moves_multistep():
+    pieces = make_board_pieces([
+        ". . . . ",
+        " . . . .",
+        ". r r . ",
+        " . . . .",
+        ". . r . ",
+        " . . b .",
+        ". . . . ",
+        " . . . .",
+    ])
+    board = Board(pieces)
+    first_step = Move(
+        pieces[(5, 2)], Piece(3, 4, PLAYER_COLOR_BLACK), pieces[(4, 3)]
+    )
+    to_left = first_step.append_step(Move(
+        Piece(3, 4, PLAYER_COLOR_BLACK),
+        Piece(1, 6, PLAYER_COLOR_BLACK),
+        pieces[(2, 5)],
+    ))
+    to_right = first_step.append_step(Move(
+        Piece(3, 4, PLAYER_COLOR_BLACK),
+        Piece(5, 6, PLAYER_COLOR_BLACK),
+        pieces[(4, 5)],
+    ))
+
+    def fail_make_move(move):
+        assert(False)
+
+    # The board is only read, so other threads can use it meanwhile.
+    board.make_move = fail_make_move
+    assert(board.get_capture_moves(PLAYER_COLOR_BLACK) == [
+        to_right, to_left
+    ])
+    assert(board.pieces is pieces)
+    assert(board.get_all_moves(PLAYER_COLOR_BLACK) == [to_right, to_left])
+    board_after_the_move = board.apply_move(to_left)
+    assert(board_after_the_move == Board(make_board_pieces([
+        ". . . . ",
+        " b . . .",
+        ". . r . ",
+        " . . . .",
+        ". . . . ",
+        " . . . .",
+        ". . . . ",
+        " . . . .",
+    ])))
+
+
+def test_engine_imports_without_gui():
+    # The engine runs on hosts without a display, it must not import the
+    # turtle module (and Tk with it).
+    code = (
+        "import sys\n"
+        "import engine.board, engine.book, engine.parallel, engine.ponder\n"
+        "assert 'turtle' not in sys.modules\n"
+        "assert 'tkinter' not in sys.modules\n"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
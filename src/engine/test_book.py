@@ -0,0 +1,84 @@
+'''
+This file contains tests for book.py.
+'''
+
+import random
+
+from engine.board import Board, make_initial_pieces
+from engine.book import (
+    RECORD_FORMAT,
+    OpeningBook,
+    analyse_position,
+    build_book,
+    get_move_record,
+    write_book,
+)
+from engine.constants import (
+    BOOK_MAX_WEIGHT,
+    PLAYER_COLOR_BLACK,
+    PLAYER_COLOR_RED,
+)
+from engine.search import get_position_key
+from engine.testing_utils import make_board_pieces
+
+
+def test_get_move_record():
+    board = Board(make_board_pieces([
+        ". . . . ",
+        " . . . .",
+        ". r . . ",
+        " . . . .",
+        ". r . . ",
+        " . b . .",
+        ". . . . ",
+        " . . . .",
+    ]))
+    move = board.get_all_moves(PLAYER_COLOR_BLACK)[0]
+    assert(move.get_notation() == "d3xb5xd7")
+    assert(get_move_record(move) == (9, 25, (1 << 13) | (1 << 21)))
+
+
+def test_analyse_position():
+    board = Board(make_initial_pieces())
+    result = analyse_position(board, PLAYER_COLOR_BLACK, 2)
+    assert(1 <= len(result) <= 2)
+    assert(result[0][1] == BOOK_MAX_WEIGHT)
+    for move, weight in result:
+        assert(move in board.get_all_moves(PLAYER_COLOR_BLACK))
+        assert(1 <= weight <= BOOK_MAX_WEIGHT)
+
+
+def test_build_and_read_book(tmp_path):
+    book = build_book(plies=2, depth=2, workers=1)
+    initial = Board(make_initial_pieces())
+    # The initial position and every black reply are analysed.
+    assert(len(book) == 1 + 7)
+    assert(get_position_key(initial, PLAYER_COLOR_BLACK) in book)
+    path = tmp_path / "book.bin"
+    write_book(book, path)
+    records = sum(len(moves) for moves in book.values())
+    assert(path.stat().st_size == records * RECORD_FORMAT.size)
+    opening_book = OpeningBook(path)
+    assert(opening_book.size == records)
+    keys = [
+        opening_book.read_record(number)[0]
+        for number in range(opening_book.size)
+    ]
+    assert(keys == sorted(keys))
+    moves = opening_book.get_moves(initial, PLAYER_COLOR_BLACK)
+    assert(moves == book[get_position_key(initial, PLAYER_COLOR_BLACK)])
+    for move in initial.get_all_moves(PLAYER_COLOR_BLACK):
+        board = initial.apply_move(move)
+        move = opening_book.choose_move(
+            board, PLAYER_COLOR_RED, random.Random(1)
+        )
+        assert(move in board.get_all_moves(PLAYER_COLOR_RED))
+    # Positions out of the book have no moves.
+    assert(opening_book.get_moves(initial, PLAYER_COLOR_RED) == [])
+
+
+def test_missing_book(tmp_path):
+    opening_book = OpeningBook(tmp_path / "missing.bin")
+    assert(opening_book.size == 0)
+    board = Board(make_initial_pieces())
+    assert(opening_book.choose_move(board, PLAYER_COLOR_BLACK) is None)
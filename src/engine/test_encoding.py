@@ -0,0 +1,140 @@
+'''
+This file contains tests for encoding.py.
+'''
+
+from engine.board import Board, make_initial_pieces
+from engine.constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED
+from engine.encoding import (
+    POSITION_DTYPE,
+    RECORD_FORMAT,
+    PositionWriter,
+    get_position_text,
+    get_record_position,
+    iterate_position_chunks,
+    pack_position,
+    parse_position_text,
+    read_positions,
+    unpack_position,
+)
+from engine.evaluation import evaluate_batch
+from engine.testing_utils import make_board_pieces
+
+
+def get_test_board():
+    return Board(make_board_pieces([
+        ". . . R ",
+        " . . . .",
+        ". . r . ",
+        " . . . .",
+        ". . . . ",
+        " . . . .",
+        ". B . . ",
+        " b . . .",
+    ]))
+
+
+def test_position_text():
+    board = get_test_board()
+    text = get_position_text(board, PLAYER_COLOR_RED)
+    assert(text == "R:B1,K6:R23,K32")
+    new_board, color = parse_position_text(text)
+    assert(color == PLAYER_COLOR_RED)
+    assert(new_board == board)
+    assert(get_position_text(Board(make_initial_pieces()), "B") == (
+        "B:B1,2,3,4,5,6,7,8,9,10,11,12"
+        ":R21,22,23,24,25,26,27,28,29,30,31,32"
+    ))
+    # The order of the sides doesn't matter and a side can have no pieces.
+    new_board, color = parse_position_text("B:R5:B")
+    assert(color == PLAYER_COLOR_BLACK)
+    assert(new_board == Board(red_mask=1 << 4))
+    # Kings can stand anywhere.
+    new_board, color = parse_position_text("B:BK29:RK4")
+    assert(new_board == Board(
+        black_mask=1 << 28, red_mask=1 << 3, king_mask=(1 << 28) | (1 << 3)
+    ))
+    for text in (
+        "R:B1",
+        "X:B1:R2",
+        "R:B1:B2",
+        "R:B1:R1",
+        "R:B0:R2",
+        "R:B33:R2",
+        "R:Bx:R2",
+        # Men on their promotion rows.
+        "R:B29:R2",
+        "R:B5:R4",
+    ):
+        try:
+            parse_position_text(text)
+            assert(False)
+        except ValueError:
+            pass
+
+
+def test_position_record():
+    board = get_test_board()
+    data = pack_position(board, PLAYER_COLOR_BLACK)
+    assert(len(data) == 13 == POSITION_DTYPE.itemsize)
+    new_board, color = unpack_position(b"x" + data, 1)
+    assert(color == PLAYER_COLOR_BLACK)
+    assert(new_board == board)
+    for data in (
+        data[:-1],
+        RECORD_FORMAT.pack(1, 1, 0, 0),
+        RECORD_FORMAT.pack(1, 2, 4, 0),
+        RECORD_FORMAT.pack(1, 2, 0, 2),
+        RECORD_FORMAT.pack(1 << 31, 2, 0, 0),
+        RECORD_FORMAT.pack(1 << 4, 1, 0, 0),
+    ):
+        try:
+            unpack_position(data)
+            assert(False)
+        except ValueError:
+            pass
+
+
+def test_position_file(tmp_path):
+    path = tmp_path / "positions.bin"
+    board = Board(make_initial_pieces())
+    boards = [board] + [
+        board.apply_move(move)
+        for move in board.get_all_moves(PLAYER_COLOR_BLACK)
+    ]
+    with PositionWriter(path, chunk_size=3) as writer:
+        for new_board in boards:
+            writer.write(new_board, PLAYER_COLOR_RED)
+        for masks, color in (((1, 1, 0), PLAYER_COLOR_RED), ((1, 2, 0), [])):
+            try:
+                writer.write_masks(*masks, color)
+                assert(False)
+            except ValueError:
+                pass
+    assert(path.stat().st_size == len(boards) * POSITION_DTYPE.itemsize)
+    positions = read_positions(path)
+    assert(len(positions) == len(boards))
+    for record, new_board in zip(positions, boards):
+        position = get_record_position(record)
+        assert(position[0] == new_board)
+        assert(position[1] == PLAYER_COLOR_RED)
+    # The records of the file are the packed positions.
+    assert(path.read_bytes()[:13] == pack_position(board, PLAYER_COLOR_RED))
+    chunks = list(iterate_position_chunks(path, chunk_size=3))
+    assert([len(chunk) for chunk in chunks] == [3, 3, 2])
+    scores = evaluate_batch(chunks[0]["black"], chunks[0]["red"],
+                            chunks[0]["king"])
+    assert(list(scores) == [
+        new_board.get_score() for new_board in boards[:3]
+    ])
+    with PositionWriter(path, append=True) as writer:
+        writer.write_array(chunks[0])
+    assert(len(read_positions(path)) == len(boards) + 3)
+    with PositionWriter(path):
+        pass
+    assert(len(read_positions(path)) == 0)
+    path.write_bytes(b"x")
+    try:
+        read_positions(path)
+        assert(False)
+    except ValueError:
+        pass
@@ -0,0 +1,92 @@
+'''
+This file contains tests for evaluation.py.
+'''
+
+import random
+
+from engine.board import Board, make_initial_pieces
+from engine.constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED
+from engine.evaluation import (
+    encode_boards,
+    encode_masks,
+    evaluate_batch,
+    evaluate_masks,
+)
+from engine.search import Search, evaluate
+from engine.testing_utils import make_board_pieces
+
+
+def make_random_boards(count, seed):
+    generator = random.Random(seed)
+    boards = []
+    for number in range(count):
+        board = Board(make_initial_pieces())
+        color = PLAYER_COLOR_BLACK
+        for ply in range(generator.randrange(60)):
+            moves = board.get_all_moves(color)
+            if not moves:
+                break
+            board = board.apply_move(generator.choice(moves))
+            if color == PLAYER_COLOR_BLACK:
+                color = PLAYER_COLOR_RED
+            else:
+                color = PLAYER_COLOR_BLACK
+        boards.append(board)
+    return boards
+
+
+def test_encode_masks():
+    black_masks, red_masks, king_masks = encode_masks([(1, 2, 3), (4, 5, 0)])
+    assert(black_masks.tolist() == [1, 4])
+    assert(red_masks.tolist() == [2, 5])
+    assert(king_masks.tolist() == [3, 0])
+    black_masks, red_masks, king_masks = encode_masks([])
+    assert(len(black_masks) == 0)
+
+
+def test_evaluate_batch():
+    boards = make_random_boards(50, 1)
+    boards.append(Board(make_board_pieces([
+        ". . . . ",
+        " r . . .",
+        ". . . . ",
+        " . . . .",
+        ". . . . ",
+        " . R . .",
+        ". . . . ",
+        " . . . .",
+    ])))
+    boards.append(Board(make_board_pieces([
+        ". . . . ",
+        " b . . .",
+        ". . . . ",
+        " . . . .",
+        ". . . . ",
+        " . . . .",
+        ". . . . ",
+        " . . . .",
+    ])))
+    scores = evaluate_batch(*encode_boards(boards)).tolist()
+    assert(scores == [board.get_score() for board in boards])
+
+
+def test_evaluate_masks():
+    boards = make_random_boards(10, 2)
+    masks = [
+        (board.black_mask, board.red_mask, board.king_mask)
+        for board in boards
+    ]
+    for color in (PLAYER_COLOR_BLACK, PLAYER_COLOR_RED):
+        assert(evaluate_masks(masks, color) == [
+            evaluate(board, color) for board in boards
+        ])
+
+
+def test_search_with_batch_leaves():
+    for board in make_random_boards(10, 3):
+        for color in (PLAYER_COLOR_BLACK, PLAYER_COLOR_RED):
+            expected = Search().find_best_move(board, color, 4)
+            search = Search(batch_leaves=True)
+            result = search.find_best_move(board, color, 4)
+            assert(result.score == expected.score)
+            assert(result.principal_variation == expected.principal_variation)
@@ -0,0 +1,82 @@
+'''
+This file contains tests for move.py.
+'''
+
+from engine.move import Move
+from engine.piece import Piece
+from engine.constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED
+
+
+def test_is_capture():
+    piece_one = Piece(3, 6, PLAYER_COLOR_BLACK)
+    piece_two = Piece(5, 8, PLAYER_COLOR_BLACK)
+    move = Move(piece_one, piece_two)
+    assert(not move.is_capture())
+    piece_three = Piece(4, 6, PLAYER_COLOR_RED)
+    move = Move(piece_one, piece_two, piece_three)
+    assert(move.is_capture())
+
+
+def test_append_step():
+    piece_one = Piece(5, 2, PLAYER_COLOR_BLACK)
+    piece_two = Piece(3, 4, PLAYER_COLOR_BLACK)
+    piece_three = Piece(1, 6, PLAYER_COLOR_BLACK)
+    captured_one = Piece(4, 3, PLAYER_COLOR_RED)
+    captured_two = Piece(2, 5, PLAYER_COLOR_RED, is_king=True)
+    move = Move(piece_one, piece_two, captured_one)
+    assert(move.path == [piece_two])
+    assert(move.captured == [captured_one])
+    move = move.append_step(Move(piece_two, piece_three, captured_two))
+    assert(move.from_piece == piece_one)
+    assert(move.to_piece == piece_three)
+    assert(move.remove == captured_one)
+    assert(move.path == [piece_two, piece_three])
+    assert(move.captured == [captured_one, captured_two])
+    assert(move == Move(
+        piece_one,
+        piece_three,
+        path=[piece_two, piece_three],
+        captured=[captured_one, captured_two],
+    ))
+    assert(move != Move(piece_one, piece_three, captured_one))
+
+
+def test_get_steps():
+    piece_one = Piece(5, 2, PLAYER_COLOR_BLACK)
+    piece_two = Piece(3, 4, PLAYER_COLOR_BLACK)
+    piece_three = Piece(1, 6, PLAYER_COLOR_BLACK)
+    captured_one = Piece(4, 3, PLAYER_COLOR_RED)
+    captured_two = Piece(2, 5, PLAYER_COLOR_RED)
+    step_one = Move(piece_one, piece_two, captured_one)
+    step_two = Move(piece_two, piece_three, captured_two)
+    assert(step_one.get_steps() == [step_one])
+    assert(step_one.append_step(step_two).get_steps() == [step_one, step_two])
+
+
+def test_get_notation():
+    piece_one = Piece(5, 2, PLAYER_COLOR_BLACK)
+    piece_two = Piece(3, 4, PLAYER_COLOR_BLACK)
+    piece_three = Piece(1, 6, PLAYER_COLOR_BLACK)
+    move = Move(piece_one, Piece(4, 3, PLAYER_COLOR_BLACK))
+    assert(move.get_notation() == "f3-e4")
+    move = Move(piece_one, piece_two, Piece(4, 3, PLAYER_COLOR_RED))
+    assert(move.get_notation() == "f3xd5")
+    move = move.append_step(
+        Move(piece_two, piece_three, Piece(2, 5, PLAYER_COLOR_RED))
+    )
+    assert(move.get_notation() == "f3xd5xb7")
+
+
+def test_hash():
+    piece_one = Piece(5, 2, PLAYER_COLOR_BLACK)
+    piece_two = Piece(3, 4, PLAYER_COLOR_BLACK)
+    move_one = Move(piece_one, piece_two, Piece(4, 3, PLAYER_COLOR_RED))
+    move_two = Move(
+        Piece(5, 2, PLAYER_COLOR_BLACK),
+        Piece(3, 4, PLAYER_COLOR_BLACK),
+        Piece(4, 3, PLAYER_COLOR_RED),
+    )
+    assert(move_one == move_two)
+    assert(hash(move_one) == hash(move_two))
+    assert(len({move_one, move_two, Move(piece_one, piece_two)}) == 2)
+    assert(not hasattr(move_one, "__dict__"))
@@ -0,0 +1,67 @@
+'''
+This file contains tests for ordering.py.
+'''
+
+from engine.constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED
+from engine.move import Move
+from engine.ordering import MoveOrdering, get_move_squares
+from engine.piece import Piece
+
+
+def test_get_move_squares():
+    move = Move(
+        Piece(1, 0, PLAYER_COLOR_BLACK), Piece(2, 1, PLAYER_COLOR_BLACK)
+    )
+    assert(get_move_squares(move) == (0, 5))
+
+
+def test_order_moves():
+    piece = Piece(2, 5, PLAYER_COLOR_BLACK)
+    move_one = Move(piece, Piece(1, 6, PLAYER_COLOR_BLACK))
+    move_two = Move(piece, Piece(3, 6, PLAYER_COLOR_BLACK))
+    move_three = Move(
+        Piece(4, 1, PLAYER_COLOR_RED), Piece(5, 0, PLAYER_COLOR_RED, True)
+    )
+    move_four = Move(
+        Piece(6, 1, PLAYER_COLOR_RED), Piece(7, 0, PLAYER_COLOR_RED, True)
+    )
+    moves = [move_one, move_two, move_three]
+    ordering = MoveOrdering()
+    assert(ordering.order_moves(moves, 0) == [move_three, move_one, move_two])
+    assert(ordering.order_moves(moves, 0, move_two) == [
+        move_two, move_three, move_one
+    ])
+    ordering.record_cutoff(move_two, 3, 2, 1)
+    assert(ordering.order_moves(moves, 3) == [move_three, move_two, move_one])
+    # Killers are kept per ply, history is shared by all plies.
+    assert(ordering.order_moves(moves, 2) == [move_three, move_two, move_one])
+    ordering.record_cutoff(move_one, 2, 1, 0)
+    assert(ordering.order_moves(moves, 2) == [move_three, move_one, move_two])
+    assert(ordering.order_moves([move_four], 0) == [move_four])
+
+
+def test_record_cutoff():
+    piece = Piece(2, 5, PLAYER_COLOR_BLACK)
+    move_one = Move(piece, Piece(1, 6, PLAYER_COLOR_BLACK))
+    move_two = Move(piece, Piece(3, 6, PLAYER_COLOR_BLACK))
+    move_three = Move(
+        Piece(2, 5, PLAYER_COLOR_RED), Piece(1, 4, PLAYER_COLOR_RED)
+    )
+    ordering = MoveOrdering()
+    assert(ordering.get_first_move_cutoff_rate() == 0)
+    ordering.record_cutoff(move_one, 1, 3, 0)
+    ordering.record_cutoff(move_two, 1, 2, 0)
+    ordering.record_cutoff(move_three, 1, 1, 2)
+    ordering.record_cutoff(move_one, 1, 1, 1)
+    assert(ordering.get_killers(1) == [move_one, move_three])
+    assert(ordering.history[get_move_squares(move_one)[0]][
+        get_move_squares(move_one)[1]
+    ] == 10)
+    assert(ordering.cutoffs == 4)
+    assert(ordering.get_first_move_cutoff_rate() == 0.5)
+    ordering.new_search()
+    assert(ordering.get_killers(1) == [])
+    assert(ordering.history[get_move_squares(move_one)[0]][
+        get_move_squares(move_one)[1]
+    ] == 5)
+    assert(ordering.cutoffs == 0)
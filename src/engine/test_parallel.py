@@ -0,0 +1,147 @@
+'''
+This file contains tests for parallel.py.
+'''
+
+import threading
+import time
+
+from engine.board import Board, make_initial_pieces
+from engine.constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED
+from engine.parallel import ParallelSearch, search_root_move
+from engine.search import INFINITE_SCORE, Search, SearchAborted
+from engine.testing_utils import make_board_pieces
+
+
+def test_search_root_move():
+    board = Board(make_board_pieces([
+        ". . . . ",
+        " . . . .",
+        ". r . . ",
+        " . . . .",
+        ". . r . ",
+        " . . b .",
+        ". . . . ",
+        " . . . .",
+    ]))
+    move = board.get_all_moves(PLAYER_COLOR_BLACK)[0]
+    score, variation, stats = search_root_move(
+        board, PLAYER_COLOR_BLACK, move, 2, -INFINITE_SCORE, None, None
+    )
+    assert(variation == [move])
+    assert(score == Search().find_best_move(
+        board, PLAYER_COLOR_BLACK, 2
+    ).score)
+    assert(stats.nodes > 0)
+    board = Board(make_board_pieces([
+        "r r r r ",
+        " r r r r",
+        "r r r r ",
+        " . . . .",
+        ". . . . ",
+        " b b b b",
+        "b b b b ",
+        " b b b b",
+    ]))
+    move = board.get_all_moves(PLAYER_COLOR_BLACK)[0]
+    score, variation, stats = search_root_move(
+        board, PLAYER_COLOR_BLACK, move, 6, -INFINITE_SCORE, None, 10
+    )
+    assert(score is None)
+    assert(variation == [])
+
+
+def test_search_root_move_keeps_tables():
+    board = Board(make_initial_pieces())
+    move = board.get_all_moves(PLAYER_COLOR_BLACK)[0]
+    first_stats = search_root_move(
+        board, PLAYER_COLOR_BLACK, move, 5, -INFINITE_SCORE, None, None, 1
+    )[2]
+    # The second task of the same search finds the positions of the first.
+    stats = search_root_move(
+        board, PLAYER_COLOR_BLACK, move, 5, -INFINITE_SCORE, None, None, 1
+    )[2]
+    assert(stats.nodes < first_stats.nodes)
+    stats = search_root_move(
+        board, PLAYER_COLOR_BLACK, move, 5, -INFINITE_SCORE, None, None, 2
+    )[2]
+    assert(stats.nodes == first_stats.nodes)
+
+
+def test_parallel_search_matches_search():
+    board = Board(make_board_pieces([
+        ". . . . ",
+        " r . r b",
+        ". B . . ",
+        " . r . .",
+        ". . b . ",
+        " . R . .",
+        "b . . . ",
+        " . b . .",
+    ]))
+    parallel_search = ParallelSearch(2)
+    try:
+        for color in (PLAYER_COLOR_RED, PLAYER_COLOR_BLACK):
+            for depth in (1, 2, 3, 4):
+                expected = Search().find_best_move(board, color, depth)
+                result = parallel_search.find_best_move(board, color, depth)
+                assert(result.score == expected.score)
+                assert(result.principal_variation[0] == result.move)
+                assert(parallel_search.nodes > 0)
+        result = parallel_search.iterative_deepening(
+            board, PLAYER_COLOR_RED, 30, time_limit=0.3
+        )
+        assert(result.move is not None)
+        assert(result.depth >= 1)
+    finally:
+        parallel_search.shutdown()
+
+
+def test_parallel_search_stop():
+    board = Board(make_initial_pieces())
+    parallel_search = ParallelSearch(2)
+    try:
+        parallel_search.stop()
+        try:
+            parallel_search.search_root(board, PLAYER_COLOR_BLACK, 6)
+            assert(False)
+        except SearchAborted:
+            pass
+        result = parallel_search.iterative_deepening(
+            board, PLAYER_COLOR_BLACK, 30
+        )
+        assert(result is None)
+        parallel_search.stop_requested = False
+        result = parallel_search.find_best_move(board, PLAYER_COLOR_BLACK, 1)
+        assert(result.move is not None)
+        # The running task of the first root move has no budget, the stop
+        # aborts it.
+        timer = threading.Timer(0.2, parallel_search.stop)
+        timer.start()
+        start_time = time.perf_counter()
+        try:
+            parallel_search.search_root(board, PLAYER_COLOR_BLACK, 30)
+            assert(False)
+        except SearchAborted:
+            pass
+        assert(time.perf_counter() - start_time < 10)
+        parallel_search.stop_requested = False
+        result = parallel_search.find_best_move(board, PLAYER_COLOR_BLACK, 4)
+        assert(result.depth == 4)
+    finally:
+        parallel_search.shutdown()
+
+
+def test_parallel_search_node_limit():
+    board = Board(make_initial_pieces())
+    parallel_search = ParallelSearch(2)
+    try:
+        result = parallel_search.iterative_deepening(
+            board, PLAYER_COLOR_BLACK, 30, node_limit=20000
+        )
+    finally:
+        parallel_search.shutdown()
+    # As in Search, the budget counts the nodes of all iterations.
+    assert(result.depth >= 2)
+    assert(result.stats.nodes <= 20000 + len(
+        board.get_all_moves(PLAYER_COLOR_BLACK)
+    ))
@@ -0,0 +1,43 @@
+'''
+This file contains tests for perft.py.
+'''
+
+from engine.board import Board, make_initial_pieces
+from engine.constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED
+from engine.perft import KNOWN_PERFT_COUNTS, perft, perft_divide
+from engine.testing_utils import make_board_pieces
+
+
+def test_perft_initial_position():
+    board = Board(make_initial_pieces())
+    for depth in range(1, 6):
+        assert(
+            perft(board, PLAYER_COLOR_BLACK, depth) ==
+            KNOWN_PERFT_COUNTS[depth]
+        )
+
+
+def test_perft():
+    board = Board(make_board_pieces([
+        ". . . . ",
+        " . . . .",
+        ". r r . ",
+        " . . . .",
+        ". . r . ",
+        " . . b .",
+        ". . . . ",
+        " . . . .",
+    ]))
+    assert(perft(board, PLAYER_COLOR_BLACK, 0) == 1)
+    # The double capture is one move.
+    assert(perft(board, PLAYER_COLOR_BLACK, 1) == 2)
+    assert(perft(board, PLAYER_COLOR_RED, 1) == 1)
+
+
+def test_perft_divide():
+    board = Board(make_initial_pieces())
+    result = perft_divide(board, PLAYER_COLOR_BLACK, 3)
+    assert(len(result) == 7)
+    assert(sum(count for move, count in result) == KNOWN_PERFT_COUNTS[3])
+    assert(result[0][0].get_notation() == "b3-c4")
+    assert(result[0][1] == 40)
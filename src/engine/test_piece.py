@@ -2,13 +2,13 @@
 This file contains tests for piece.py.
 '''
 
+import pickle
 
-from piece import Piece
-from board import Board
-from move import Move
-from testing_utils import make_board_pieces
-from constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED
-from move import Move
+from engine.piece import Piece, get_piece
+from engine.board import Board
+from engine.constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED
+from engine.move import Move
+from engine.testing_utils import make_board_pieces
 
 
 def test_check_is_inside():
@@ -21,18 +21,39 @@ def test_check_is_inside():
 
 
 def test_maybe_promote_to_king():
-    piece_one = Piece(3, 7, PLAYER_COLOR_BLACK)
-    piece_one.maybe_promote_to_king()
-    assert(piece_one.is_king)
+    piece_one = get_piece(3, 7, PLAYER_COLOR_BLACK)
+    assert(piece_one.maybe_promote_to_king() is get_piece(
+        3, 7, PLAYER_COLOR_BLACK, True
+    ))
+    # The shared piece itself stays a man.
+    assert(not piece_one.is_king)
     piece_two = Piece(3, 6, PLAYER_COLOR_BLACK)
-    piece_two.maybe_promote_to_king()
-    assert(not piece_two.is_king)
+    assert(piece_two.maybe_promote_to_king() is piece_two)
     piece_three = Piece(4, 0, PLAYER_COLOR_RED)
-    piece_three.maybe_promote_to_king()
-    assert(piece_three.is_king)
+    assert(piece_three.maybe_promote_to_king().is_king)
+    assert(not piece_three.is_king)
     piece_four = Piece(4, 3, PLAYER_COLOR_RED)
-    piece_four.maybe_promote_to_king()
-    assert(not piece_four.is_king)
+    assert(not piece_four.maybe_promote_to_king().is_king)
+
+
+def test_piece_is_immutable():
+    piece = get_piece(3, 4, PLAYER_COLOR_BLACK)
+    for name in ("board_x", "is_king"):
+        try:
+            setattr(piece, name, 1)
+            assert(False)
+        except AttributeError:
+            pass
+    try:
+        del piece.color
+        assert(False)
+    except AttributeError:
+        pass
+    assert(piece == Piece(3, 4, PLAYER_COLOR_BLACK))
+    # A loaded piece is the shared piece of the process.
+    assert(pickle.loads(pickle.dumps(piece)) is piece)
+    off_board = Piece(9, 8, PLAYER_COLOR_RED, True)
+    assert(pickle.loads(pickle.dumps(off_board)) == off_board)
 
 
 def test_move_by():
@@ -66,6 +87,24 @@ def test_move_by():
     )
 
 
+def test_get_piece():
+    piece = get_piece(3, 4, PLAYER_COLOR_BLACK)
+    assert(piece is get_piece(3, 4, PLAYER_COLOR_BLACK))
+    assert(piece == Piece(3, 4, PLAYER_COLOR_BLACK))
+    assert(piece is not get_piece(3, 4, PLAYER_COLOR_BLACK, is_king=True))
+    assert(piece.move_by(1, 1) is get_piece(4, 5, PLAYER_COLOR_BLACK))
+    assert(get_piece(9, 8, PLAYER_COLOR_RED) == Piece(9, 8, PLAYER_COLOR_RED))
+    assert(not hasattr(piece, "__dict__"))
+
+
+def test_hash():
+    piece_one = Piece(3, 4, PLAYER_COLOR_BLACK)
+    piece_two = get_piece(3, 4, PLAYER_COLOR_BLACK)
+    assert(hash(piece_one) == hash(piece_two))
+    assert(len({piece_one, piece_two}) == 1)
+    assert(piece_one != Piece(3, 4, PLAYER_COLOR_RED))
+
+
 def test_get_allowed_steps():
     piece_one = Piece(3, 6, PLAYER_COLOR_BLACK)
     assert(piece_one.get_allowed_steps() == [(1, 1), (-1, 1)])
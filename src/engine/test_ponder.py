@@ -0,0 +1,47 @@
+'''
+This file contains tests for ponder.py.
+'''
+
+import time
+
+from engine.board import Board, make_initial_pieces
+from engine.constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED
+from engine.ponder import Ponderer
+from engine.search import Search
+
+
+def test_stop_without_start():
+    ponderer = Ponderer(Search())
+    assert(ponderer.stop() is None)
+    assert(not ponderer.is_running())
+
+
+def test_ponder():
+    board = Board(make_initial_pieces())
+    search = Search()
+    ponderer = Ponderer(search)
+    ponderer.start(board, PLAYER_COLOR_BLACK)
+    assert(ponderer.is_running())
+    time.sleep(0.2)
+    result = ponderer.stop()
+    assert(not ponderer.is_running())
+    assert(not search.stop_requested)
+    assert(result is not None)
+    assert(result.move in board.get_all_moves(PLAYER_COLOR_BLACK))
+    assert(search.transposition_table.stores > 0)
+    assert(board == Board(make_initial_pieces()))
+    # The search after the reply finds the stored positions.
+    search.transposition_table.hits = 0
+    reply = board.apply_move(result.move)
+    result = search.find_best_move(reply, PLAYER_COLOR_RED, 4)
+    assert(result.move in reply.get_all_moves(PLAYER_COLOR_RED))
+    assert(search.transposition_table.hits > 0)
+
+
+def test_ponder_finishes():
+    search = Search()
+    ponderer = Ponderer(search)
+    ponderer.start(Board(make_initial_pieces()), PLAYER_COLOR_BLACK, 2)
+    ponderer.thread.join()
+    assert(not ponderer.is_running())
+    assert(ponderer.stop().depth == 2)
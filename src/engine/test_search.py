@@ -0,0 +1,217 @@
+'''
+This file contains tests for search.py.
+'''
+
+import time
+
+from engine.board import Board, make_initial_pieces
+from engine.constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED
+from engine.search import (
+    WIN_SCORE,
+    Search,
+    evaluate,
+    get_opponent_color,
+)
+from engine.testing_utils import make_board_pieces
+
+
+def minimax(board, color, depth, ply=0):
+    '''
+        Function -- minimax
+            Reference search without pruning used to check the negamax
+        Parameters:
+            board -- the Board object
+            color -- color of the side to move
+            depth -- remaining search depth in plies
+            ply -- distance from the root in plies
+        Returns:
+            The score from the point of view of the side to move
+    '''
+    if depth <= 0:
+        return evaluate(board, color)
+    options = board.get_all_moves(color)
+    if len(options) == 0:
+        return -(WIN_SCORE - ply)
+    scores = []
+    for move in options:
+        scores.append(-minimax(
+            board.apply_move(move), get_opponent_color(color), depth - 1,
+            ply + 1,
+        ))
+    return max(scores)
+
+
+def test_get_opponent_color():
+    assert(get_opponent_color(PLAYER_COLOR_RED) == PLAYER_COLOR_BLACK)
+    assert(get_opponent_color(PLAYER_COLOR_BLACK) == PLAYER_COLOR_RED)
+
+
+def test_find_best_move_matches_minimax():
+    boards = [
+        Board(make_board_pieces([
+            "r r r r ",
+            " r r r r",
+            "r r r r ",
+            " . . . .",
+            ". . . . ",
+            " b b b b",
+            "b b b b ",
+            " b b b b",
+        ])),
+        Board(make_board_pieces([
+            ". . . . ",
+            " r . r b",
+            ". B . . ",
+            " . r . .",
+            ". . b . ",
+            " . R . .",
+            "b . . . ",
+            " . b . .",
+        ])),
+    ]
+    search = Search()
+    for board in boards:
+        for color in (PLAYER_COLOR_RED, PLAYER_COLOR_BLACK):
+            for depth in (1, 2, 3, 4):
+                result = search.find_best_move(board, color, depth)
+                assert(result.score == minimax(board, color, depth))
+                assert(result.principal_variation[0] == result.move)
+
+
+def test_find_best_move_takes_double_capture():
+    board = Board(make_board_pieces([
+        ". . . . ",
+        " . . . .",
+        ". r . . ",
+        " . . . .",
+        ". . r . ",
+        " . . b .",
+        ". . . . ",
+        " . . . .",
+    ]))
+    result = Search().find_best_move(board, PLAYER_COLOR_BLACK, 3)
+    assert(len(result.move.captured) == 2)
+    assert(result.score == WIN_SCORE - 1)
+    assert(len(result.principal_variation) == 1)
+
+
+def test_find_best_move_without_moves():
+    board = Board(make_board_pieces([
+        ". . . . ",
+        " . . . .",
+        ". . . . ",
+        " . . . .",
+        ". . . . ",
+        " . . . .",
+        ". . . . ",
+        " . . . b",
+    ]))
+    result = Search().find_best_move(board, PLAYER_COLOR_RED, 3)
+    assert(result.move is None)
+    assert(result.score == -WIN_SCORE)
+    assert(board.optimal_move_red(None, 3) is None)
+
+
+def test_iterative_deepening_node_limit():
+    board = Board(make_board_pieces([
+        "r r r r ",
+        " r r r r",
+        "r r r r ",
+        " . . . .",
+        ". . . . ",
+        " b b b b",
+        "b b b b ",
+        " b b b b",
+    ]))
+    search = Search()
+    result = search.iterative_deepening(
+        board, PLAYER_COLOR_BLACK, 20, node_limit=2000
+    )
+    assert(1 <= result.depth < 20)
+    assert(search.nodes <= 2001)
+    # The aborted iteration took back its moves.
+    assert(board == Board(make_initial_pieces()))
+    expected = Search().find_best_move(board, PLAYER_COLOR_BLACK, result.depth)
+    assert(result.score == expected.score)
+    assert(result.move == expected.move)
+
+
+def test_iterative_deepening_time_limit():
+    board = Board(make_board_pieces([
+        "r r r r ",
+        " r r r r",
+        "r r r r ",
+        " . . . .",
+        ". . . . ",
+        " b b b b",
+        "b b b b ",
+        " b b b b",
+    ]))
+    start_time = time.perf_counter()
+    result = Search().iterative_deepening(
+        board, PLAYER_COLOR_RED, 30, time_limit=0.2
+    )
+    assert(time.perf_counter() - start_time < 1)
+    assert(result.move is not None)
+
+
+def test_iterative_deepening_single_move():
+    board = Board(make_board_pieces([
+        ". . . . ",
+        " . . . .",
+        ". r . . ",
+        " . . . .",
+        ". . r . ",
+        " . . b .",
+        ". . . . ",
+        " . . . .",
+    ]))
+    # The only move is returned without searching deeper.
+    result = Search().iterative_deepening(board, PLAYER_COLOR_BLACK, 30)
+    assert(result.move.is_capture())
+    assert(result.depth == 1)
+
+
+def test_iterative_deepening_copies_board():
+    board = Board(make_initial_pieces())
+
+    def fail(*arguments):
+        assert(False)
+
+    for name in ("get_all_moves", "make_move", "apply_move"):
+        setattr(board, name, fail)
+    result = Search().iterative_deepening(board, PLAYER_COLOR_BLACK, 3)
+    assert(result.depth == 3)
+    assert(board == Board(make_initial_pieces()))
+
+
+def test_stop():
+    search = Search()
+    search.stop()
+    result = search.iterative_deepening(
+        Board(make_initial_pieces()), PLAYER_COLOR_BLACK, 20
+    )
+    assert(1 <= result.depth < 20)
+    assert(search.nodes <= 256)
+
+
+def test_search_stats():
+    search = Search()
+    result = search.find_best_move(
+        Board(make_initial_pieces()), PLAYER_COLOR_BLACK, 5
+    )
+    stats = result.stats
+    assert(stats is search.stats)
+    assert(stats.nodes == search.nodes > 0)
+    assert(stats.depth == 5)
+    assert(0 < stats.leaf_evaluations < stats.nodes)
+    assert(stats.beta_cutoffs > 0)
+    assert(stats.transposition_probes > 0)
+    assert(stats.time_s >= stats.movegen_time_s + stats.evaluation_time_s)
+    # The second search finds the positions of the first one.
+    result = search.iterative_deepening(
+        Board(make_initial_pieces()), PLAYER_COLOR_BLACK, 5
+    )
+    assert(result.stats is not stats)
+    assert(result.stats.transposition_hits > 0)
+    assert(result.stats.depth == result.depth)
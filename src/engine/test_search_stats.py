@@ -0,0 +1,51 @@
+'''
+This file contains tests for search_stats.py.
+'''
+
+import pickle
+
+from engine.search_stats import SearchStats
+
+
+def test_get_nodes_per_second():
+    stats = SearchStats()
+    assert(stats.get_nodes_per_second() == 0)
+    stats.nodes = 500
+    stats.time_s = 0.25
+    assert(stats.get_nodes_per_second() == 2000)
+
+
+def test_add():
+    stats = SearchStats()
+    stats.depth = 4
+    other = SearchStats()
+    other.nodes = 10
+    other.leaf_evaluations = 6
+    other.beta_cutoffs = 2
+    other.transposition_probes = 3
+    other.transposition_hits = 1
+    other.movegen_time_s = 0.5
+    other.evaluation_time_s = 0.25
+    other.depth = 7
+    stats.add(other)
+    stats.add(other)
+    assert(stats.nodes == 20)
+    assert(stats.leaf_evaluations == 12)
+    assert(stats.beta_cutoffs == 4)
+    assert(stats.transposition_probes == 6)
+    assert(stats.transposition_hits == 2)
+    assert(stats.movegen_time_s == 1.0)
+    assert(stats.evaluation_time_s == 0.5)
+    assert(stats.depth == 4)
+
+
+def test_to_dict():
+    stats = SearchStats()
+    stats.nodes = 30
+    stats.time_s = 2.0
+    result = stats.to_dict()
+    assert(result["nodes"] == 30)
+    assert(result["nodes_per_second"] == 15)
+    assert(set(result) == set(SearchStats.__slots__) | {"nodes_per_second"})
+    copy = pickle.loads(pickle.dumps(stats))
+    assert(copy.to_dict() == result)
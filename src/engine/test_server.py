@@ -0,0 +1,158 @@
+'''
+This file contains tests for server.py.
+'''
+
+import asyncio
+import json
+import os
+
+from engine.board import Board, make_initial_pieces
+from engine.constants import (
+    ENGINE_SERVER_MAX_REQUEST,
+    ENGINE_SERVER_MAX_TIME_LIMIT_S,
+    MAX_SEARCH_DEPTH,
+    PLAYER_COLOR_RED,
+)
+from engine.server import EngineServer, parse_request, search_position
+
+
+def get_initial_request(**settings):
+    board = Board(make_initial_pieces())
+    request = {
+        "black": board.black_mask,
+        "red": board.red_mask,
+        "king": board.king_mask,
+        "color": PLAYER_COLOR_RED,
+    }
+    request.update(settings)
+    return request
+
+
+def test_parse_request():
+    request = get_initial_request(max_depth=4, time_limit=None)
+    arguments = parse_request(request)
+    assert(arguments[3:6] == (
+        PLAYER_COLOR_RED, 4, ENGINE_SERVER_MAX_TIME_LIMIT_S
+    ))
+    # Longer time limits are cut, so every search ends.
+    arguments = parse_request(dict(request, time_limit=1e9))
+    assert(arguments[5] == ENGINE_SERVER_MAX_TIME_LIMIT_S)
+    for name, value in (
+        ("black", -1),
+        ("red", 1 << 32),
+        ("red", request["black"]),
+        # The middle rows are empty in the initial position.
+        ("king", 1 << 15),
+        ("color", "X"),
+        ("color", []),
+        ("color", {}),
+        ("max_depth", 0),
+        ("max_depth", MAX_SEARCH_DEPTH + 1),
+        ("time_limit", "1"),
+        ("time_limit", float("nan")),
+        ("time_limit", float("inf")),
+        ("node_limit", 1.5),
+    ):
+        try:
+            parse_request(dict(request, **{name: value}))
+            assert(False)
+        except ValueError:
+            pass
+    try:
+        parse_request([])
+        assert(False)
+    except ValueError:
+        pass
+
+
+def test_search_position():
+    request = get_initial_request(max_depth=3, time_limit=None)
+    response = search_position(*parse_request(request))
+    assert(response["depth"] == 3)
+    assert(response["move"] == response["principal_variation"][0])
+    assert(response["stats"]["nodes"] > 0)
+    json.dumps(response)
+
+
+def test_engine_server():
+    async def send(port, request):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        writer.close()
+        await writer.wait_closed()
+        return response
+
+    async def run():
+        engine_server = EngineServer(workers=1)
+        try:
+            server = await engine_server.start(port=0)
+            async with server:
+                port = server.sockets[0].getsockname()[1]
+                request = get_initial_request(max_depth=5, time_limit=None)
+                responses = await asyncio.gather(
+                    send(port, dict(request, id=1)),
+                    send(port, dict(request, id=2)),
+                    send(port, {"id": 3, "black": "x"}),
+                    send(port, dict(request, id=5, color=["R"])),
+                )
+                error = await send(port, {"id": 4, "color": "R"})
+        finally:
+            engine_server.shutdown()
+        return engine_server, responses, error
+
+    engine_server, responses, error = asyncio.run(run())
+    # The two identical requests are answered by one search.
+    assert(engine_server.searches == 1)
+    assert(engine_server.coalesced == 1)
+    assert(engine_server.running == {})
+    assert([response["id"] for response in responses] == [1, 2, 3, 5])
+    assert(responses[0]["move"] == responses[1]["move"])
+    assert(responses[0]["depth"] == 5)
+    assert(
+        sorted([responses[0]["coalesced"], responses[1]["coalesced"]])
+        == [False, True]
+    )
+    assert("error" in responses[2])
+    # A color that is not a string is an error too, not a dropped client.
+    assert("error" in responses[3])
+    assert(error["id"] == 4 and "error" in error)
+
+
+def test_engine_server_errors():
+    async def run():
+        engine_server = EngineServer(workers=1)
+        try:
+            server = await engine_server.start(port=0)
+            async with server:
+                port = server.sockets[0].getsockname()[1]
+                reader, writer = await asyncio.open_connection(
+                    "127.0.0.1", port
+                )
+                request = get_initial_request(max_depth=2, time_limit=None)
+                # A worker process dies, the search fails and the next
+                # one runs in a new pool.
+                engine_server.executor.submit(os._exit, 1)
+                responses = []
+                for request_id in (1, 2):
+                    writer.write(json.dumps(
+                        dict(request, id=request_id)
+                    ).encode() + b"\n")
+                    await writer.drain()
+                    responses.append(json.loads(await reader.readline()))
+                writer.write(b"x" * (ENGINE_SERVER_MAX_REQUEST + 1) + b"\n")
+                await writer.drain()
+                responses.append(json.loads(await reader.readline()))
+                # The connection is closed after a too long request.
+                responses.append(await reader.read())
+                writer.close()
+        finally:
+            engine_server.shutdown()
+        return responses
+
+    responses = asyncio.run(run())
+    assert(responses[0]["id"] == 1 and "error" in responses[0])
+    assert(responses[1]["id"] == 2 and responses[1]["depth"] == 2)
+    assert(responses[2]["id"] is None and "error" in responses[2])
+    assert(responses[3] == b"")
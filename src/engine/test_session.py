@@ -0,0 +1,168 @@
+'''
+This file contains tests for session.py.
+'''
+
+from engine.board import Board
+from engine.constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED
+from engine.session import GameSession, SessionManager
+from engine.testing_utils import make_board_pieces
+
+
+def test_play_move():
+    session = GameSession()
+    moves = session.get_moves()
+    assert(len(moves) == 7)
+    assert(session.get_winner() is None)
+    session.play_move(moves[0])
+    assert(session.color == PLAYER_COLOR_RED)
+    assert(session.history == [moves[0]])
+    try:
+        session.play_move(moves[1])
+        assert(False)
+    except ValueError:
+        pass
+    assert(session.history == [moves[0]])
+
+
+def test_play_step():
+    board = Board(make_board_pieces([
+        ". . . . ",
+        " . . . .",
+        ". . . . ",
+        " r r . .",
+        ". . . . ",
+        " r . . .",
+        "b . . . ",
+        " . . . .",
+    ]))
+    session = GameSession(board=board)
+    steps = session.get_next_steps()
+    assert(len(steps) == 1)
+    assert(session.get_next_steps(2, 1) == [])
+    assert(session.get_next_steps(0, 1) == steps)
+    assert(not session.play_step(steps[0]))
+    assert(session.is_locked())
+    assert(session.color == PLAYER_COLOR_BLACK)
+    # Both continuations start from the square the piece jumped to.
+    next_steps = session.get_next_steps()
+    assert(len(next_steps) == 2)
+    for step in next_steps:
+        assert(step.from_piece.board_x == 2)
+        assert(step.from_piece.board_y == 3)
+    try:
+        session.play_move(session.get_moves()[0])
+        assert(False)
+    except ValueError:
+        pass
+    assert(session.play_step(next_steps[0]))
+    assert(not session.is_locked())
+    assert(session.color == PLAYER_COLOR_RED)
+    assert(len(session.history) == 1)
+    assert(len(session.history[0].captured) == 2)
+    assert(session.board.get_stats()[1] == 1)
+
+
+def test_get_winner():
+    board = Board(make_board_pieces([
+        ". . . . ",
+        " . . . .",
+        ". . . . ",
+        " . . . .",
+        ". . . . ",
+        " . . . .",
+        ". . . . ",
+        " b . . .",
+    ]))
+    session = GameSession(board=board, color=PLAYER_COLOR_RED)
+    assert(session.get_winner() == PLAYER_COLOR_BLACK)
+
+
+def test_get_memory_usage():
+    session = GameSession()
+    assert(session.get_memory_usage() > 0)
+    # The boards after moves don't build the pieces dictionary.
+    session.play_move(session.get_moves()[0])
+    size = session.get_memory_usage()
+    for i in range(4):
+        session.play_move(session.get_moves()[0])
+    assert(session.get_memory_usage() > size)
+
+
+def test_session_manager():
+    finished = []
+    manager = SessionManager(
+        workers=1,
+        max_sessions=3,
+        max_depth=3,
+        time_limit=None,
+        on_move=lambda session, result, error: finished.append(
+            session.session_id
+        ),
+    )
+    try:
+        sessions = [manager.create_session() for i in range(3)]
+        try:
+            manager.create_session()
+            assert(False)
+        except ValueError:
+            pass
+        try:
+            manager.request_computer_move(sessions[0].session_id)
+            assert(False)
+        except ValueError:
+            pass
+        for session in sessions:
+            session.play_move(session.get_moves()[0])
+        for session in reversed(sessions):
+            manager.request_computer_move(session.session_id)
+        manager.close_session(sessions[1].session_id)
+        assert(manager.wait_idle(60))
+        # One worker serves the sessions in the order they asked.
+        assert(finished == [
+            sessions[2].session_id, sessions[0].session_id,
+        ])
+        for session in (sessions[0], sessions[2]):
+            assert(session.color == PLAYER_COLOR_BLACK)
+            assert(len(session.history) == 2)
+            assert(session.last_result.depth == 3)
+            assert(session.last_error is None)
+            assert(not session.is_waiting)
+        assert(sessions[1].color == PLAYER_COLOR_RED)
+        assert(manager.get_session(sessions[1].session_id) is None)
+        memory = manager.get_memory_usage()
+        assert(set(memory) == {
+            sessions[0].session_id, sessions[2].session_id,
+        })
+        assert(min(memory.values()) > 0)
+    finally:
+        manager.shutdown()
+
+
+def test_session_manager_failed_search():
+    finished = []
+    # The search fails in the worker with a depth that is not a number.
+    manager = SessionManager(
+        workers=1,
+        max_depth="3",
+        on_move=lambda session, result, error: finished.append(
+            (session, result, error)
+        ),
+    )
+    try:
+        session = manager.create_session()
+        session.play_move(session.get_moves()[0])
+        manager.request_computer_move(session.session_id)
+        assert(manager.wait_idle(60))
+        assert(finished == [(session, None, session.last_error)])
+        assert(isinstance(session.last_error, TypeError))
+        assert(session.last_result is None)
+        assert(session.color == PLAYER_COLOR_RED)
+        assert(not session.is_waiting)
+        # The move can be asked again.
+        manager.max_depth = 2
+        manager.request_computer_move(session.session_id)
+        assert(manager.wait_idle(60))
+        assert(session.last_error is None)
+        assert(session.color == PLAYER_COLOR_BLACK)
+    finally:
+        manager.shutdown()
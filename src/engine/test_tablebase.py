@@ -0,0 +1,145 @@
+'''
+This file contains tests for tablebase.py.
+'''
+
+from itertools import combinations
+from math import comb
+
+from engine.board import Board, make_initial_pieces
+from engine.constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED
+from engine.search import WIN_SCORE, Search
+from engine.tablebase import (
+    DRAW,
+    LOSS,
+    WIN,
+    Tablebase,
+    generate_tablebases,
+    get_position_index,
+    get_signature,
+    get_signatures,
+    get_subset_rank,
+    get_table_size,
+    read_entry,
+    write_entry,
+)
+from engine.testing_utils import make_board_pieces
+
+
+def test_get_subset_rank():
+    ranks = set()
+    for squares in combinations(range(32), 2):
+        ranks.add(get_subset_rank((1 << squares[0]) | (1 << squares[1])))
+    assert(ranks == set(range(comb(32, 2))))
+    assert(get_subset_rank(0) == 0)
+
+
+def test_get_signature():
+    board = Board(make_board_pieces([
+        ". . . . ",
+        " . . . .",
+        ". r R . ",
+        " . . . .",
+        ". . . . ",
+        " . . b .",
+        ". B . . ",
+        " . . . .",
+    ]))
+    signature = get_signature(
+        board.black_mask, board.red_mask, board.king_mask
+    )
+    assert(signature == (1, 1, 1, 1))
+    index = get_position_index(
+        board.black_mask, board.red_mask, board.king_mask,
+        PLAYER_COLOR_RED,
+    )
+    assert(index % 2 == 1)
+    assert(index < get_table_size(signature))
+
+
+def test_get_signatures():
+    signatures = get_signatures(3)
+    assert(len(signatures) == len(set(signatures)))
+    assert(signatures[0] == (0, 1, 0, 1))
+    for position, signature in enumerate(signatures):
+        assert(sum(signature) <= 3)
+        assert(signature[0] + signature[1] > 0)
+        assert(signature[2] + signature[3] > 0)
+        # Promotions lead to signatures listed before.
+        if signature[0] > 0:
+            promoted = (
+                signature[0] - 1, signature[1] + 1,
+                signature[2], signature[3],
+            )
+            assert(signatures.index(promoted) < position)
+
+
+def test_read_write_entry():
+    table = bytearray(8)
+    write_entry(table, 2, LOSS, 37)
+    assert(read_entry(table, 2) == (LOSS, 37))
+    assert(read_entry(table, 1) == (0, 0))
+
+
+def test_tablebase(tmp_path):
+    tables = generate_tablebases(2, tmp_path)
+    assert(len(tables) == 4)
+    for signature in tables:
+        assert((tmp_path / "{}{}{}{}.tb".format(*signature)).exists())
+    tablebase = Tablebase(tmp_path, 2)
+    # Both sides capture on their move.
+    board = Board(make_board_pieces([
+        ". . . . ",
+        " . . . .",
+        ". . . . ",
+        " . . . .",
+        ". r . . ",
+        " . b . .",
+        ". . . . ",
+        " . . . .",
+    ]))
+    assert(tablebase.probe(board, PLAYER_COLOR_BLACK) == (WIN, 1))
+    assert(tablebase.probe(board, PLAYER_COLOR_RED) == (WIN, 1))
+    # Kings far away from each other.
+    board = Board(make_board_pieces([
+        ". . . . ",
+        " . . . R",
+        ". . . . ",
+        " . . . .",
+        ". . . . ",
+        " . . . .",
+        "B . . . ",
+        " . . . .",
+    ]))
+    assert(tablebase.probe(board, PLAYER_COLOR_BLACK)[0] == DRAW)
+    assert(tablebase.hits == 3)
+    assert(tablebase.probe(Board(make_initial_pieces()), "B") is None)
+    tablebase.close()
+
+
+def test_search_with_tablebase(tmp_path):
+    generate_tablebases(2, tmp_path)
+    tablebase = Tablebase(tmp_path, 2)
+    board = Board(make_board_pieces([
+        ". . r . ",
+        " . . . .",
+        ". . . . ",
+        " . . . .",
+        ". . . . ",
+        " . . . .",
+        ". B . . ",
+        " . . . .",
+    ]))
+    assert(tablebase.probe(board, PLAYER_COLOR_RED) == (LOSS, 8))
+    result = Search().find_best_move(board, PLAYER_COLOR_RED, 10)
+    assert(result.score == -(WIN_SCORE - 8))
+    search = Search(tablebase=tablebase)
+    result = search.find_best_move(board, PLAYER_COLOR_RED, 2)
+    assert(result.score == -(WIN_SCORE - 8))
+    assert(search.nodes < 10)
+    tablebase.close()
+    # Without the files the search doesn't change.
+    tablebase = Tablebase(tmp_path / "missing", 2)
+    result = Search(tablebase=tablebase).find_best_move(
+        board, PLAYER_COLOR_RED, 2
+    )
+    assert(abs(result.score) < WIN_SCORE - 1000)
@@ -2,9 +2,9 @@
 This file contains tests for test_utils.py.
 '''
 
-from testing_utils import make_board_pieces
-from piece import Piece
-from constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED, NUM_SQUARES
+from engine.testing_utils import make_board_pieces
+from engine.piece import Piece
+from engine.constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED, NUM_SQUARES
 
 
 def test_make_board_pieces():
@@ -0,0 +1,59 @@
+'''
+This file contains tests for transposition.py.
+'''
+
+from engine.transposition import (
+    EXACT,
+    LOWER_BOUND,
+    UPPER_BOUND,
+    TranspositionTable,
+)
+
+
+def test_probe_and_store():
+    table = TranspositionTable(8)
+    assert(table.probe(3) is None)
+    table.store(3, 2, 1.5, EXACT, "move")
+    entry = table.probe(3)
+    assert(entry.depth == 2)
+    assert(entry.score == 1.5)
+    assert(entry.bound == EXACT)
+    assert(entry.move == "move")
+    assert(table.probe(11) is None)
+    assert(table.get_stats() == {
+        "hits": 1,
+        "misses": 2,
+        "collisions": 1,
+        "stores": 1,
+        "filled": 1,
+        "capacity": 16,
+    })
+
+
+def test_replacement():
+    table = TranspositionTable(8)
+    table.store(3, 5, 1, LOWER_BOUND, None)
+    # A shallower result of another position goes to the always-replace
+    # entry and keeps the deep one.
+    table.store(11, 2, 2, UPPER_BOUND, None)
+    assert(table.probe(3).depth == 5)
+    assert(table.probe(11).depth == 2)
+    table.store(19, 1, 3, EXACT, None)
+    assert(table.probe(3).depth == 5)
+    assert(table.probe(11) is None)
+    assert(table.probe(19).score == 3)
+    # A deeper result takes the depth-preferred entry.
+    table.store(27, 6, 4, EXACT, None)
+    assert(table.probe(3) is None)
+    assert(table.probe(27).depth == 6)
+    assert(table.get_filled() == 2)
+
+
+def test_clear():
+    table = TranspositionTable(4)
+    table.store(1, 1, 1, EXACT, None)
+    table.probe(1)
+    table.clear()
+    assert(table.probe(1) is None)
+    assert(table.hits == 0)
+    assert(table.stores == 0)
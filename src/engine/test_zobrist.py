@@ -0,0 +1,57 @@
+'''
+This file contains tests for zobrist.py.
+'''
+
+from engine.board import Board
+from engine.constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED
+from engine.testing_utils import make_board_pieces
+from engine.zobrist import (
+    BLACK_KING,
+    BLACK_MAN,
+    PIECE_KEYS,
+    RED_KING,
+    RED_MAN,
+    compute_hash,
+    get_piece_kind,
+)
+
+
+def test_get_piece_kind():
+    assert(get_piece_kind(True, False) == BLACK_MAN)
+    assert(get_piece_kind(True, True) == BLACK_KING)
+    assert(get_piece_kind(False, False) == RED_MAN)
+    assert(get_piece_kind(False, True) == RED_KING)
+
+
+def test_compute_hash():
+    assert(compute_hash(0, 0, 0) == 0)
+    assert(compute_hash(1, 0, 0) == PIECE_KEYS[BLACK_MAN][0])
+    assert(compute_hash(0, 1 << 5, 1 << 5) == PIECE_KEYS[RED_KING][5])
+    assert(compute_hash(1, 2, 0) != compute_hash(2, 1, 0))
+
+
+def test_apply_move_updates_hash():
+    board = Board(make_board_pieces([
+        ". . . . ",
+        " r . r b",
+        ". B . . ",
+        " . r . .",
+        ". . b . ",
+        " . R . .",
+        "b . . . ",
+        " . b . .",
+    ]))
+    boards = [board]
+    for depth in range(3):
+        next_boards = []
+        for board in boards:
+            for color in (PLAYER_COLOR_BLACK, PLAYER_COLOR_RED):
+                for move in board.get_all_moves(color):
+                    next_board = board.apply_move(move)
+                    assert(next_board.zobrist_hash == compute_hash(
+                        next_board.black_mask,
+                        next_board.red_mask,
+                        next_board.king_mask,
+                    ))
+                    next_boards.append(next_board)
+        boards = next_boards
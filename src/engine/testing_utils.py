@@ -2,8 +2,8 @@
 This file contains functions that can be useful to use in files for testing.
 '''
 
-from piece import Piece
-from constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED, NUM_SQUARES
+from .piece import Piece
+from .constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED, NUM_SQUARES
 
 
 def make_board_pieces(definition):
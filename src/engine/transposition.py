@@ -0,0 +1,173 @@
+'''
+This file contains the transposition table used by the search.
+The table has a fixed number of buckets. Each bucket has two entries:
+a depth-preferred entry that keeps the deepest result and an
+always-replace entry that keeps the most recent one.
+'''
+
+from .constants import TRANSPOSITION_TABLE_SIZE
+
+# The kind of the stored score.
+EXACT = 0
+LOWER_BOUND = 1  # The real score is at least the stored score (fail high)
+UPPER_BOUND = 2  # The real score is at most the stored score (fail low)
+
+
+class TranspositionEntry:
+    '''
+        Class -- TranspositionEntry
+            Represents a stored search result
+        Attributes:
+            key -- the full hash of the position
+            depth -- the search depth of the result
+            score -- the stored score
+            bound -- EXACT, LOWER_BOUND or UPPER_BOUND
+            move -- the best move found or None
+    '''
+    __slots__ = ("key", "depth", "score", "bound", "move")
+
+    def __init__(self, key, depth, score, bound, move):
+        '''
+            Constructor -- creates a new instance of TranspositionEntry
+            Parameters:
+                self -- the current TranspositionEntry object
+                key -- the full hash of the position
+                depth -- the search depth of the result
+                score -- the stored score
+                bound -- EXACT, LOWER_BOUND or UPPER_BOUND
+                move -- the best move found or None
+        '''
+        self.key = key
+        self.depth = depth
+        self.score = score
+        self.bound = bound
+        self.move = move
+
+
+class TranspositionTable:
+    '''
+        Class -- TranspositionTable
+            Fixed-size hash table of search results
+        Attributes:
+            size -- the number of buckets
+            depth_entries -- depth-preferred entries by bucket
+            recent_entries -- always-replace entries by bucket
+            hits -- number of probes that found the position
+            misses -- number of probes that did not find the position
+            collisions -- number of probes that found the bucket taken by
+                other positions
+            stores -- number of stored results
+        Methods:
+            probe -- looks for a stored result
+            store -- stores a search result
+            clear -- removes all entries and resets the counters
+            get_filled -- counts the used entries
+            get_stats -- gets the counters
+    '''
+    def __init__(self, size=TRANSPOSITION_TABLE_SIZE):
+        '''
+            Constructor -- creates a new instance of TranspositionTable
+            Parameters:
+                self -- the current TranspositionTable object
+                size -- the number of buckets, each holds two entries
+        '''
+        self.size = size
+        self.clear()
+
+    def clear(self):
+        '''
+        Method -- clear
+            Removes all entries and resets the counters
+        Parameter:
+            self -- the current TranspositionTable object
+        '''
+        self.depth_entries = [None] * self.size
+        self.recent_entries = [None] * self.size
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+    def probe(self, key):
+        '''
+        Method -- probe
+            Looks for a stored result
+        Parameter:
+            self -- the current TranspositionTable object
+            key -- the hash of the position
+        Returns:
+            The TranspositionEntry object or None if it is not stored
+        '''
+        bucket = key % self.size
+        entry = self.depth_entries[bucket]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        recent = self.recent_entries[bucket]
+        if recent is not None and recent.key == key:
+            self.hits += 1
+            return recent
+        self.misses += 1
+        if entry is not None or recent is not None:
+            self.collisions += 1
+        return None
+
+    def store(self, key, depth, score, bound, move):
+        '''
+        Method -- store
+            Stores a search result. The depth-preferred entry is replaced
+            by results of the same position or of the same or bigger depth,
+            other results go to the always-replace entry.
+        Parameter:
+            self -- the current TranspositionTable object
+            key -- the hash of the position
+            depth -- the search depth of the result
+            score -- the score to store
+            bound -- EXACT, LOWER_BOUND or UPPER_BOUND
+            move -- the best move found or None
+        '''
+        bucket = key % self.size
+        self.stores += 1
+        entry = TranspositionEntry(key, depth, score, bound, move)
+        previous = self.depth_entries[bucket]
+        if (
+            previous is None
+            or previous.key == key
+            or depth >= previous.depth
+        ):
+            self.depth_entries[bucket] = entry
+        else:
+            self.recent_entries[bucket] = entry
+
+    def get_filled(self):
+        '''
+        Method -- get_filled
+            Counts the used entries
+        Parameter:
+            self -- the current TranspositionTable object
+        Returns:
+            The number of entries that hold a result
+        '''
+        return (
+            self.size - self.depth_entries.count(None)
+            + self.size - self.recent_entries.count(None)
+        )
+
+    def get_stats(self):
+        '''
+        Method -- get_stats
+            Gets the counters
+        Parameter:
+            self -- the current TranspositionTable object
+        Returns:
+            Dictionary with hits, misses, collisions, stores, filled
+            entries and the total capacity in entries
+        '''
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "stores": self.stores,
+            "filled": self.get_filled(),
+            "capacity": 2 * self.size,
+        }
@@ -0,0 +1,65 @@
+'''
+This file contains Zobrist keys used to hash board positions.
+The keys are generated from a fixed seed, so hashes are the same in every
+process and can be stored in files.
+'''
+
+import random
+
+from .bitboard import NUM_PLAYABLE_SQUARES, iterate_squares
+
+ZOBRIST_SEED = 20220629
+HASH_BITS = 64
+
+BLACK_MAN = 0
+BLACK_KING = 1
+RED_MAN = 2
+RED_KING = 3
+
+_random = random.Random(ZOBRIST_SEED)
+# PIECE_KEYS[kind][index] is the key of a piece kind on the square.
+PIECE_KEYS = [
+    [_random.getrandbits(HASH_BITS) for index in range(NUM_PLAYABLE_SQUARES)]
+    for kind in range(4)
+]
+# Mixed into the hash when black is the side to move.
+BLACK_TO_MOVE_KEY = _random.getrandbits(HASH_BITS)
+
+
+def get_piece_kind(is_black, is_king):
+    '''
+        Function -- get_piece_kind
+            Gets the kind of the piece used to select its Zobrist keys
+        Parameters:
+            is_black -- True for black pieces, False for red pieces
+            is_king -- True for king pieces
+        Returns:
+            One of BLACK_MAN, BLACK_KING, RED_MAN, RED_KING
+    '''
+    if is_black:
+        return BLACK_KING if is_king else BLACK_MAN
+    return RED_KING if is_king else RED_MAN
+
+
+def compute_hash(black_mask, red_mask, king_mask):
+    '''
+        Function -- compute_hash
+            Computes the Zobrist hash of a position from scratch
+        Parameters:
+            black_mask -- bitboard of squares occupied by black pieces
+            red_mask -- bitboard of squares occupied by red pieces
+            king_mask -- bitboard of squares occupied by king pieces
+        Returns:
+            The hash of the position without the side to move
+    '''
+    result = 0
+    for kind, mask in (
+        (BLACK_MAN, black_mask & ~king_mask),
+        (BLACK_KING, black_mask & king_mask),
+        (RED_MAN, red_mask & ~king_mask),
+        (RED_KING, red_mask & king_mask),
+    ):
+        keys = PIECE_KEYS[kind]
+        for index in iterate_squares(mask):
+            result ^= keys[index]
+    return result
@@ -3,22 +3,26 @@ This file handles everything related to conducting the game.
 This class cannot be tested because it has Turtle object in the constructor.
 '''
 
-from drawing import (
-    clear,
-    check_cell_is_gray,
-    draw_bottom_text,
-    draw_top_text,
-    screen_coord_to_board_coord,
-)
-from board import Board
-from constants import (
-    INITIAL_ROWS,
-    NUM_SQUARES,
-    MAX_RECURSION_DEPTH,
+import threading
+
+from constants import COMPUTER_POLL_INTERVAL_MS, PONDERING
+from drawing import screen_coord_to_board_coord
+from engine.board import Board, make_initial_pieces
+from engine.book import OpeningBook
+from engine.constants import (
+    MAX_SEARCH_DEPTH,
     PLAYER_COLOR_BLACK,
     PLAYER_COLOR_RED,
+    SEARCH_NODE_LIMIT,
+    SEARCH_TIME_LIMIT_S,
+    SEARCH_WORKERS,
 )
-from piece import Piece
+from engine.parallel import ParallelSearch
+from engine.ponder import Ponderer
+from engine.search import Search
+from engine.session import GameSession
+from engine.tablebase import Tablebase
+from renderer import Renderer
 
 
 class Game:
@@ -26,48 +30,77 @@ class Game:
         Class -- Game
             Represents game
         Attributes:
-            board -- the board state at the beginning of the game
+            session -- the GameSession object with the board, the side to
+                move and the moves made
             a_turtle -- the Turtle object
+            renderer -- the Renderer object that draws the game
             is_game_over -- True when the game is over. Otherwise, False.
             computer_last_moves -- tracks the moves of the computer
             active_piece -- a piece that was chosen by the user
-            active_piece_locked -- True if the active piece can not be changed.
-                Otherwise, False. Used to constrain player piece in subsequent
-                turns of multiturn capturing moves.
+            active_piece_moves -- the next steps the active piece can make
             message -- a message to be shown in the UI (at the bottom)
             score -- the message with score of the game shown in the UI
                 (at the top)
-            player_allowed_moves -- all allowed moved for player
-                (black pieces).
+            search -- the Search object used for computer moves, it keeps
+                the transposition table between moves and probes the
+                endgame tablebase. ParallelSearch object if SEARCH_WORKERS
+                is more than one.
+            book -- the OpeningBook object consulted before searching
+            ponderer -- the Ponderer object that searches while the player
+                thinks, None if pondering is off or the search is parallel
+            computer_thread -- the thread searching the computer move or
+                None if the computer is not thinking
+            computer_result -- the SearchResult object of the last search
+                of the computer move
+            stats_hook -- function called with the SearchStats object of
+                every searched computer move or None. Book moves are not
+                searched.
             draw -- draws the state of the game
         Methods:
             make_initial_position -- makes initial position of the game
             draw -- draws the state of the game with all text messages
-            make_computer_move -- makes the computer move
-            get_player_moves_for_position -- collects all possible moves
-                for the piece
+            make_computer_move -- starts the computer move
+            search_computer_move -- searches the computer move on the worker
+                thread
+            check_computer_move -- makes the computer move when it is
+                searched
+            cancel_computer_move -- stops the search of the computer move
+            finish_computer_move -- makes the computer move and checks if
+                the game is over
             handle_click -- Handles clicks in the UI, applies user and
                 computer moves if needed
     '''
-    def __init__(self, a_turtle):
+    def __init__(self, a_turtle, stats_hook=None):
         '''
             Constructor -- creates a new instance of Game
             Parameters:
                 self -- the current Game object
                 a_turtle -- the Turtle object
+                stats_hook -- function called with the SearchStats object
+                    of every searched computer move or None
         '''
-        self.board = Board(self.make_initial_position())
+        self.session = GameSession(
+            board=Board(self.make_initial_position())
+        )
         self.a_turtle = a_turtle
+        self.renderer = Renderer(a_turtle)
         self.is_game_over = False
         self.computer_last_moves = []
         self.active_piece = None
         self.active_piece_moves = []
-        self.active_piece_locked = False
         self.message = ""
         self.score = ""
-        self.player_allowed_moves = (
-            self.board.get_all_moves(PLAYER_COLOR_BLACK)
-        )
+        if SEARCH_WORKERS > 1:
+            self.search = ParallelSearch(SEARCH_WORKERS)
+        else:
+            self.search = Search(tablebase=Tablebase())
+        self.book = OpeningBook()
+        self.computer_thread = None
+        self.computer_result = None
+        self.stats_hook = stats_hook
+        self.ponderer = None
+        if PONDERING and SEARCH_WORKERS <= 1:
+            self.ponderer = Ponderer(self.search)
         self.draw()
 
     def make_initial_position(self):
@@ -81,79 +114,135 @@ class Game:
             the coordinate of the piece on the board and the value is
             the Piece object
         '''
-        result = {}
-        for board_x in range(NUM_SQUARES):
-            for board_y in range(INITIAL_ROWS):
-                if check_cell_is_gray(board_x, board_y):
-                    result[(board_x, board_y)] = (
-                        Piece(board_x, board_y, PLAYER_COLOR_BLACK)
-                    )
-        for board_x in range(NUM_SQUARES):
-            for board_y in range(NUM_SQUARES - INITIAL_ROWS, NUM_SQUARES):
-                if check_cell_is_gray(board_x, board_y):
-                    result[(board_x, board_y)] = (
-                        Piece(board_x, board_y, PLAYER_COLOR_RED)
-                    )
-        return result
+        return make_initial_pieces()
 
     def draw(self):
         '''
         Method -- draw
-            Draws the state of the game with all text messages
+            Draws the state of the game with all text messages. Only
+            the changes since the last draw are painted.
         Parameter:
             self -- the current Game object
         '''
-        clear(self.a_turtle)
-        self.board.draw(self.a_turtle)
-        for move in self.active_piece_moves:
-            move.draw(self.a_turtle)
-        for move in self.computer_last_moves:
-            move.draw(self.a_turtle)
-        draw_bottom_text(self.a_turtle, self.message)
-        draw_top_text(self.a_turtle, self.board.get_text_score())
+        self.renderer.draw(
+            self.session.board,
+            self.active_piece_moves + self.computer_last_moves,
+            self.session.board.get_text_score(),
+            self.message,
+        )
 
-    def make_computer_move(self, options=None):
+    def make_computer_move(self):
         '''
         Method -- make_computer_move
-            Makes the computer move
+            Starts the computer move. The move is taken from the opening
+            book if the position is there. Otherwise it is searched with
+            iterative deepening within the time and node budget from
+            constants.py on a worker thread, so the window stays
+            responsive; check_computer_move polls for the result.
+            Pondering is stopped before the search.
         Parameter:
             self -- the current Game object
-            options -- options for possible moves by the computer.
-                Used to constrain move options for subsequent parts of
-                multistep capturing move.
         '''
-        best_move = self.board.optimal_move_red(options, MAX_RECURSION_DEPTH)
-        if best_move is None:
-            self.message = "You win"
-            self.is_game_over = True
-            self.draw()
+        if self.ponderer is not None:
+            self.ponderer.stop()
+        best_move = self.book.choose_move(self.session.board, PLAYER_COLOR_RED)
+        if best_move is not None:
+            self.finish_computer_move(best_move)
             return
-        self.board = self.board.apply_move(best_move)
-        self.computer_last_moves.append(best_move)
-        if best_move.is_capture():
-            next_options = best_move.to_piece.get_capture_moves(self.board)
-            if len(next_options) > 0:
-                self.make_computer_move(next_options)
+        self.message = "Thinking..."
+        self.computer_result = None
+        # The worker thread searches its own board, the session board is
+        # drawn meanwhile and only changed by finish_computer_move on the
+        # UI thread.
+        self.computer_thread = threading.Thread(
+            target=self.search_computer_move,
+            args=(self.session.board.copy(),),
+            daemon=True,
+        )
+        self.computer_thread.start()
+        self.a_turtle.getscreen().ontimer(
+            self.check_computer_move, COMPUTER_POLL_INTERVAL_MS
+        )
 
-    def get_player_moves_for_position(self, board_x, board_y):
+    def search_computer_move(self, board):
         '''
-        Method -- get_player_moves_for_position
-            Collects all possible moves for the piece
+        Method -- search_computer_move
+            Searches the computer move. Runs on the worker thread.
         Parameter:
             self -- the current Game object
-            board_x -- x-coordinate in board format
-            board_y -- y-coordinate in board format
-        Returns:
-            Allowed moves for piece in a particular position
-        '''
-        result = []
-        for move in self.player_allowed_moves:
-            if (
-                move.from_piece.board_x == board_x and
-                move.from_piece.board_y == board_y
-            ):
-                result.append(move)
-        return result
+            board -- the copy of the session Board object to search
+        '''
+        self.computer_result = self.search.iterative_deepening(
+            board,
+            PLAYER_COLOR_RED,
+            MAX_SEARCH_DEPTH,
+            time_limit=SEARCH_TIME_LIMIT_S,
+            node_limit=SEARCH_NODE_LIMIT,
+        )
+
+    def check_computer_move(self):
+        '''
+        Method -- check_computer_move
+            Checks if the computer move is searched. If it is, publishes
+            the statistics of the search to stats_hook and makes the move,
+            otherwise checks again after COMPUTER_POLL_INTERVAL_MS.
+        Parameter:
+            self -- the current Game object
+        '''
+        if self.computer_thread.is_alive():
+            self.a_turtle.getscreen().ontimer(
+                self.check_computer_move, COMPUTER_POLL_INTERVAL_MS
+            )
+            return
+        self.computer_thread = None
+        self.search.stop_requested = False
+        result = self.computer_result
+        if result is None:
+            # Canceled before the first iteration ended.
+            result = self.search.find_best_move(
+                self.session.board, PLAYER_COLOR_RED, 1
+            )
+        if self.stats_hook is not None:
+            self.stats_hook(result.stats)
+        self.message = ""
+        self.finish_computer_move(result.move)
+        self.draw()
+
+    def cancel_computer_move(self):
+        '''
+        Method -- cancel_computer_move
+            Stops the search of the computer move, the best move found so
+            far is made
+        Parameter:
+            self -- the current Game object
+        '''
+        if self.computer_thread is not None:
+            self.search.stop()
+
+    def finish_computer_move(self, best_move):
+        '''
+        Method -- finish_computer_move
+            Makes the computer move and checks if the game is over.
+            A multistep capturing move is made at once. Pondering is
+            started after the move.
+        Parameter:
+            self -- the current Game object
+            best_move -- the Move object or None if the computer can't move
+        '''
+        if best_move is None:
+            self.message = "You win"
+            self.is_game_over = True
+            return
+        self.session.play_move(best_move)
+        self.computer_last_moves.append(best_move)
+        if self.session.get_winner() is not None:
+            self.message = "You lost"
+            self.is_game_over = True
+            return
+        if self.ponderer is not None:
+            # The pondering thread gets its own board, the session board
+            # is read and changed by the UI thread.
+            self.ponderer.start(self.session.board.copy(), PLAYER_COLOR_BLACK)
 
     def handle_click(self, screen_x, screen_y):
         '''
@@ -164,19 +253,19 @@ class Game:
             screen_x -- x-coordinates of the click in screen format in px
             screen_y -- y-coordinates of the click in screen format in px
         '''
-        if self.is_game_over:
+        if self.is_game_over or self.computer_thread is not None:
             return
         board_x = screen_coord_to_board_coord(screen_x)
         board_y = screen_coord_to_board_coord(screen_y)
         if board_x is None or board_y is None:
             return
-        clicked_piece = self.board.get_piece_at(board_x, board_y)
+        clicked_piece = self.session.board.get_piece_at(board_x, board_y)
         if clicked_piece is not None:
             if clicked_piece.color != PLAYER_COLOR_BLACK:
                 self.message = "You can't select opponent's pieces"
                 self.draw()
                 return
-            if self.active_piece_locked:
+            if self.session.is_locked():
                 self.message = "You can't change piece now"
                 self.draw()
                 return
@@ -184,15 +273,14 @@ class Game:
                 self.active_piece = None
                 self.active_piece_moves = []
                 return
-            moves = self.get_player_moves_for_position(board_x, board_y)
-            if len(moves) == 0:
+            steps = self.session.get_next_steps(board_x, board_y)
+            if len(steps) == 0:
                 self.message = "There are no possible moves from this cell"
                 self.draw()
                 return
             self.computer_last_moves = []
             self.active_piece = clicked_piece
-            self.active_piece_moves = moves
-            self.active_piece_locked = False
+            self.active_piece_moves = steps
             self.message = ""
         else:
             moved = False
@@ -201,28 +289,18 @@ class Game:
                     move.to_piece.board_x == board_x and
                     move.to_piece.board_y == board_y
                 ):
-                    self.board = self.board.apply_move(move)
-                    next_capture_moves = (
-                        move.to_piece.get_capture_moves(self.board)
-                    )
-                    if move.is_capture() and len(next_capture_moves) > 0:
-                        self.active_piece = move.to_piece
-                        self.active_piece_moves = next_capture_moves
-                        self.active_piece_locked = True
-                    else:
+                    # A multistep capturing move is made step by step,
+                    # the session keeps the piece locked until the end.
+                    if self.session.play_step(move):
                         self.active_piece = None
                         self.active_piece_moves = []
-                        self.active_piece_locked = False
                         self.computer_last_moves = []
                         self.make_computer_move()
-                        self.player_allowed_moves = (
-                            self.board.get_all_moves(PLAYER_COLOR_BLACK)
+                    else:
+                        self.active_piece = move.to_piece
+                        self.active_piece_moves = (
+                            self.session.get_next_steps()
                         )
-                        if len(self.player_allowed_moves) == 0:
-                            self.message = "You lost"
-                            self.is_game_over = True
-                            self.draw()
-                            return
                     moved = True
                     break
             if not moved:
@@ -4,20 +4,15 @@ This file starts the Checkers game.
 
 import turtle
 
-import drawing
-from board import Board
 from constants import (
     BACKGROUND_COLOR,
     BOARD_PADDING_PX,
-    INITIAL_ROWS,
-    NUM_SQUARES,
     SQUARE_SIZE_PX,
     TEXT_SIZE_PX,
     WINDOW_PADDING_PX,
 )
+from engine.constants import NUM_SQUARES
 from game import Game
-from move import Move
-from piece import Piece
 
 
 def main():
@@ -40,6 +35,9 @@ def main():
 
     screen = turtle.Screen()
     screen.onclick(game.handle_click)
+    # Escape makes the computer move with the best move found so far.
+    screen.onkey(game.cancel_computer_move, "Escape")
+    screen.listen()
 
     turtle.done()
 
@@ -0,0 +1,219 @@
+'''
+This file contains the incremental drawing of the game. It is the adapter
+between the engine (the engine package, which has no GUI imports) and the
+turtle drawing in drawing.py.
+The drawing is split between turtles: the board background is drawn once
+by the main turtle and kept, the pieces are stamps of registered shapes
+(see drawing.register_piece_shapes), the move traces and the text messages
+have a turtle each, so they are cleared without touching the rest. The
+renderer remembers what it has drawn and a new frame only changes the
+stamps of the changed cells, the traces if they changed and the texts if
+they changed. The canvas shows later drawings above earlier ones, so the
+traces are drawn again after a stamp changed to stay above the pieces.
+Only functions that do not have a Turtle as a parameter can be tested.
+'''
+
+from drawing import (
+    clear,
+    draw_bottom_text,
+    draw_empty_board,
+    draw_move,
+    draw_piece,
+    draw_top_text,
+    register_piece_shapes,
+)
+from engine.constants import PLAYER_COLOR_BLACK
+
+
+def get_piece_cells(board):
+    '''
+        Function -- get_piece_cells
+            Gets what has to be drawn in every cell with a piece
+        Parameters:
+            board -- the Board object
+        Returns:
+            Dictionary of (is_black, is_king) tuples by the
+            (board_x, board_y) tuple of the cell
+    '''
+    return {
+        (piece.board_x, piece.board_y): (
+            piece.color == PLAYER_COLOR_BLACK, piece.is_king
+        )
+        for piece in board.pieces.values()
+    }
+
+
+def get_trace_segments(moves):
+    '''
+        Function -- get_trace_segments
+            Splits the traces of moves into straight segments, one per step
+        Parameters:
+            moves -- list of Move objects
+        Returns:
+            List of (board_x_from, board_y_from, board_x_to, board_y_to,
+            is_black) tuples
+    '''
+    segments = []
+    for move in moves:
+        is_black = move.from_piece.color == PLAYER_COLOR_BLACK
+        from_piece = move.from_piece
+        for to_piece in move.path:
+            segments.append((
+                from_piece.board_x,
+                from_piece.board_y,
+                to_piece.board_x,
+                to_piece.board_y,
+                is_black,
+            ))
+            from_piece = to_piece
+    return segments
+
+
+def check_traces_need_drawing(drawn_segments, segments, is_stamped):
+    '''
+        Function -- check_traces_need_drawing
+            Checks whether the traces have to be drawn again
+        Parameters:
+            drawn_segments -- the drawn trace segments, see
+                get_trace_segments
+            segments -- the trace segments to draw
+            is_stamped -- True if a piece was stamped after the traces were
+                drawn, so it may cover them
+        Returns:
+            True if the traces have to be drawn again. Otherwise, False.
+    '''
+    return segments != drawn_segments or (is_stamped and bool(segments))
+
+
+def get_changed_cells(old_cells, new_cells):
+    '''
+        Function -- get_changed_cells
+            Finds the cells whose piece changed
+        Parameters:
+            old_cells -- the drawn pieces, see get_piece_cells
+            new_cells -- the pieces to draw, see get_piece_cells
+        Returns:
+            Set of (board_x, board_y) tuples
+    '''
+    return {
+        cell for cell in old_cells.keys() | new_cells.keys()
+        if old_cells.get(cell) != new_cells.get(cell)
+    }
+
+
+class Renderer:
+    '''
+        Class -- Renderer
+            Draws the game, changing only what changed since the last frame
+        Attributes:
+            a_turtle -- the Turtle object that draws the board background
+            piece_turtle -- the Turtle object that stamps the pieces
+            trace_turtle -- the Turtle object that draws the move traces
+            text_turtle -- the Turtle object that writes the text messages
+            is_background_drawn -- True after the board background is drawn
+            cells -- the drawn pieces, see get_piece_cells
+            stamps -- the stamp ids of the drawn pieces by cell
+            segments -- the drawn trace segments, see get_trace_segments
+            texts -- the drawn top and bottom text messages or None
+        Methods:
+            draw -- draws a frame
+            draw_pieces -- stamps the pieces that changed
+            draw_traces -- draws the traces if they changed or pieces were
+                stamped over them
+            draw_texts -- writes the text messages if they changed
+    '''
+    def __init__(self, a_turtle):
+        '''
+            Constructor -- creates a new instance of Renderer. The other
+            turtles are clones of a_turtle.
+            Parameters:
+                self -- the current Renderer object
+                a_turtle -- the Turtle object
+        '''
+        self.a_turtle = a_turtle
+        self.piece_turtle = a_turtle.clone()
+        self.trace_turtle = a_turtle.clone()
+        self.text_turtle = a_turtle.clone()
+        register_piece_shapes(a_turtle.getscreen())
+        self.is_background_drawn = False
+        self.cells = {}
+        self.stamps = {}
+        self.segments = []
+        self.texts = None
+
+    def draw(self, board, moves, top_text, bottom_text):
+        '''
+        Method -- draw
+            Draws a frame. The background is drawn with the first frame.
+        Parameter:
+            self -- the current Renderer object
+            board -- the Board object
+            moves -- list of Move objects whose traces are drawn
+            top_text -- the text message at the top
+            bottom_text -- the text message at the bottom
+        '''
+        if not self.is_background_drawn:
+            clear(self.a_turtle)
+            draw_empty_board(self.a_turtle)
+            self.is_background_drawn = True
+        is_stamped = self.draw_pieces(get_piece_cells(board))
+        self.draw_traces(get_trace_segments(moves), is_stamped)
+        self.draw_texts((top_text, bottom_text))
+
+    def draw_pieces(self, cells):
+        '''
+        Method -- draw_pieces
+            Removes the stamps of the changed cells and stamps their new
+            pieces
+        Parameter:
+            self -- the current Renderer object
+            cells -- the pieces to draw, see get_piece_cells
+        Returns:
+            True if a piece was stamped. Otherwise, False.
+        '''
+        is_stamped = False
+        for cell in get_changed_cells(self.cells, cells):
+            if cell in self.stamps:
+                self.piece_turtle.clearstamp(self.stamps.pop(cell))
+            if cell in cells:
+                is_black, is_king = cells[cell]
+                self.stamps[cell] = draw_piece(
+                    self.piece_turtle, cell[0], cell[1], is_black, is_king
+                )
+                is_stamped = True
+        self.cells = cells
+        return is_stamped
+
+    def draw_traces(self, segments, is_stamped):
+        '''
+        Method -- draw_traces
+            Draws the traces again if they changed or if pieces were
+            stamped after them
+        Parameter:
+            self -- the current Renderer object
+            segments -- the trace segments to draw, see get_trace_segments
+            is_stamped -- True if a piece was stamped in this frame
+        '''
+        if not check_traces_need_drawing(
+            self.segments, segments, is_stamped
+        ):
+            return
+        self.trace_turtle.clear()
+        for segment in segments:
+            draw_move(self.trace_turtle, *segment)
+        self.segments = segments
+
+    def draw_texts(self, texts):
+        '''
+        Method -- draw_texts
+            Writes the text messages again if one of them changed
+        Parameter:
+            self -- the current Renderer object
+            texts -- tuple of the top and the bottom text messages
+        '''
+        if texts == self.texts:
+            return
+        self.text_turtle.clear()
+        draw_top_text(self.text_turtle, texts[0])
+        draw_bottom_text(self.text_turtle, texts[1])
+        self.texts = texts
@@ -0,0 +1,285 @@
+'''
+This file contains the headless self-play runner.
+Engine-vs-engine games are played without the UI, in parallel worker
+processes, and every finished game is written as one JSON line. Each side
+has its own search settings, so engine changes can be compared.
+Run "python selfplay.py --help" to see the options.
+'''
+
+import argparse
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from engine.board import Board, make_initial_pieces
+from engine.constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED
+from engine.search import Search, get_opponent_color
+
+# A game that is not finished after this many plies is a draw.
+MAX_GAME_PLIES = 200
+# The number of random moves played after the opening of a tournament game.
+# The search is deterministic, so without them the games of a pair of
+# engines would all be the same.
+TOURNAMENT_RANDOM_PLIES = 4
+
+
+class EngineSettings:
+    '''
+        Class -- EngineSettings
+            Search settings of one side
+        Attributes:
+            name -- the name of the engine used in the results
+            max_depth -- the maximal search depth in plies
+            time_limit -- the time budget per move in seconds or None
+            node_limit -- the budget per move in visited nodes or None
+    '''
+    def __init__(self, name, max_depth, time_limit=None, node_limit=None):
+        '''
+            Constructor -- creates a new instance of EngineSettings
+            Parameters:
+                self -- the current EngineSettings object
+                name -- the name of the engine used in the results
+                max_depth -- the maximal search depth in plies
+                time_limit -- the time budget per move in seconds or None
+                node_limit -- the budget per move in visited nodes or None
+        '''
+        self.name = name
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+
+
+def find_move_by_notation(board, color, notation):
+    '''
+        Function -- find_move_by_notation
+            Finds an allowed move by its notation
+        Parameters:
+            board -- the Board object
+            color -- color of the side to move
+            notation -- the notation of the move, see Move.get_notation
+        Returns:
+            The Move object or None if there is no such allowed move
+    '''
+    for move in board.get_all_moves(color):
+        if move.get_notation() == notation:
+            return move
+    return None
+
+
+def read_openings(path):
+    '''
+        Function -- read_openings
+            Reads openings from a text file. Every line is one opening:
+            moves in notation separated by spaces, black moves first.
+            Empty lines and lines starting with "#" are skipped.
+        Parameters:
+            path -- the path of the file
+        Returns:
+            List of openings, each opening is a list of move notations
+    '''
+    result = []
+    with open(path) as file:
+        for line in file:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                result.append(line.split())
+    return result
+
+
+def play_game(
+    black,
+    red,
+    opening=None,
+    random_plies=0,
+    seed=0,
+    max_plies=MAX_GAME_PLIES,
+):
+    '''
+        Function -- play_game
+            Plays one engine-vs-engine game from the initial position
+        Parameters:
+            black -- EngineSettings object of black (moves first)
+            red -- EngineSettings object of red
+            opening -- list of move notations to play first or None
+            random_plies -- number of random moves to play after the opening
+            seed -- the seed of the random moves
+            max_plies -- the game is a draw after this many plies
+        Returns:
+            Dictionary with the result: winner color (None for a draw),
+            winner engine name, number of plies, played moves and the
+            search time of every move in seconds
+    '''
+    board = Board(make_initial_pieces())
+    color = PLAYER_COLOR_BLACK
+    settings = {PLAYER_COLOR_BLACK: black, PLAYER_COLOR_RED: red}
+    searches = {PLAYER_COLOR_BLACK: Search(), PLAYER_COLOR_RED: Search()}
+    random_generator = random.Random(seed)
+    moves = []
+    move_times = []
+    winner = None
+    opening = opening or []
+    while len(moves) < max_plies:
+        ply = len(moves)
+        start_time = time.perf_counter()
+        if ply < len(opening):
+            move = find_move_by_notation(board, color, opening[ply])
+            if move is None:
+                raise ValueError(
+                    "Move {} is not allowed".format(opening[ply])
+                )
+        elif ply < len(opening) + random_plies:
+            options = board.get_all_moves(color)
+            move = random_generator.choice(options) if options else None
+        else:
+            side = settings[color]
+            move = searches[color].iterative_deepening(
+                board,
+                color,
+                side.max_depth,
+                time_limit=side.time_limit,
+                node_limit=side.node_limit,
+            ).move
+        if move is None:
+            winner = get_opponent_color(color)
+            break
+        move_times.append(time.perf_counter() - start_time)
+        moves.append(move.get_notation())
+        board = board.apply_move(move)
+        color = get_opponent_color(color)
+    return {
+        "black": black.name,
+        "red": red.name,
+        "winner": winner,
+        "winner_name": None if winner is None else settings[winner].name,
+        "plies": len(moves),
+        "moves": moves,
+        "move_times": move_times,
+    }
+
+
+def run_tournament(
+    black,
+    red,
+    games,
+    output_path,
+    openings=None,
+    random_plies=TOURNAMENT_RANDOM_PLIES,
+    swap_colors=True,
+    workers=None,
+    max_plies=MAX_GAME_PLIES,
+):
+    '''
+        Function -- run_tournament
+            Plays games in worker processes and appends every result to a
+            JSONL file as soon as the game is finished
+        Parameters:
+            black -- EngineSettings object of the first engine
+            red -- EngineSettings object of the second engine
+            games -- number of games
+            output_path -- the path of the JSONL file
+            openings -- list of openings (see read_openings) used in turn,
+                or None to start from the initial position
+            random_plies -- number of random moves after the opening
+            swap_colors -- if True, every second game is played with the
+                engines swapped
+            workers -- number of worker processes, None for one per CPU
+            max_plies -- a game is a draw after this many plies
+        Returns:
+            Dictionary with the number of wins of the first engine
+            ("engine_a"), of the second one ("engine_b") and of draws.
+            Raises ValueError if the games would repeat: without openings
+            and random moves the search plays every game the same way.
+    '''
+    if not openings and random_plies <= 0 and games > (
+        2 if swap_colors else 1
+    ):
+        raise ValueError(
+            "The games repeat without openings or random plies"
+        )
+    summary = {"engine_a": 0, "engine_b": 0, "draws": 0}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # The color of the first engine in every game.
+        engine_a_colors = {}
+        for game_number in range(games):
+            opening = None
+            if openings:
+                opening = openings[(game_number // 2) % len(openings)]
+            first, second = black, red
+            engine_a_color = PLAYER_COLOR_BLACK
+            if swap_colors and game_number % 2 == 1:
+                first, second = red, black
+                engine_a_color = PLAYER_COLOR_RED
+            future = executor.submit(
+                play_game, first, second, opening, random_plies,
+                game_number // 2 if swap_colors else game_number, max_plies,
+            )
+            engine_a_colors[future] = engine_a_color
+        with open(output_path, "a") as file:
+            for future in as_completed(engine_a_colors):
+                result = future.result()
+                file.write(json.dumps(result) + "\n")
+                file.flush()
+                if result["winner"] is None:
+                    summary["draws"] += 1
+                elif result["winner"] == engine_a_colors[future]:
+                    summary["engine_a"] += 1
+                else:
+                    summary["engine_b"] += 1
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Plays engine-vs-engine games without the UI."
+    )
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default="selfplay.jsonl")
+    parser.add_argument("--openings", help="file with one opening per line")
+    parser.add_argument(
+        "--random-plies", type=int, default=TOURNAMENT_RANDOM_PLIES
+    )
+    parser.add_argument("--max-plies", type=int, default=MAX_GAME_PLIES)
+    parser.add_argument("--no-swap", action="store_true")
+    for side in ("a", "b"):
+        parser.add_argument("--{}-name".format(side), default=side)
+        parser.add_argument("--{}-depth".format(side), type=int, default=6)
+        parser.add_argument("--{}-time".format(side), type=float)
+        parser.add_argument("--{}-nodes".format(side), type=int)
+    arguments = parser.parse_args()
+    engine_a = EngineSettings(
+        arguments.a_name, arguments.a_depth, arguments.a_time,
+        arguments.a_nodes,
+    )
+    engine_b = EngineSettings(
+        arguments.b_name, arguments.b_depth, arguments.b_time,
+        arguments.b_nodes,
+    )
+    openings = None
+    if arguments.openings:
+        openings = read_openings(arguments.openings)
+    start_time = time.perf_counter()
+    try:
+        summary = run_tournament(
+            engine_a,
+            engine_b,
+            arguments.games,
+            arguments.output,
+            openings=openings,
+            random_plies=arguments.random_plies,
+            swap_colors=not arguments.no_swap,
+            workers=arguments.workers,
+            max_plies=arguments.max_plies,
+        )
+    except ValueError as error:
+        parser.error(str(error))
+    elapsed = time.perf_counter() - start_time
+    print(summary)
+    print("Games per hour: {:.0f}".format(
+        arguments.games * 3600 / max(elapsed, 1e-9)
+    ))
+
+
+if __name__ == "__main__":
+    main()
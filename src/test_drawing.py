@@ -6,8 +6,11 @@ from drawing import (
     board_coord_to_screen_coord_center,
     board_coord_to_screen_coord_corner,
     screen_coord_to_board_coord,
-    check_cell_is_gray
+    check_cell_is_gray,
+    get_circle_polygon,
+    get_piece_shape_name,
 )
+from constants import CIRCLE_SHAPE_POINTS
 import math
 import turtle
 
@@ -44,3 +47,22 @@ def test_check_cell_is_gray():
     assert(not check_cell_is_gray(8, 8))
     assert(not check_cell_is_gray(1, 1))
     assert(not check_cell_is_gray(4, 6))
+
+
+def test_get_circle_polygon():
+    polygon = get_circle_polygon(20)
+    assert(len(polygon) == CIRCLE_SHAPE_POINTS)
+    assert(polygon[0] == (20, 0))
+    for x, y in polygon:
+        assert(math.isclose(math.hypot(x, y), 20))
+
+
+def test_get_piece_shape_name():
+    names = {
+        get_piece_shape_name(is_black, is_king)
+        for is_black in (True, False)
+        for is_king in (True, False)
+    }
+    assert(len(names) == 4)
+    assert(get_piece_shape_name(True, False) == "black_man")
+    assert(get_piece_shape_name(False, True) == "red_king")
@@ -0,0 +1,70 @@
+'''
+This file contains tests for renderer.py.
+'''
+
+from engine.board import Board
+from engine.constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED
+from engine.testing_utils import make_board_pieces
+from renderer import (
+    check_traces_need_drawing,
+    get_changed_cells,
+    get_piece_cells,
+    get_trace_segments,
+)
+
+
+def test_get_piece_cells():
+    board = Board(make_board_pieces([
+        ". . . . ",
+        " . . . .",
+        ". . . . ",
+        " . . . .",
+        ". . . . ",
+        " . . R .",
+        ". . . . ",
+        " b . . .",
+    ]))
+    assert(get_piece_cells(board) == {
+        (1, 0): (True, False),
+        (5, 2): (False, True),
+    })
+
+
+def test_get_trace_segments():
+    board = Board(make_board_pieces([
+        ". . . . ",
+        " . . . .",
+        ". . . . ",
+        " . r . .",
+        ". . . . ",
+        " r . . .",
+        "b . . . ",
+        " . . . .",
+    ]))
+    move = board.get_all_moves(PLAYER_COLOR_BLACK)[0]
+    assert(get_trace_segments([move]) == [
+        (0, 1, 2, 3, True),
+        (2, 3, 4, 5, True),
+    ])
+    move = board.get_all_moves(PLAYER_COLOR_RED)[0]
+    assert(get_trace_segments([move])[0][4] is False)
+
+
+def test_get_changed_cells():
+    old_cells = {(1, 0): (True, False), (3, 0): (False, False)}
+    new_cells = {(2, 1): (True, False), (3, 0): (False, True)}
+    assert(get_changed_cells(old_cells, new_cells) == {
+        (1, 0), (2, 1), (3, 0),
+    })
+    assert(get_changed_cells(new_cells, dict(new_cells)) == set())
+    assert(get_changed_cells({}, new_cells) == {(2, 1), (3, 0)})
+
+
+def test_check_traces_need_drawing():
+    segments = [(0, 1, 2, 3, True)]
+    assert(not check_traces_need_drawing(segments, list(segments), False))
+    assert(check_traces_need_drawing([], segments, False))
+    assert(check_traces_need_drawing(segments, [], False))
+    # A new stamp is drawn above the traces, so they are drawn again.
+    assert(check_traces_need_drawing(segments, list(segments), True))
+    assert(not check_traces_need_drawing([], [], True))
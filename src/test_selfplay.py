@@ -0,0 +1,93 @@
+'''
+This file contains tests for selfplay.py.
+'''
+
+import json
+
+from engine.board import Board, make_initial_pieces
+from engine.constants import PLAYER_COLOR_BLACK, PLAYER_COLOR_RED
+from selfplay import (
+    EngineSettings,
+    find_move_by_notation,
+    play_game,
+    read_openings,
+    run_tournament,
+)
+
+
+def test_find_move_by_notation():
+    board = Board(make_initial_pieces())
+    move = find_move_by_notation(board, PLAYER_COLOR_BLACK, "b3-c4")
+    assert(move.get_notation() == "b3-c4")
+    assert(find_move_by_notation(board, PLAYER_COLOR_RED, "b3-c4") is None)
+
+
+def test_read_openings(tmp_path):
+    path = tmp_path / "openings.txt"
+    path.write_text("# comment\nb3-c4 a6-b5\n\nf3-g4\n")
+    assert(read_openings(path) == [["b3-c4", "a6-b5"], ["f3-g4"]])
+
+
+def test_play_game():
+    strong = EngineSettings("strong", 4)
+    weak = EngineSettings("weak", 1, node_limit=10)
+    result = play_game(strong, weak, opening=["b3-c4"], max_plies=60)
+    assert(result["black"] == "strong")
+    assert(result["red"] == "weak")
+    assert(result["moves"][0] == "b3-c4")
+    assert(result["plies"] == len(result["moves"]))
+    assert(len(result["move_times"]) == result["plies"])
+    assert(result["plies"] <= 60)
+    if result["winner"] is not None:
+        assert(result["winner_name"] in ("strong", "weak"))
+    draw = play_game(strong, weak, random_plies=2, max_plies=4)
+    assert(draw["winner"] is None)
+    assert(draw["plies"] == 4)
+
+
+def test_run_tournament(tmp_path):
+    path = tmp_path / "results.jsonl"
+    summary = run_tournament(
+        EngineSettings("a", 2),
+        EngineSettings("b", 1),
+        4,
+        path,
+        openings=[["b3-c4"], ["f3-g4"]],
+        workers=2,
+        max_plies=30,
+    )
+    results = [json.loads(line) for line in path.read_text().splitlines()]
+    assert(len(results) == 4)
+    assert(sum(summary.values()) == 4)
+    assert(sorted(result["black"] for result in results) == [
+        "a", "a", "b", "b"
+    ])
+    assert(sorted(result["moves"][0] for result in results) == [
+        "b3-c4", "b3-c4", "f3-g4", "f3-g4"
+    ])
+
+
+def test_run_tournament_summary(tmp_path):
+    path = tmp_path / "results.jsonl"
+    try:
+        run_tournament(
+            EngineSettings("a", 1), EngineSettings("b", 1), 4, path,
+            random_plies=0,
+        )
+        assert(False)
+    except ValueError:
+        pass
+    # The counts are kept by engine, not by name.
+    summary = run_tournament(
+        EngineSettings("draws", 3),
+        EngineSettings("draws", 1, node_limit=10),
+        4,
+        path,
+        workers=2,
+        max_plies=60,
+    )
+    assert(set(summary) == {"engine_a", "engine_b", "draws"})
+    assert(sum(summary.values()) == 4)
+    results = [json.loads(line) for line in path.read_text().splitlines()]
+    # The random moves make the games of both pairs differ.
+    assert(len({tuple(result["moves"]) for result in results}) == 4)